@@ -10,14 +10,28 @@ python manage.py migrate --noinput
 
 # One-time data import (set in Render Dashboard, deploy once, then remove these env vars):
 #   RUN_SEED_IMPORT=true
-#   SEED_FIXTURE_URL=<private HTTPS URL to local_export.json>  (e.g. Dropbox / Drive direct download)
+#   SEED_FIXTURE_URL=<private HTTPS URL to local_export.tar or a .json fixture>  (e.g. Dropbox / Drive direct download)
 # Optional profile photos:
 #   MEDIA_ZIP_URL=<private HTTPS URL to a zip of your local media/ folder>
+#   (run `python manage.py media_gc --adopt` locally first, so duplicate photos are zipped once)
+#   (a .tar of an export_local_data folder is loaded with import_data; anything else with loaddata)
 if [ "${RUN_SEED_IMPORT:-}" = "true" ] && [ -n "${SEED_FIXTURE_URL:-}" ]; then
-  echo "One-time loaddata from SEED_FIXTURE_URL..."
-  curl -fsSL "$SEED_FIXTURE_URL" -o /tmp/seed.json
-  python manage.py loaddata /tmp/seed.json
-  rm -f /tmp/seed.json
+  case "$SEED_FIXTURE_URL" in
+    *.tar*)
+      echo "One-time import_data from SEED_FIXTURE_URL..."
+      curl -fsSL "$SEED_FIXTURE_URL" -o /tmp/seed.tar
+      mkdir -p /tmp/seed_export
+      tar -xf /tmp/seed.tar -C /tmp/seed_export
+      python manage.py import_data /tmp/seed_export
+      rm -rf /tmp/seed.tar /tmp/seed_export
+      ;;
+    *)
+      echo "One-time loaddata from SEED_FIXTURE_URL..."
+      curl -fsSL "$SEED_FIXTURE_URL" -o /tmp/seed.json
+      python manage.py loaddata /tmp/seed.json
+      rm -f /tmp/seed.json
+      ;;
+  esac
 fi
 
 if [ "${RUN_SEED_IMPORT:-}" = "true" ] && [ -n "${MEDIA_ZIP_URL:-}" ]; then
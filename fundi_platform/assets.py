@@ -0,0 +1,52 @@
+"""
+Static asset pipeline: the stylesheets and scripts in static/ (base.css, base.js and one
+pair per page that needs them), which templates link to instead of carrying them inline.
+
+collectstatic, through AssetStorage, minifies our own css/ and js/ files, copies each
+under a name holding a hash of its content (base.3f2a9c1b.css) and writes .gz and .br
+versions beside it. {% static %} links to the hashed name, and WhiteNoise serves hashed
+files with a one-year immutable Cache-Control and the .br or .gz copy the browser
+accepts, so a page's CSS and JS are downloaded once per release, not with every page.
+Brotli copies need the Brotli package (requirements.txt); without it only gzip is written.
+
+With DEBUG on, {% static %} links to the unhashed files in static/, so edits show up
+without running collectstatic.
+"""
+import rcssmin
+import rjsmin
+from django.core.files.base import ContentFile
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+# Our files; third-party ones (the admin's) ship already minified.
+MINIFIED_DIRS = ('css/', 'js/')
+MINIFIERS = {'.css': rcssmin.cssmin, '.js': rjsmin.jsmin}
+
+
+def minifier(name):
+    """The minifier for name if it is one of our stylesheets or scripts, else None."""
+    if name.startswith(MINIFIED_DIRS) and '.min.' not in name:
+        return MINIFIERS.get(name[name.rfind('.'):])
+    return None
+
+
+class AssetStorage(CompressedManifestStaticFilesStorage):
+    """Minified, content-hashed, precompressed static files."""
+
+    # A file missing from the manifest (collectstatic not run since it was added) is
+    # linked unhashed rather than failing the page.
+    manifest_strict = False
+
+    def _save(self, name, content):
+        minify = minifier(name)
+        if minify is not None:
+            content.seek(0)  # post_process hands over files it has just read to hash them
+            content = ContentFile(minify(content.read()))
+        return super()._save(name, content)
+
+    def hashed_name(self, name, content=None, filename=None):
+        # A url() in a stylesheet that points at a file not in static/ is left as written
+        # instead of failing collectstatic.
+        try:
+            return super().hashed_name(name, content, filename)
+        except ValueError:
+            return name
@@ -0,0 +1,197 @@
+"""
+Brotli and gzip compression of dynamic responses (pages, JSON, CSV exports).
+
+Static files are compressed ahead of time by collectstatic and served by WhiteNoise
+(fundi_platform/assets.py); this compresses what the views produce. The encoding is
+chosen from Accept-Encoding, honouring q-values and preferring brotli on a tie. Bodies
+under COMPRESSION_MIN_SIZE are sent as they are, since the headers would cost more than
+compression saves. Levels are COMPRESSION_BROTLI_LEVEL and COMPRESSION_GZIP_LEVEL; the
+defaults are the fast end, where a 40 KB page compresses in a third of a millisecond
+(see LOAD_TESTING.md).
+
+Streaming responses (CSV exports, FileResponse) are compressed chunk by chunk and flushed
+after each chunk, so the download still starts straight away and memory stays flat.
+Images, video, archives and anything already encoded (pre-rendered pages, WhiteNoise
+files) are passed through, as are byte ranges and responses marked no-transform.
+
+Compressing a page that reflects what the client sent next to a secret (the CSRF token,
+the session-bound details on the dashboards) lets an attacker who can watch response
+sizes guess the secret a byte at a time (BREACH). Django's masking only covers the CSRF
+token, so, like Django's GZipMiddleware, every compressed response carries 1 to
+MAX_RANDOM_BYTES bytes of padding that decompress to nothing, a different amount each
+time: the gzip header's file name, or a brotli metadata block. This is the
+Heal-the-BREACH mitigation; it makes the attack much slower, not impossible, so pages
+should still not echo request input next to secrets.
+"""
+import secrets
+import struct
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # Brotli not installed: gzip only
+    brotli = None
+
+# Most padding bytes added to a compressed response, as GZipMiddleware.max_random_bytes.
+MAX_RANDOM_BYTES = 100
+
+# Content types worth compressing; everything else (images, video, zip, pdf) already is.
+COMPRESSIBLE_TYPES = (
+    'text/', 'application/json', 'application/javascript', 'application/xml',
+    'application/xhtml+xml', 'application/rss+xml', 'application/manifest+json', 'image/svg+xml',
+)
+
+
+def negotiate(accept_encoding):
+    """'br', 'gzip' or None: what the client prefers of the encodings we offer."""
+    weights = {}
+    for part in accept_encoding.split(','):
+        name, _, params = part.partition(';')
+        weight = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name.strip().lower()] = weight
+    best, best_weight = None, 0.0
+    for encoding in (('br', 'gzip') if brotli else ('gzip',)):
+        weight = weights.get(encoding, weights.get('*', 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def random_padding():
+    return b'a' * (secrets.randbelow(MAX_RANDOM_BYTES) + 1)
+
+
+def gzip_header(padding):
+    # FNAME flag, no modification time, unknown OS; the padding is the file name.
+    return b'\x1f\x8b\x08\x08\x00\x00\x00\x00\x00\xff' + padding + b'\x00'
+
+
+def brotli_metadata(padding):
+    """A metadata meta-block (RFC 7932, 9.2) holding padding (1-256 bytes); decoders skip it.
+
+    Bits from the lowest: ISLAST 0, MNIBBLES 0 (coded 11), reserved 0, MSKIPBYTES 1, then
+    MSKIPLEN - 1 in eight bits and zeros up to the byte boundary.
+    """
+    skip = len(padding) - 1
+    return bytes([0b010110 | (skip & 3) << 6, skip >> 2]) + padding
+
+
+def compress(encoding, data):
+    return StreamCompressor(encoding).finish(data)
+
+
+class StreamCompressor:
+    """Compresses a stream piece by piece; each piece() is flushed so the client can use it.
+
+    The first output starts with the random padding.
+    """
+
+    def __init__(self, encoding):
+        if encoding == 'br':
+            packer = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_LEVEL)
+            # A flush ends on a byte boundary between meta-blocks, where the padding can go.
+            self._start = packer.process(b'') + packer.flush() + brotli_metadata(random_padding())
+            self._compress, self._flush, self._finish = packer.process, packer.flush, packer.finish
+        else:
+            # Raw deflate with the gzip header and trailer written here, to carry the padding.
+            self._packer = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, -zlib.MAX_WBITS)
+            self._start = gzip_header(random_padding())
+            self._crc = self._size = 0
+            self._compress = self._deflate
+            self._flush = lambda: self._packer.flush(zlib.Z_SYNC_FLUSH)
+            self._finish = self._gzip_finish
+
+    def _deflate(self, data):
+        self._crc = zlib.crc32(data, self._crc)
+        self._size += len(data)
+        return self._packer.compress(data)
+
+    def _gzip_finish(self):
+        return self._packer.flush() + struct.pack('<II', self._crc, self._size & 0xffffffff)
+
+    def _take_start(self):
+        start, self._start = self._start, b''
+        return start
+
+    def piece(self, data):
+        return self._take_start() + self._compress(data) + self._flush() if data else b''
+
+    def finish(self, data=b''):
+        return self._take_start() + (self._compress(data) if data else b'') + self._finish()
+
+
+def _compress_stream(encoding, chunks):
+    stream = StreamCompressor(encoding)
+    for chunk in chunks:
+        data = stream.piece(chunk)
+        if data:
+            yield data
+    yield stream.finish()
+
+
+async def _compress_async_stream(encoding, chunks):
+    stream = StreamCompressor(encoding)
+    async for chunk in chunks:
+        data = stream.piece(chunk)
+        if data:
+            yield data
+    yield stream.finish()
+
+
+class CompressionMiddleware:
+    """Compress responses with brotli or gzip when the client accepts it and it is worth it."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not self._compressible(response):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            length = response.get('Content-Length')
+            if length is not None and int(length) < settings.COMPRESSION_MIN_SIZE:
+                return response
+            if response.is_async:
+                response.streaming_content = _compress_async_stream(encoding, response.streaming_content)
+            else:
+                response.streaming_content = _compress_stream(encoding, response.streaming_content)
+            del response['Content-Length']
+        else:
+            if len(response.content) < settings.COMPRESSION_MIN_SIZE:
+                return response
+            compressed = compress(encoding, response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+
+        # The compressed body is not byte-for-byte the one the ETag was made for.
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
+
+    @staticmethod
+    def _compressible(response):
+        if response.status_code == 206 or response.has_header('Content-Encoding'):
+            return False
+        if 'no-transform' in response.get('Cache-Control', ''):
+            return False
+        return response.get('Content-Type', '').lower().startswith(COMPRESSIBLE_TYPES)
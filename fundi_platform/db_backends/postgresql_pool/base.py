@@ -0,0 +1,104 @@
+"""
+PostgreSQL backend that borrows connections from a psycopg_pool.ConnectionPool.
+
+Django 4.2 opens one connection per thread and keeps it for CONN_MAX_AGE seconds.
+Here each process keeps one pool per database, shared by its threads. A request
+takes a connection on its first query and gives it back when Django closes the
+connection at the end of the request (settings.py sets CONN_MAX_AGE=0 for this).
+With gunicorn --threads, a worker needs only as many connections as it has
+requests running queries at the same moment, up to max_size.
+
+Enabled by settings.py with DJANGO_DB_POOL=psycopg. OPTIONS['pool'] takes these
+psycopg_pool.ConnectionPool arguments: min_size, max_size, timeout (seconds to wait
+for a free connection), max_idle, max_lifetime, and check (bool, test each connection
+before handing it out).
+"""
+import atexit
+import threading
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.base.base import NO_DB_ALIAS
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.psycopg_any import IsolationLevel, is_psycopg3
+
+try:
+    from psycopg_pool import ConnectionPool
+except ImportError as e:
+    raise ImproperlyConfigured(
+        "DJANGO_DB_POOL=psycopg needs psycopg 3 and psycopg-pool: pip install 'psycopg[binary,pool]'"
+    ) from e
+
+POOL_DEFAULTS = {
+    'min_size': 1,
+    'max_size': 4,
+    'timeout': 10,
+    'max_idle': 300,
+    'max_lifetime': 3600,
+    'check': True,
+}
+
+_pools = {}  # (alias, dbname) -> ConnectionPool, per process
+_pools_lock = threading.Lock()
+
+
+def close_pools():
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
+
+
+atexit.register(close_pools)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        self.pool_options = {**POOL_DEFAULTS, **params.pop('pool', {})}
+        return params
+
+    @property
+    def uses_pool(self):
+        # The no-database connection (CREATE DATABASE for tests) is short-lived; connect directly.
+        return is_psycopg3 and self.alias != NO_DB_ALIAS
+
+    def get_pool(self, conn_params):
+        key = (self.alias, conn_params.get('dbname'))
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                options = dict(self.pool_options)
+                check = options.pop('check')
+                pool = ConnectionPool(
+                    kwargs=conn_params,
+                    check=ConnectionPool.check_connection if check else None,
+                    name=f'django-{self.alias}',
+                    open=True,
+                    **options,
+                )
+                _pools[key] = pool
+            return pool
+
+    def get_new_connection(self, conn_params):
+        if not self.uses_pool:
+            return super().get_new_connection(conn_params)
+
+        self.pool = self.get_pool(conn_params)
+        connection = self.pool.getconn()
+        isolation_level = self.settings_dict['OPTIONS'].get('isolation_level')
+        if isolation_level is None:
+            self.isolation_level = IsolationLevel.READ_COMMITTED
+        else:
+            try:
+                self.isolation_level = IsolationLevel(isolation_level)
+            except ValueError:
+                raise ImproperlyConfigured(f"Invalid transaction isolation level {isolation_level} specified.")
+            connection.isolation_level = self.isolation_level
+        return connection
+
+    def _close(self):
+        if self.connection is None or not self.uses_pool:
+            return super()._close()
+        # putconn() rolls back an open transaction and drops broken connections.
+        with self.wrap_database_errors:
+            self.pool.putconn(self.connection)
@@ -0,0 +1,44 @@
+"""
+SQLite backend tuned for several gunicorn workers writing to one database file.
+
+Django 4.2 has no init_command/transaction_mode options for SQLite, so this wraps the
+stock backend:
+- every new connection runs the PRAGMAs below (WAL journaling, synchronous=NORMAL,
+  memory-mapped I/O, busy timeout, ...);
+- transaction.atomic() starts with BEGIN IMMEDIATE, taking the write lock up front.
+  With a plain (deferred) BEGIN, a transaction that reads and then writes can fail
+  at once with "database is locked" instead of waiting for busy_timeout.
+
+Enabled by settings.py for SQLite databases when DJANGO_SQLITE_TUNED=True (off by default).
+Extra OPTIONS understood here: 'pragmas' (dict, merged over the defaults) and
+'begin_immediate' (bool).
+"""
+from django.db.backends.sqlite3 import base
+
+DEFAULT_PRAGMAS = {
+    # Readers no longer block the writer (and vice versa); persists in the file.
+    'journal_mode': 'WAL',
+    # Safe with WAL: a power cut can lose the last commits, never corrupt the file.
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    'busy_timeout': 20000,  # ms; keep below gunicorn's 30s worker timeout
+    'cache_size': -64000,  # KiB (negative = size, not pages): 64 MB page cache
+    'temp_store': 'MEMORY',
+}
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        self.pragmas = {**DEFAULT_PRAGMAS, **params.pop('pragmas', {})}
+        self.begin_immediate = params.pop('begin_immediate', True)
+        return params
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.pragmas.items():
+            conn.execute(f'PRAGMA {name} = {value}')
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute('BEGIN IMMEDIATE' if self.begin_immediate else 'BEGIN')
@@ -0,0 +1,166 @@
+"""
+Send the heavy read-only pages and reporting commands to read replicas.
+
+Replicas come from DATABASE_REPLICA_URLS (comma separated) and are registered in
+settings.DATABASES as replica1, replica2, ... Reads only go to a replica inside
+replica_reads(): ReplicaRoutingMiddleware opens it for GET requests to the views in
+settings.REPLICA_READ_VIEWS, and reporting commands wrap their work in it. Every
+write, and every read outside it, uses 'default'.
+
+Read-your-writes: a request that writes (or any non-GET request) sets a short-lived
+cookie. While it is present that browser reads from the primary, so the page shown
+right after a booking or payment never misses it on a replica that is behind.
+
+Each process checks a replica at most every REPLICA_HEALTH_CHECK_SECONDS. One that
+is unreachable, or more than REPLICA_MAX_LAG_SECONDS behind (PostgreSQL reports
+this; other backends are assumed current), is skipped until the next check. With no
+healthy replica, reads go to the primary.
+"""
+import contextvars
+import random
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+PRIMARY = 'default'
+PIN_COOKIE = 'db_primary_pin'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+# Read on every request; a session missing on a lagging replica would log the user out.
+PRIMARY_ONLY_MODELS = {'sessions.session'}
+
+# Per request (or per replica_reads block): {'replica': bool, 'alias': str|None, 'wrote': bool}
+_state = contextvars.ContextVar('db_routing_state', default=None)
+_health = {}  # alias -> (checked_at, healthy)
+
+PG_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias.startswith('replica')]
+
+
+def replica_lag(alias):
+    """Seconds the replica is behind its primary (0 when caught up or not measurable)."""
+    connection = connections[alias]
+    connection.ensure_connection()
+    if connection.vendor != 'postgresql':
+        return 0.0
+    with connection.cursor() as cursor:
+        cursor.execute(PG_LAG_SQL)
+        return float(cursor.fetchone()[0] or 0)
+
+
+def is_healthy(alias):
+    checked_at, healthy = _health.get(alias, (None, False))
+    now = time.monotonic()
+    if checked_at is not None and now - checked_at < settings.REPLICA_HEALTH_CHECK_SECONDS:
+        return healthy
+
+    try:
+        lag = replica_lag(alias)
+    except DatabaseError as e:
+        print(f"DB router: {alias} unreachable, reading from primary: {e}")
+        connections[alias].close()
+        healthy = False
+    else:
+        healthy = lag <= settings.REPLICA_MAX_LAG_SECONDS
+        if not healthy:
+            print(f"DB router: {alias} is {lag:.1f}s behind, reading from primary")
+    _health[alias] = (now, healthy)
+    return healthy
+
+
+def _pick_replica():
+    healthy = [alias for alias in replica_aliases() if is_healthy(alias)]
+    return random.choice(healthy) if healthy else PRIMARY
+
+
+@contextmanager
+def replica_reads():
+    """Route reads in this block to a healthy replica (no-op without replicas)."""
+    token = _state.set({'replica': True, 'alias': None, 'wrote': False})
+    try:
+        yield
+    finally:
+        _state.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if not state or not state['replica'] or state['wrote']:
+            return PRIMARY
+        if model._meta.label_lower in PRIMARY_ONLY_MODELS:
+            return PRIMARY
+        if state['alias'] is None:
+            # One replica per request, so a page never mixes two replicas' views of the data.
+            state['alias'] = _pick_replica()
+        return state['alias']
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state:
+            state['wrote'] = True
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema through replication.
+        return db == PRIMARY
+
+
+class ReplicaRoutingMiddleware:
+    """Opens replica reads for REPLICA_READ_VIEWS and pins recent writers to the primary."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state = {'replica': False, 'alias': None, 'wrote': False}
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+
+        if response.streaming and state['replica']:
+            # CSV exports run their queries while the body streams, after this returns.
+            response.streaming_content = _stream_with_state(response.streaming_content, state)
+        if state['wrote'] or request.method not in SAFE_METHODS:
+            response.set_cookie(
+                PIN_COOKIE, '1', max_age=settings.REPLICA_STICKY_SECONDS, httponly=True, samesite='Lax',
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        match = request.resolver_match
+        if (
+            request.method in ('GET', 'HEAD')
+            and match is not None
+            and match.url_name in settings.REPLICA_READ_VIEWS
+            and PIN_COOKIE not in request.COOKIES
+        ):
+            _state.get()['replica'] = True
+
+
+def _stream_with_state(content, state):
+    chunks = iter(content)
+    while True:
+        token = _state.set(state)
+        try:
+            chunk = next(chunks)
+        except StopIteration:
+            return
+        finally:
+            _state.reset(token)
+        yield chunk
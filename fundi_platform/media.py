@@ -0,0 +1,200 @@
+"""
+Serving user uploads (MEDIA_ROOT) efficiently from Django.
+
+MediaStorage puts a hash of each file's content in its URL: MEDIA_URL<hash>/<name>.
+A changed file gets a new URL, so serve_media marks hashed URLs immutable for a year and
+browsers and CDNs never ask again. Plain MEDIA_URL<name> URLs (old links, and files
+written outside the storage) still work but are revalidated every time. Every response
+carries an ETag (the same content hash), so revalidation is a 304 with no body.
+ContentAddressedStorage (profile pictures) goes further and names files by their
+content, so identical uploads are stored once.
+
+File bodies go out as a wsgi.file_wrapper, which gunicorn sends with sendfile(), so
+the kernel copies the file to the socket and no Python worker reads it. This holds for
+byte ranges (video/photo viewers, resumed downloads) too. Behind nginx, set
+MEDIA_ACCEL_REDIRECT and nginx sends the file (and handles ranges) instead.
+"""
+import mimetypes
+import os
+import posixpath
+import re
+import stat
+from hashlib import sha256
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import FileSystemStorage
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+
+HASH_LENGTH = 16  # hex characters of the SHA-256 in the URL and ETag
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'public, no-cache'
+BLOCK_SIZE = 64 * 1024  # when the server cannot sendfile()
+
+# path -> (mtime_ns, size, hash). Each process hashes a file once until it changes.
+_hashes = {}
+MAX_CACHED_HASHES = 100_000
+
+
+def content_hash(path, st=None):
+    """Hex hash of the file's content, or None if it does not exist."""
+    try:
+        st = st or os.stat(path)
+    except OSError:
+        return None
+    cached = _hashes.get(path)
+    if cached and cached[:2] == (st.st_mtime_ns, st.st_size):
+        return cached[2]
+    digest = sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(BLOCK_SIZE), b''):
+            digest.update(block)
+    if len(_hashes) >= MAX_CACHED_HASHES:
+        _hashes.clear()
+    _hashes[path] = (st.st_mtime_ns, st.st_size, digest.hexdigest()[:HASH_LENGTH])
+    return _hashes[path][2]
+
+
+class MediaStorage(FileSystemStorage):
+    """FileSystemStorage with content-hashed URLs (MEDIA_URL<hash>/<name>)."""
+
+    def url(self, name):
+        digest = content_hash(self.path(name)) if name else None
+        return super().url(f'{digest}/{name}' if digest else name)
+
+
+class ContentAddressedStorage(MediaStorage):
+    """Stores each file as <upload_to>/<SHA-256 of its content><ext>.
+
+    Saving content that is already stored writes nothing and returns the existing name,
+    so identical uploads share one file. A stored file never changes; files nothing
+    refers to any more are deleted by `manage.py media_gc` (services/media_files.py).
+    """
+    NAME_LENGTH = 32
+    name_pattern = re.compile(rf'^[0-9a-f]{{{NAME_LENGTH}}}$')
+
+    def content_name(self, name, content):
+        digest = sha256()
+        content.seek(0)
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        extension = posixpath.splitext(name)[1].lower()
+        return posixpath.join(posixpath.dirname(name), digest.hexdigest()[:self.NAME_LENGTH] + extension)
+
+    def is_content_addressed(self, name):
+        return bool(self.name_pattern.match(posixpath.splitext(posixpath.basename(name or ''))[0]))
+
+    def _save(self, name, content):
+        name = self.content_name(name, content)
+        if self.exists(name):
+            return name
+        return super()._save(name, content)
+
+    def url(self, name):
+        if self.is_content_addressed(name):
+            # The name already holds the hash: no need to read the file.
+            digest = posixpath.basename(name)[:HASH_LENGTH]
+            return FileSystemStorage.url(self, f'{digest}/{name}')
+        return super().url(name)
+
+
+class _FileRange:
+    """The next `length` bytes of an open file, for FileResponse.
+
+    Keeps fileno(): gunicorn sendfile()s from the file's current offset for the response's
+    Content-Length, so a range is still sent by the kernel. Other servers read() it.
+    """
+
+    def __init__(self, file, length):
+        self.file = file
+        self.name = file.name
+        self.remaining = length
+
+    def read(self, size=-1):
+        size = self.remaining if size < 0 else min(size, self.remaining)
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def byte_range(header, size):
+    """(first, last) byte of a single 'bytes=' Range, None to send the whole file, or False if unsatisfiable."""
+    units, _, spec = header.partition('=')
+    if units.strip().lower() != 'bytes' or ',' in spec:
+        return None  # multiple ranges: send it all, which the spec allows
+    first, _, last = spec.strip().partition('-')
+    try:
+        if not first:
+            suffix = int(last)  # bytes=-500: the last 500 bytes
+            return (max(0, size - suffix), size - 1) if suffix > 0 and size else False
+        first = int(first)
+        last = min(int(last), size - 1) if last else size - 1
+    except ValueError:
+        return None
+    return (first, last) if first <= last else False
+
+
+@require_safe
+def serve_media(request, path, version=None):
+    """A file under MEDIA_ROOT, with caching headers, conditional GET and byte ranges."""
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+        st = os.stat(full_path)
+    except (SuspiciousFileOperation, OSError):
+        raise Http404('File not found')
+    if not stat.S_ISREG(st.st_mode):
+        raise Http404('File not found')
+
+    etag = f'"{content_hash(full_path, st)}"'
+    headers = HttpResponse()
+    headers['ETag'] = etag
+    headers['Last-Modified'] = http_date(st.st_mtime)
+    # A stale hash still gets today's file, just not for a year.
+    headers['Cache-Control'] = IMMUTABLE if version and f'"{version}"' == etag else REVALIDATE
+    headers['Accept-Ranges'] = 'bytes'
+    # If-None-Match / If-Modified-Since: answered before the file is opened.
+    response = get_conditional_response(request, etag=etag, last_modified=int(st.st_mtime), response=headers)
+    if response is not headers:
+        return response
+
+    content_type = mimetypes.guess_type(full_path)[0] or 'application/octet-stream'
+    if settings.MEDIA_ACCEL_REDIRECT:
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = settings.MEDIA_ACCEL_REDIRECT + quote(path)
+    else:
+        requested = request.META.get('HTTP_RANGE')
+        if_range = request.META.get('HTTP_IF_RANGE')
+        if requested and if_range and if_range not in (etag, headers['Last-Modified']):
+            requested = None  # the client's partial copy is of an older file: send all of this one
+        span = byte_range(requested, st.st_size) if requested else None
+        if span is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{st.st_size}'
+            return response
+
+        file = open(full_path, 'rb')
+        if span is None:
+            response = FileResponse(file, content_type=content_type)
+        else:
+            first, last = span
+            file.seek(first)
+            response = FileResponse(_FileRange(file, last - first + 1), status=206, content_type=content_type)
+            response['Content-Length'] = last - first + 1
+            response['Content-Range'] = f'bytes {first}-{last}/{st.st_size}'
+        response.block_size = BLOCK_SIZE
+
+    for name in ('ETag', 'Last-Modified', 'Cache-Control', 'Accept-Ranges'):
+        response[name] = headers[name]
+    return response
@@ -4,7 +4,7 @@ Django settings for fundi_platform project.
 
 from pathlib import Path
 import os
-from decouple import config
+from decouple import Csv, config
 import dj_database_url
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -53,12 +53,16 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    # After WhiteNoise, whose files are compressed ahead of time and never reach it.
+    'fundi_platform.compression.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # Last, so its responses still get the security headers; it answers before any session lookup.
+    'services.prerender.PrerenderedPageMiddleware',
 ]
 
 ROOT_URLCONF = 'fundi_platform.urls'
@@ -101,10 +105,125 @@ if DATABASE_URL:
         ssl_require=not DEBUG,
     )
 
+# Optional read replicas (comma separated URLs) for the heavy read-only pages and
+# reporting commands. See fundi_platform/db_router.py for how reads are routed.
+DATABASE_REPLICA_URLS = config('DATABASE_REPLICA_URLS', default='', cast=Csv())
+for i, url in enumerate(DATABASE_REPLICA_URLS, start=1):
+    DATABASES[f'replica{i}'] = dj_database_url.parse(url, conn_max_age=600, ssl_require=not DEBUG)
+    DATABASES[f'replica{i}']['TEST'] = {'MIRROR': 'default'}
+if DATABASE_REPLICA_URLS:
+    DATABASE_ROUTERS = ['fundi_platform.db_router.ReplicaRouter']
+    MIDDLEWARE.append('fundi_platform.db_router.ReplicaRoutingMiddleware')
+
+REPLICA_READ_VIEWS = [
+    'home',
+    'fundi_list',
+    'admin_dashboard',
+    'admin_fundi_activity',
+    'admin_export_bookings',
+    'admin_export_customers',
+    'admin_export_payments',
+]
+# After a write, that browser reads from the primary for this long.
+REPLICA_STICKY_SECONDS = config('DJANGO_REPLICA_STICKY_SECONDS', default=10, cast=int)
+REPLICA_MAX_LAG_SECONDS = config('DJANGO_REPLICA_MAX_LAG_SECONDS', default=5, cast=float)
+REPLICA_HEALTH_CHECK_SECONDS = config('DJANGO_REPLICA_HEALTH_CHECK_SECONDS', default=5, cast=float)
+
+# services/matching.py keeps a per-process index of fundi features for ranking; each
+# process rebuilds it this often to pick up changes saved by other processes.
+MATCHING_INDEX_MAX_AGE = config('DJANGO_MATCHING_INDEX_MAX_AGE', default=300, cast=int)
+
+# Posted jobs (services/dispatch.py): how many fundis are offered a job at once, and for how long.
+DISPATCH_FANOUT = config('DJANGO_DISPATCH_FANOUT', default=3, cast=int)
+DISPATCH_OFFER_SECONDS = config('DJANGO_DISPATCH_OFFER_SECONDS', default=300, cast=int)
+
+# Opt-in SQLite profile for multi-worker deployments: WAL, synchronous=NORMAL, mmap, busy
+# timeout and BEGIN IMMEDIATE writes (see fundi_platform/db_backends/sqlite3/base.py).
+# WAL needs the database on a local disk (not NFS) and leaves -wal/-shm files beside it,
+# so it is only switched on with DJANGO_SQLITE_TUNED=True.
+SQLITE_TUNED = config('DJANGO_SQLITE_TUNED', default=False, cast=bool)
+for db in DATABASES.values():
+    if db['ENGINE'] != 'django.db.backends.sqlite3':
+        continue
+    # sslmode only makes sense for PostgreSQL; DATABASE_URL adds it when DEBUG is off.
+    db.get('OPTIONS', {}).pop('sslmode', None)
+    if SQLITE_TUNED:
+        db['ENGINE'] = 'fundi_platform.db_backends.sqlite3'
+        db.setdefault('OPTIONS', {})
+        db['OPTIONS'].setdefault('pragmas', {
+            'mmap_size': config('DJANGO_SQLITE_MMAP_SIZE', default=256 * 1024 * 1024, cast=int),
+            'busy_timeout': config('DJANGO_SQLITE_BUSY_TIMEOUT_MS', default=20000, cast=int),
+        })
+
+# PostgreSQL connection handling (DJANGO_DB_POOL), see DATABASE_SCALING.md:
+#   (empty)    one persistent connection per worker thread, kept for 10 minutes
+#   psycopg    per-process psycopg_pool shared by a worker's threads (gunicorn --threads)
+#   pgbouncer  DATABASE_URL points at PgBouncer in transaction pooling mode
+DB_POOL = config('DJANGO_DB_POOL', default='')
+if DB_POOL not in ('', 'psycopg', 'pgbouncer'):
+    raise ValueError(f"DJANGO_DB_POOL must be empty, 'psycopg' or 'pgbouncer', not {DB_POOL!r}")
+for db in DATABASES.values():
+    if db['ENGINE'] != 'django.db.backends.postgresql':
+        continue
+    if DB_POOL == 'psycopg':
+        db['ENGINE'] = 'fundi_platform.db_backends.postgresql_pool'
+        # Hand the connection back to the pool at the end of every request.
+        db['CONN_MAX_AGE'] = 0
+        db.setdefault('OPTIONS', {})['pool'] = {
+            'min_size': config('DJANGO_DB_POOL_MIN_SIZE', default=1, cast=int),
+            'max_size': config('DJANGO_DB_POOL_MAX_SIZE', default=4, cast=int),
+            'timeout': config('DJANGO_DB_POOL_TIMEOUT', default=10, cast=float),
+            'max_idle': config('DJANGO_DB_POOL_MAX_IDLE', default=300, cast=float),
+            'max_lifetime': config('DJANGO_DB_POOL_MAX_LIFETIME', default=3600, cast=float),
+            'check': config('DJANGO_DB_POOL_CHECK', default=True, cast=bool),
+        }
+    else:
+        # Re-check a reused persistent connection once per request instead of failing on it.
+        db['CONN_HEALTH_CHECKS'] = config('DJANGO_DB_HEALTH_CHECKS', default=True, cast=bool)
+    if DB_POOL == 'pgbouncer':
+        # Server-side cursors and prepared statements do not survive transaction pooling.
+        db['DISABLE_SERVER_SIDE_CURSORS'] = True
+        db.setdefault('OPTIONS', {}).pop('prepare_threshold', None)
 
 # Custom User Model
 AUTH_USER_MODEL = 'services.User'
 
+# The logged-in user is read from the cache (services/user_cache.py) instead of the database
+# on every request. ModelBackend stays listed so sessions from before this still work.
+AUTHENTICATION_BACKENDS = [
+    'services.user_cache.CachedUserBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+USER_CACHE_SECONDS = config('DJANGO_USER_CACHE_SECONDS', default=60, cast=int)
+
+# Cache: per process unless DJANGO_CACHE_URL is set, e.g. redis://host:6379/0 (needs the
+# redis package) to share it between processes and servers.
+CACHE_URL = config('DJANGO_CACHE_URL', default='')
+if CACHE_URL:
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': CACHE_URL}}
+
+# Rate limits (services/ratelimit.py): POSTs to these endpoints take a token from a bucket per
+# key ('ip', 'user', 'phone' for the M-Pesa number, 'username' tried at login). '5/10m' is a
+# bucket of 5 refilled at 5 per 10 minutes. Shared between workers with DJANGO_CACHE_URL.
+RATE_LIMITS_ENABLED = config('DJANGO_RATE_LIMITS_ENABLED', default=True, cast=bool)
+RATE_LIMITS = {
+    'login': {'ip': '20/10m', 'username': '10/10m'},
+    'create_payment': {'user': '5/10m', 'phone': '5/10m', 'ip': '20/10m'},
+    'contact_fundi': {'user': '10/h', 'ip': '10/h'},
+}
+# Proxies in front of the app that append the client's address to X-Forwarded-For (Render: 1).
+# With 0 the connection's address is used.
+TRUSTED_PROXY_COUNT = config('DJANGO_TRUSTED_PROXY_COUNT', default=1 if os.environ.get('RENDER') else 0, cast=int)
+
+# Sessions: db (a query per request), cached_db (read from the cache, written through to the
+# database) or signed_cookies (kept in the browser; nothing stored, but a session cannot be
+# ended from the server). cached_db needs DJANGO_CACHE_URL: with a per-process cache, a
+# session ended in one process stays valid in the others' caches. Run
+# `manage.py clear_expired_sessions` daily for db and cached_db.
+SESSION_ENGINE = 'django.contrib.sessions.backends.' + config(
+    'DJANGO_SESSION_ENGINE', default='cached_db' if CACHE_URL else 'db'
+)
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -123,6 +242,25 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing: pbkdf2 (Django's default) or argon2. Hashes made with the
+# other one still work, and are re-hashed with the chosen one when the user next logs in.
+# Argon2 cost: ARGON2_MEMORY_KIB of memory per hash, ARGON2_TIME_COST passes over it
+# (fundi_platform/hashers.py); raising either re-hashes on login too.
+PASSWORD_HASHER = config('DJANGO_PASSWORD_HASHER', default='pbkdf2')
+ARGON2_TIME_COST = config('DJANGO_ARGON2_TIME_COST', default=2, cast=int)
+ARGON2_MEMORY_KIB = config('DJANGO_ARGON2_MEMORY_KIB', default=19456, cast=int)
+ARGON2_PARALLELISM = config('DJANGO_ARGON2_PARALLELISM', default=1, cast=int)
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'fundi_platform.hashers.TunedArgon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+if PASSWORD_HASHER == 'argon2':
+    PASSWORD_HASHERS.insert(0, PASSWORD_HASHERS.pop(2))
+elif PASSWORD_HASHER != 'pbkdf2':
+    raise ValueError(f"DJANGO_PASSWORD_HASHER must be 'pbkdf2' or 'argon2', not {PASSWORD_HASHER!r}")
 
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
@@ -143,13 +281,44 @@ STATIC_URL = 'static/'
 STATICFILES_DIRS = [BASE_DIR / 'static']
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
-# Compressed (no manifest) avoids collectstatic failures from missing CSS URL references.
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedStaticFilesStorage'
+# Minified, content-hashed and gzip/brotli-compressed by collectstatic, served by WhiteNoise
+# with far-future caching (fundi_platform/assets.py). Missing CSS url() references are
+# left as written rather than failing collectstatic.
+STATICFILES_STORAGE = 'fundi_platform.assets.AssetStorage'
 
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = Path(config('DJANGO_MEDIA_ROOT', default=str(BASE_DIR / 'media')))
 
+# Uploads get content-hashed URLs and are served by fundi_platform/media.py (immutable caching,
+# ETag, byte ranges, sendfile).
+DEFAULT_FILE_STORAGE = 'fundi_platform.media.MediaStorage'
+# Behind nginx: the prefix of an `internal` location aliased to MEDIA_ROOT (e.g. /protected-media/).
+# Django then only answers conditional requests and hands the file to nginx with X-Accel-Redirect.
+MEDIA_ACCEL_REDIRECT = config('DJANGO_MEDIA_ACCEL_REDIRECT', default='')
+
+# Profile picture thumbnails (services/thumbnails.py) are made in a thread once an upload is saved.
+# Set to False when `manage.py make_thumbnails --watch` runs as a worker instead.
+THUMBNAILS_IN_THREAD = config('DJANGO_THUMBNAILS_IN_THREAD', default=True, cast=bool)
+
+# Pre-rendered public pages (services/prerender.py): visitors who are not logged in get fundi
+# profiles and category pages as files from PRERENDER_ROOT, without a database query. Build them
+# with `manage.py prerender_pages --all`; changes re-render the affected pages in a thread, or set
+# DJANGO_PRERENDER_IN_THREAD=False and run `manage.py prerender_pages --watch` as a worker.
+PRERENDER_PAGES = config('DJANGO_PRERENDER_PAGES', default=False, cast=bool)
+PRERENDER_ROOT = Path(config('DJANGO_PRERENDER_ROOT', default=str(BASE_DIR / 'prerendered')))
+PRERENDER_IN_THREAD = config('DJANGO_PRERENDER_IN_THREAD', default=True, cast=bool)
+
+# Brotli/gzip for dynamic responses (fundi_platform/compression.py). Smaller bodies are sent
+# as they are. Brotli levels run 0-11 and gzip 1-9; higher is smaller and slower.
+COMPRESSION_MIN_SIZE = config('DJANGO_COMPRESSION_MIN_SIZE', default=512, cast=int)
+COMPRESSION_BROTLI_LEVEL = config('DJANGO_COMPRESSION_BROTLI_LEVEL', default=4, cast=int)
+COMPRESSION_GZIP_LEVEL = config('DJANGO_COMPRESSION_GZIP_LEVEL', default=6, cast=int)
+
+# Part of every page ETag (services/versions.py), so a deploy never answers 304 with old templates.
+# Unset, a hash of the git commit, templates and static manifest is used.
+RELEASE = config('DJANGO_RELEASE', default=os.environ.get('RENDER_GIT_COMMIT', ''))
+
 # Common production settings when behind a proxy (Render/Railway/Heroku, etc.)
 SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
 
@@ -0,0 +1,110 @@
+"""
+Compression benchmark: bytes on the wire and CPU time for dynamic responses.
+
+Renders the pages html_weight.py measures, then for each compresses the HTML the way
+fundi_platform/compression.py does and reports the size and the time it took, at the
+configured levels and across a range of levels. Finally downloads the admin bookings CSV
+export through the middleware (streamed and compressed chunk by chunk) as plain, gzip and
+brotli and reports the bytes received.
+
+Usage (from project root, DATABASE_URL pointing at a database with fake data):
+  python loadtest/bench_compression.py
+  python loadtest/bench_compression.py --repeat 50 --output compression.json
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from html_weight import pages  # noqa: E402  (sets up Django)
+
+from django.conf import settings  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from django.urls import reverse  # noqa: E402
+
+from fundi_platform.compression import compress  # noqa: E402
+from services.models import User  # noqa: E402
+
+LEVELS = [('gzip', 1), ('gzip', 6), ('gzip', 9), ('br', 1), ('br', 4), ('br', 6), ('br', 9), ('br', 11)]
+
+
+def timed_compress(encoding, level, body, repeat):
+    """(compressed size, median milliseconds) at this level."""
+    setting = 'COMPRESSION_BROTLI_LEVEL' if encoding == 'br' else 'COMPRESSION_GZIP_LEVEL'
+    saved = getattr(settings, setting)
+    setattr(settings, setting, level)
+    try:
+        times = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            size = len(compress(encoding, body))
+            times.append(time.perf_counter() - started)
+    finally:
+        setattr(settings, setting, saved)
+    times.sort()
+    return size, round(times[len(times) // 2] * 1000, 3)
+
+
+def export_sizes():
+    """Bytes received for the bookings CSV export per Accept-Encoding, and its chunk count."""
+    admin = User.objects.filter(is_staff=True).first() or User.objects.filter(is_superuser=True).first()
+    if admin is None:
+        return {}
+    client = Client()
+    client.force_login(admin)
+    sizes = {}
+    for encoding in ('identity', 'gzip', 'br'):
+        response = client.get(reverse('admin_export_bookings'), HTTP_ACCEPT_ENCODING=encoding)
+        chunks = list(response.streaming_content)
+        sizes[encoding] = {'bytes': sum(map(len, chunks)), 'chunks': len(chunks),
+                           'encoding': response.get('Content-Encoding', 'identity')}
+    return sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure compression of dynamic responses.')
+    parser.add_argument('--repeat', type=int, default=20, help='Compressions per page and level')
+    parser.add_argument('--output', help='Write results as JSON here')
+    args = parser.parse_args()
+
+    setup_test_environment()
+    bodies = {}
+    for label, client, path in pages():
+        response = client.get(path, HTTP_ACCEPT_ENCODING='identity')
+        if response.status_code == 200 and not response.streaming:
+            bodies[label] = response.content
+
+    gzip_level, br_level = settings.COMPRESSION_GZIP_LEVEL, settings.COMPRESSION_BROTLI_LEVEL
+    results = {'pages': {}, 'levels': {}, 'export': export_sizes()}
+    print(f'{"page":<18} {"bytes":>8} {f"gzip-{gzip_level}":>8} {"ms":>6} {f"br-{br_level}":>8} {"ms":>6}')
+    for label, body in bodies.items():
+        gz, gz_ms = timed_compress('gzip', gzip_level, body, args.repeat)
+        br, br_ms = timed_compress('br', br_level, body, args.repeat)
+        results['pages'][label] = {'bytes': len(body), 'gzip': gz, 'gzip_ms': gz_ms, 'br': br, 'br_ms': br_ms}
+        print(f'{label:<18} {len(body):>8,} {gz:>8,} {gz_ms:>6.2f} {br:>8,} {br_ms:>6.2f}')
+
+    total = sum(map(len, bodies.values()))
+    print(f'\nAll {len(bodies)} pages, {total:,} bytes:')
+    print(f'{"level":<9} {"bytes":>8} {"ratio":>6} {"ms":>7}')
+    for encoding, level in LEVELS:
+        sizes, times = zip(*(timed_compress(encoding, level, body, args.repeat) for body in bodies.values()))
+        name = f'{encoding}-{level}'
+        results['levels'][name] = {'bytes': sum(sizes), 'ms': round(sum(times), 2)}
+        print(f'{name:<9} {sum(sizes):>8,} {sum(sizes) / total:>6.1%} {sum(times):>7.2f}')
+
+    if results['export']:
+        print('\nBookings CSV export through the middleware:')
+        for encoding, row in results['export'].items():
+            print(f'Accept-Encoding {encoding:<9} {row["bytes"]:>10,} bytes in {row["chunks"]} chunks ({row["encoding"]})')
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+        print(f'Wrote {args.output}')
+
+
+if __name__ == '__main__':
+    main()
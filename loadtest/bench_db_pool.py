@@ -0,0 +1,178 @@
+"""
+PostgreSQL connection benchmark: persistent connections vs psycopg pool (vs PgBouncer).
+
+For each mode, starts gunicorn (gthread workers) against the same database, sends
+concurrent GET requests for a fixed time, and samples pg_stat_activity to count the
+server connections the app holds. Reports latency percentiles, requests/s and the
+peak and mean connection count.
+
+Usage (from project root, DATABASE_URL pointing at a migrated PostgreSQL database
+with data, e.g. from generate_fake_data):
+  python loadtest/bench_db_pool.py
+  python loadtest/bench_db_pool.py --workers 4 --threads 8 --clients 32 --seconds 30
+  python loadtest/bench_db_pool.py --pgbouncer-url postgres://app@127.0.0.1:6432/fundi
+
+Modes:
+  persistent  DJANGO_DB_POOL unset (CONN_MAX_AGE=600, one connection per thread)
+  pool        DJANGO_DB_POOL=psycopg (one pool per worker, --pool-size connections)
+  pgbouncer   DJANGO_DB_POOL=pgbouncer, only with --pgbouncer-url
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import psycopg
+import requests
+
+ROOT = Path(__file__).resolve().parent.parent
+
+CONNECTIONS_SQL = """
+    SELECT count(*) FROM pg_stat_activity
+    WHERE datname = current_database() AND backend_type = 'client backend' AND pid <> pg_backend_pid()
+"""
+
+
+def percentile(ordered, pct):
+    if not ordered:
+        return None
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * pct))] * 1000, 1)
+
+
+def wait_until_up(url, timeout=30):
+    """Poll until gunicorn answers; returns the first answered request's time in ms (cold start)."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        started = time.perf_counter()
+        try:
+            requests.get(url, timeout=30)
+        except requests.ConnectionError:
+            time.sleep(0.3)
+            continue
+        return round((time.perf_counter() - started) * 1000, 1)
+    raise SystemExit(f'gunicorn did not start on {url}')
+
+
+def sample_connections(monitor_url, stop, samples):
+    # The monitor connects to the real server, not PgBouncer, to see server connections.
+    with psycopg.connect(monitor_url, autocommit=True) as conn:
+        while not stop.is_set():
+            samples.append(conn.execute(CONNECTIONS_SQL).fetchone()[0])
+            time.sleep(0.2)
+
+
+def client(base_url, paths, deadline, latencies, errors):
+    session = requests.Session()
+    i = 0
+    while time.monotonic() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        started = time.perf_counter()
+        try:
+            response = session.get(base_url + path, timeout=30)
+            ok = response.status_code < 500
+        except requests.RequestException:
+            ok = False
+        if ok:
+            latencies.append(time.perf_counter() - started)
+        else:
+            errors.append(path)
+
+
+def run_mode(name, env_overrides, args, monitor_url):
+    base_url = f'http://127.0.0.1:{args.port}'
+    env = dict(os.environ, DJANGO_DEBUG='False', DJANGO_ALLOWED_HOSTS='127.0.0.1,localhost', **env_overrides)
+    server = subprocess.Popen(
+        [
+            sys.executable, '-m', 'gunicorn', 'fundi_platform.wsgi:application',
+            '--bind', f'127.0.0.1:{args.port}', '--workers', str(args.workers),
+            '--threads', str(args.threads), '--worker-class', 'gthread', '--log-level', 'warning',
+        ],
+        cwd=ROOT, env=env,
+    )
+    try:
+        # Cold start: the first request a worker serves pays for connecting.
+        first_request_ms = wait_until_up(base_url + args.paths[0])
+
+        stop = threading.Event()
+        samples = []
+        monitor = threading.Thread(target=sample_connections, args=(monitor_url, stop, samples))
+        monitor.start()
+
+        latencies, errors = [], []
+        deadline = time.monotonic() + args.seconds
+        clients = [
+            threading.Thread(target=client, args=(base_url, args.paths, deadline, latencies, errors))
+            for _ in range(args.clients)
+        ]
+        for thread in clients:
+            thread.start()
+        for thread in clients:
+            thread.join()
+        stop.set()
+        monitor.join()
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'rps': round(len(latencies) / args.seconds, 1),
+        'first_request_ms': first_request_ms,
+        'p50_ms': percentile(latencies, 0.50),
+        'p95_ms': percentile(latencies, 0.95),
+        'p99_ms': percentile(latencies, 0.99),
+        'peak_connections': max(samples, default=0),
+        'mean_connections': round(sum(samples) / len(samples), 1) if samples else 0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare PostgreSQL connection handling under load.')
+    parser.add_argument('--workers', type=int, default=4, help='gunicorn worker processes')
+    parser.add_argument('--threads', type=int, default=8, help='threads per worker')
+    parser.add_argument('--clients', type=int, default=32, help='concurrent HTTP clients')
+    parser.add_argument('--seconds', type=float, default=20)
+    parser.add_argument('--pool-size', type=int, default=4, help='DJANGO_DB_POOL_MAX_SIZE for the pool mode')
+    parser.add_argument('--port', type=int, default=8011)
+    parser.add_argument('--paths', nargs='+', default=['/'], help='Paths to request in turn (anonymous GETs)')
+    parser.add_argument('--pgbouncer-url', help='DATABASE_URL through PgBouncer (transaction mode)')
+    parser.add_argument('--output', help='Write results as JSON here')
+    args = parser.parse_args()
+
+    database_url = os.environ.get('DATABASE_URL', '')
+    if not database_url.startswith(('postgres://', 'postgresql://')):
+        raise SystemExit('Set DATABASE_URL to a PostgreSQL database (see LOAD_TESTING.md for test data).')
+
+    modes = {
+        'persistent': {'DJANGO_DB_POOL': ''},
+        'pool': {'DJANGO_DB_POOL': 'psycopg', 'DJANGO_DB_POOL_MAX_SIZE': str(args.pool_size)},
+    }
+    if args.pgbouncer_url:
+        modes['pgbouncer'] = {'DJANGO_DB_POOL': 'pgbouncer', 'DATABASE_URL': args.pgbouncer_url}
+
+    results = {}
+    for name, env_overrides in modes.items():
+        print(f'Running {name} ({args.workers} workers x {args.threads} threads, {args.clients} clients)...')
+        results[name] = run_mode(name, env_overrides, args, database_url)
+
+    print(f"{'mode':<11} {'req/s':>7} {'p50':>7} {'p95':>7} {'p99':>7} {'first':>7} {'peak conn':>9} {'mean conn':>9} {'errors':>6}")
+    for name, row in results.items():
+        print(
+            f"{name:<11} {row['rps']:>7} {row['p50_ms']:>7} {row['p95_ms']:>7} {row['p99_ms']:>7} "
+            f"{row['first_request_ms']:>7} {row['peak_connections']:>9} {row['mean_connections']:>9} {row['errors']:>6}"
+        )
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+        print(f'Wrote {args.output}')
+
+
+if __name__ == '__main__':
+    main()
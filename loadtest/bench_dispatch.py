@@ -0,0 +1,160 @@
+"""
+Dispatch race test: many fundis accepting the same posted jobs at the same moment.
+
+Creates --jobs posted jobs, each offered to --offers different fundis. Then starts
+--workers processes that all accept every offer at once, each in its own shuffled order.
+Every job should end up with exactly one accepted offer and one booking, whatever the
+interleaving. Reports accepts/s, the latency of each accept, and any job that was
+double-assigned (there should be none). The rows it creates are deleted afterwards.
+
+Usage (from project root, DATABASE_URL pointing at a scratch database with fundis,
+e.g. from generate_fake_data):
+  python loadtest/bench_dispatch.py
+  python loadtest/bench_dispatch.py --jobs 200 --offers 5 --workers 8 --output dispatch.json
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'fundi_platform.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db.models import Count, Q  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from services.dispatch import accept_offer  # noqa: E402
+from services.models import Booking, Fundi, JobOffer, JobRequest, Service, User  # noqa: E402
+
+MARKER = 'dispatch race test'
+
+
+def percentile(ordered, pct):
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * pct))] * 1000, 1) if ordered else None
+
+
+def setup(jobs, offers_per_job):
+    customer = User.objects.filter(is_fundi=False).first()
+    fundis = list(
+        Fundi.objects.filter(is_available=True, working_hours__isnull=True)
+        .values_list('pk', flat=True)[:jobs * offers_per_job]
+    )
+    if customer is None or len(fundis) < jobs * offers_per_job:
+        raise SystemExit('Not enough data. Run generate_fake_data first.')
+    service = Service.objects.first()
+    # Weekdays at 10:00, well past any generated booking, so every fundi is free.
+    day = (timezone.now() + timedelta(days=60)).replace(hour=10, minute=0, second=0, microsecond=0)
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+    expires_at = timezone.now() + timedelta(hours=1)
+
+    for n in range(jobs):
+        job = JobRequest.objects.create(
+            customer=customer, service=service, description=MARKER, address='Karen, Nairobi',
+            booking_date=day, estimated_hours=2,
+        )
+        JobOffer.objects.bulk_create([
+            JobOffer(job=job, fundi_id=fundi_id, expires_at=expires_at)
+            for fundi_id in fundis[n * offers_per_job:(n + 1) * offers_per_job]
+        ])
+
+
+def worker(seed, start_at, output):
+    offers = list(JobOffer.objects.filter(job__description=MARKER).select_related('job', 'fundi'))
+    random.Random(seed).shuffle(offers)
+    time.sleep(max(0, start_at - time.time()))
+    accepted, refused, latencies = 0, 0, []
+    for offer in offers:
+        started = time.perf_counter()
+        booking, _ = accept_offer(offer)
+        latencies.append(time.perf_counter() - started)
+        if booking is None:
+            refused += 1
+        else:
+            accepted += 1
+    Path(output).write_text(json.dumps({'accepted': accepted, 'refused': refused, 'latencies': latencies}))
+
+
+def cleanup():
+    jobs = JobRequest.objects.filter(description=MARKER)
+    Booking.objects.filter(pk__in=jobs.exclude(booking=None).values('booking_id')).delete()
+    jobs.delete()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Race many fundis accepting the same posted jobs.')
+    parser.add_argument('--jobs', type=int, default=100)
+    parser.add_argument('--offers', type=int, default=5, help='Fundis offered each job')
+    parser.add_argument('--workers', type=int, default=8, help='Processes accepting at once')
+    parser.add_argument('--output', help='Write results as JSON here')
+    parser.add_argument('--worker', nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        seed, start_at, output = args.worker
+        worker(int(seed), float(start_at), output)
+        return
+
+    cleanup()
+    setup(args.jobs, args.offers)
+    start_at = time.time() + 3  # time for every worker to load its offers
+    outputs = [ROOT / f'.bench_dispatch_{n}.json' for n in range(args.workers)]
+    procs = [
+        subprocess.Popen([sys.executable, __file__, '--worker', str(n), str(start_at), str(output)], cwd=ROOT)
+        for n, output in enumerate(outputs)
+    ]
+    for proc in procs:
+        proc.wait()
+    elapsed = time.time() - start_at
+
+    accepted = refused = 0
+    latencies = []
+    for output in outputs:
+        data = json.loads(output.read_text())
+        output.unlink()
+        accepted += data['accepted']
+        refused += data['refused']
+        latencies.extend(data['latencies'])
+    latencies.sort()
+
+    jobs = JobRequest.objects.filter(description=MARKER)
+    per_job = jobs.annotate(accepted=Count('offers', filter=Q(offers__status='accepted')))
+    double = [job.pk for job in per_job if job.accepted > 1]
+    unassigned = jobs.filter(booking=None).count()
+    bookings = Booking.objects.filter(pk__in=jobs.values('booking_id')).count()
+    results = {
+        'jobs': args.jobs,
+        'offers': args.jobs * args.offers,
+        'accept_attempts': accepted + refused,
+        'accepted': accepted,
+        'refused': refused,
+        'bookings': bookings,
+        'unassigned_jobs': unassigned,
+        'double_assigned_jobs': len(double),
+        'accept_p50_ms': percentile(latencies, 0.50),
+        'accept_p99_ms': percentile(latencies, 0.99),
+        'attempts_per_s': round((accepted + refused) / elapsed, 1) if elapsed > 0 else None,
+    }
+    cleanup()
+
+    for key, value in results.items():
+        print(f'{key:<22} {value}')
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+        print(f'Wrote {args.output}')
+    if double or bookings != args.jobs or accepted != args.jobs:
+        raise SystemExit('FAILED: a job was double-assigned or left unassigned')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Throughput benchmark: loaddata vs import_data.
+
+Exports the current database twice (a gzipped fixture and a JSON Lines folder), then
+loads each into a fresh scratch SQLite database and reports rows/s and peak memory.
+
+Usage (from project root, pointing at the database to copy):
+  python manage.py generate_fake_data --bookings 200000     # if you need data
+  python loadtest/bench_import.py
+  python loadtest/bench_import.py --workers 2 --batch-size 5000 --output bench.json
+
+Each tool runs in its own process so peak RSS is measured per tool.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def manage(*args, env=None):
+    return subprocess.run(
+        [sys.executable, 'manage.py', *args], cwd=ROOT, env=env, check=True,
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+    ).stdout
+
+
+def timed_load(label, load_args, workdir):
+    """Migrate a fresh SQLite DB, then time one load command against it."""
+    db_path = workdir / f'{label}.sqlite3'
+    env = dict(os.environ, DATABASE_URL=f'sqlite:///{db_path}', DJANGO_DEBUG='True')
+    manage('migrate', '--noinput', '-v0', env=env)
+
+    log_path = workdir / f'{label}.log'
+    with log_path.open('w') as log:
+        started = time.perf_counter()
+        proc = subprocess.Popen([sys.executable, 'manage.py', *load_args], cwd=ROOT, env=env,
+                                stdout=log, stderr=subprocess.STDOUT)
+        # wait4 gives this child's own peak RSS (KiB on Linux).
+        _, status, usage = os.wait4(proc.pid, 0)
+        seconds = time.perf_counter() - started
+    if os.waitstatus_to_exitcode(status):
+        raise SystemExit(f'{label} failed:\n{log_path.read_text()}')
+    rows = json.loads(manage(
+        'shell', '-c',
+        'import json; from services.models import *; '
+        'print(json.dumps(sum(m.objects.count() for m in (User, Service, Fundi, Booking, Review, Payment))))',
+        env=env,
+    ).strip().splitlines()[-1])
+    return {
+        'rows': rows,
+        'seconds': round(seconds, 2),
+        'rows_per_second': round(rows / seconds),
+        'peak_rss_mb': round(usage.ru_maxrss / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare loaddata and import_data throughput.')
+    parser.add_argument('--batch-size', type=int, default=2000)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--output', help='Write results as JSON here')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='fundi-bench-') as tmp:
+        workdir = Path(tmp)
+        print('Exporting current database...')
+        manage('export_local_data', '--format', 'fixture', '-o', str(workdir / 'seed.json.gz'))
+        manage('export_local_data', '-o', str(workdir / 'export'))
+
+        results = {}
+        results['loaddata'] = timed_load('loaddata', ['loaddata', str(workdir / 'seed.json.gz')], workdir)
+        results['import_data'] = timed_load('import_data', [
+            'import_data', str(workdir / 'export'),
+            '--batch-size', str(args.batch_size), '--workers', str(args.workers),
+        ], workdir)
+
+    for name, row in results.items():
+        print(
+            f"{name:<12} {row['rows']:>10} rows {row['seconds']:>9.2f}s "
+            f"{row['rows_per_second']:>9} rows/s {row['peak_rss_mb']:>8} MB peak"
+        )
+    speedup = results['import_data']['rows_per_second'] / max(results['loaddata']['rows_per_second'], 1)
+    print(f'import_data is {speedup:.1f}x loaddata')
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+        print(f'Wrote {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Matching benchmark: how long services.matching takes to rank fundis for a job.
+
+Builds the in-memory index from the current database, then runs random match requests
+(category, start time in the next two weeks, hours, budget, area) and reports, per request:
+  rank   scoring and sorting every fundi in the category (no database)
+  match  the full match_fundis() call: ranking plus the availability checks on the top
+Also reports the index build time and the time to refresh one fundi.
+
+Usage (from project root, DATABASE_URL pointing at a database with data, e.g.
+generate_fake_data --fundis 20000):
+  python loadtest/bench_matching.py
+  python loadtest/bench_matching.py --requests 500 --output matching.json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'fundi_platform.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db.models import Count  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from services.management.commands.generate_fake_data import AREAS  # noqa: E402
+from services.matching import MatchIndex, match_fundis, get_index  # noqa: E402
+from services.models import Fundi  # noqa: E402
+
+
+def percentile(ordered, pct):
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * pct))] * 1000, 2)
+
+
+def summary(samples):
+    samples.sort()
+    return {'p50_ms': percentile(samples, 0.50), 'p95_ms': percentile(samples, 0.95), 'max_ms': round(samples[-1] * 1000, 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time fundi matching against the current database.')
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--limit', type=int, default=10, help='Shortlist length')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='Write results as JSON here')
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    started = time.perf_counter()
+    index = MatchIndex.build()
+    build_s = time.perf_counter() - started
+    sizes = dict(Fundi.objects.values_list('category').annotate(n=Count('id')))
+    categories = list(sizes)
+    if not categories:
+        raise SystemExit('No fundis. Run generate_fake_data first.')
+
+    get_index()  # warm this process's shared index
+    fundi_id = Fundi.objects.values_list('pk', flat=True).first()
+    started = time.perf_counter()
+    index.refresh([fundi_id])
+    refresh_ms = round((time.perf_counter() - started) * 1000, 2)
+
+    now = timezone.now()
+    rank_times, match_times, shortlist_sizes = [], [], []
+    for _ in range(args.requests):
+        category = rng.choice(categories)
+        hours = rng.randint(1, 4)
+        budget = rng.choice([None, 2000 * hours, 4000 * hours])
+        area = rng.choice([None, *AREAS])
+        start = (now + timedelta(days=rng.randint(1, 14))).replace(hour=rng.randint(8, 14), minute=0, second=0, microsecond=0)
+
+        t0 = time.perf_counter()
+        index.rank(category, budget / hours if budget else None, area)
+        t1 = time.perf_counter()
+        shortlist = match_fundis(category, start=start, hours=hours, budget=budget, location=area, limit=args.limit)
+        t2 = time.perf_counter()
+        rank_times.append(t1 - t0)
+        match_times.append(t2 - t1)
+        shortlist_sizes.append(len(shortlist))
+
+    results = {
+        'fundis': sum(sizes.values()),
+        'largest_category': max(sizes.values()),
+        'index_build_s': round(build_s, 2),
+        'refresh_one_ms': refresh_ms,
+        'rank': summary(rank_times),
+        'match': summary(match_times),
+        'mean_shortlist': round(sum(shortlist_sizes) / len(shortlist_sizes), 1),
+    }
+    print(f"{results['fundis']} fundis (largest category {results['largest_category']}), "
+          f"index built in {results['index_build_s']}s, one-fundi refresh {refresh_ms}ms")
+    for name in ('rank', 'match'):
+        row = results[name]
+        print(f"{name:<6} p50 {row['p50_ms']:>7}ms  p95 {row['p95_ms']:>7}ms  max {row['max_ms']:>7}ms")
+    print(f"mean shortlist length {results['mean_shortlist']} (limit {args.limit})")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+        print(f'Wrote {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""
+Signup benchmark: registrations per second one worker process can take, per password hasher.
+
+Posts the registration form through Django's test client (form validation, password
+validators, saving the user, logging them in, the redirect) with fresh usernames, and
+reports signups per second. Password hashing dominates, so it also times hashing and
+checking one password: registration used to do both (save, then authenticate()), now it
+only hashes. Last, it logs in a user whose password was hashed with the other hasher and
+checks the stored hash was upgraded on login.
+
+Usage (from project root; argon2 rows need the argon2-cffi package):
+  python loadtest/bench_signup.py
+  python loadtest/bench_signup.py --signups 50 --output signup.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'fundi_platform.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth.hashers import check_password, get_hasher, identify_hasher, make_password  # noqa: E402
+from django.test import Client, override_settings  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from django.urls import reverse  # noqa: E402
+
+from services.models import User  # noqa: E402
+
+PASSWORD = 'Bench-signup-2024!'
+PREFIX = 'bench_signup_'
+HASHERS = {
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'argon2': 'fundi_platform.hashers.TunedArgon2PasswordHasher',
+}
+
+
+def preferring(name):
+    """PASSWORD_HASHERS with the named hasher first."""
+    first = HASHERS[name]
+    return [first] + [path for path in settings.PASSWORD_HASHERS if path != first]
+
+
+def argon2_installed():
+    try:
+        import argon2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def time_hashing(repeat):
+    """(ms to hash, ms to check) one password, median of repeat."""
+    hashes, checks = [], []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        encoded = make_password(PASSWORD)
+        hashed = time.perf_counter()
+        check_password(PASSWORD, encoded)
+        hashes.append(hashed - started)
+        checks.append(time.perf_counter() - hashed)
+    hashes.sort()
+    checks.sort()
+    return round(hashes[repeat // 2] * 1000, 1), round(checks[repeat // 2] * 1000, 1)
+
+
+def run_signups(label, count):
+    started = time.perf_counter()
+    for i in range(count):
+        response = Client().post(reverse('register'), {
+            'username': f'{PREFIX}{label}_{i}', 'email': f'{PREFIX}{label}_{i}@example.com',
+            'first_name': 'Bench', 'last_name': 'Signup', 'password1': PASSWORD, 'password2': PASSWORD,
+        })
+        if response.status_code != 302:
+            raise SystemExit(f'Signup {i} was not accepted (status {response.status_code})')
+    return count / (time.perf_counter() - started)
+
+
+def upgraded_on_login(old, new):
+    """Whether logging in re-hashes a password made with hasher old using hasher new."""
+    with override_settings(PASSWORD_HASHERS=preferring(old)):
+        user = User.objects.create(username=f'{PREFIX}rehash_{old}', password=make_password(PASSWORD))
+    with override_settings(PASSWORD_HASHERS=preferring(new)):
+        Client().post(reverse('login'), {'username': user.username, 'password': PASSWORD})
+        user.refresh_from_db()
+        return identify_hasher(user.password).algorithm == get_hasher().algorithm
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure signup throughput per worker.')
+    parser.add_argument('--signups', type=int, default=20, help='Signups per hasher')
+    parser.add_argument('--output', help='Write results as JSON here')
+    args = parser.parse_args()
+
+    setup_test_environment()
+    User.objects.filter(username__startswith=PREFIX).delete()
+    names = ['pbkdf2'] + (['argon2'] if argon2_installed() else [])
+    results = {}
+    try:
+        for name in names:
+            with override_settings(PASSWORD_HASHERS=preferring(name)):
+                hash_ms, check_ms = time_hashing(max(3, args.signups // 4))
+                rate = run_signups(name, args.signups)
+            per_signup_ms = 1000 / rate
+            results[name] = {
+                'signups_per_s': round(rate, 1),
+                'hash_ms': hash_ms,
+                'check_ms': check_ms,
+                # What each signup cost when registration also called authenticate().
+                'with_second_hash_per_s': round(1000 / (per_signup_ms + check_ms), 1),
+            }
+            row = results[name]
+            print(f"{name:<7} {row['signups_per_s']:>6.1f} signups/s per worker "
+                  f"(hash {hash_ms} ms, check {check_ms} ms; with the second hash: {row['with_second_hash_per_s']}/s)")
+        if len(names) == 2:
+            results['rehash_on_login'] = {
+                'pbkdf2_to_argon2': upgraded_on_login('pbkdf2', 'argon2'),
+                'argon2_to_pbkdf2': upgraded_on_login('argon2', 'pbkdf2'),
+            }
+            print('Re-hashed on login:', results['rehash_on_login'])
+    finally:
+        User.objects.filter(username__startswith=PREFIX).delete()
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+        print(f'Wrote {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+"""
+Concurrency benchmark: stock SQLite settings vs the tuned SQLite profile.
+
+Builds one small scratch database, copies it for each profile, then runs N worker
+processes (like N gunicorn workers) doing callback-shaped write transactions for a
+fixed time: read a payment and its booking, mark both completed, commit.
+
+Usage (from project root):
+  python loadtest/bench_sqlite_writes.py
+  python loadtest/bench_sqlite_writes.py --workers 8 --seconds 20 --output sqlite.json
+
+"stock" is Django's default SQLite backend (rollback journal, deferred BEGIN, 5s
+timeout). "tuned" is fundi_platform/db_backends/sqlite3 (WAL, synchronous=NORMAL,
+mmap, 20s busy timeout, BEGIN IMMEDIATE). "locked" counts transactions that failed
+with "database is locked" - the error users saw as a 500 during callback bursts.
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PROFILES = {
+    'stock': 'False',
+    'tuned': 'True',
+}
+
+
+def profile_env(db_path, tuned):
+    # DJANGO_DEBUG=True keeps dj_database_url from adding sslmode to a sqlite URL.
+    return dict(os.environ, DATABASE_URL=f'sqlite:///{db_path}', DJANGO_DEBUG='True', DJANGO_SQLITE_TUNED=tuned)
+
+
+def manage(*args, env=None):
+    return subprocess.run(
+        [sys.executable, 'manage.py', *args], cwd=ROOT, env=env, check=True,
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+    ).stdout
+
+
+def worker(seconds, seed):
+    """Runs inside one worker process; prints a JSON result line."""
+    sys.path.insert(0, str(ROOT))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'fundi_platform.settings')
+    import django
+    django.setup()
+
+    from django.db import OperationalError, transaction
+    from django.utils import timezone
+    from services.models import Payment
+
+    rng = random.Random(seed)
+    payment_ids = list(Payment.objects.values_list('id', flat=True))
+    ok = locked = 0
+    latencies = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            with transaction.atomic():
+                payment = Payment.objects.select_related('booking').get(id=rng.choice(payment_ids))
+                payment.status = 'completed'
+                payment.completed_at = timezone.now()
+                payment.save(update_fields=['status', 'completed_at'])
+                booking = payment.booking
+                booking.status = 'completed'
+                booking.save(update_fields=['status', 'updated_at'])
+        except OperationalError as e:
+            if 'locked' not in str(e):
+                raise
+            locked += 1
+            continue
+        ok += 1
+        latencies.append(time.perf_counter() - started)
+    print(json.dumps({'ok': ok, 'locked': locked, 'latencies': latencies}))
+
+
+def run_profile(name, db_path, workers, seconds):
+    env = profile_env(db_path, PROFILES[name])
+    procs = [
+        subprocess.Popen(
+            [sys.executable, __file__, '--worker', '--seconds', str(seconds), '--seed', str(i)],
+            cwd=ROOT, env=env, stdout=subprocess.PIPE, text=True,
+        )
+        for i in range(workers)
+    ]
+    results = []
+    for proc in procs:
+        out, _ = proc.communicate()
+        if proc.returncode:
+            raise SystemExit(f'{name} worker failed (exit {proc.returncode})')
+        results.append(json.loads(out.strip().splitlines()[-1]))
+
+    latencies = sorted(l for r in results for l in r['latencies'])
+    ok = sum(r['ok'] for r in results)
+    locked = sum(r['locked'] for r in results)
+
+    def pct(p):
+        return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 1) if latencies else None
+
+    return {
+        'workers': workers,
+        'seconds': seconds,
+        'committed': ok,
+        'locked': locked,
+        'writes_per_second': round(ok / seconds),
+        'locked_pct': round(100 * locked / max(ok + locked, 1), 1),
+        'p50_ms': pct(0.50),
+        'p99_ms': pct(0.99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare SQLite write throughput, stock vs tuned.')
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=15)
+    parser.add_argument('--bookings', type=int, default=5000, help='Size of the scratch database')
+    parser.add_argument('--output', help='Write results as JSON here')
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--seed', type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.seconds, args.seed)
+        return
+
+    with tempfile.TemporaryDirectory(prefix='fundi-sqlite-bench-') as tmp:
+        workdir = Path(tmp)
+        seed_db = workdir / 'seed.sqlite3'
+        # Built with the stock backend so the file stays in rollback-journal mode;
+        # the tuned backend switches its own copy to WAL on first connect.
+        env = profile_env(seed_db, 'False')
+        print('Building scratch database...')
+        manage('migrate', '--noinput', '-v0', env=env)
+        manage('generate_fake_data', '--customers', '200', '--fundis', '50',
+               '--bookings', str(args.bookings), '--payment-rate', '1.0', env=env)
+
+        results = {}
+        for name in PROFILES:
+            db_path = workdir / f'{name}.sqlite3'
+            shutil.copy(seed_db, db_path)
+            print(f'Running {name} ({args.workers} workers, {args.seconds:g}s)...')
+            results[name] = run_profile(name, db_path, args.workers, args.seconds)
+
+    for name, row in results.items():
+        print(
+            f"{name:<6} {row['committed']:>8} commits {row['writes_per_second']:>7} writes/s "
+            f"{row['locked']:>6} locked ({row['locked_pct']}%) "
+            f"p50 {row['p50_ms']} ms  p99 {row['p99_ms']} ms"
+        )
+    speedup = results['tuned']['writes_per_second'] / max(results['stock']['writes_per_second'], 1)
+    print(f'tuned is {speedup:.1f}x stock')
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+        print(f'Wrote {args.output}')
+
+
+if __name__ == '__main__':
+    main()
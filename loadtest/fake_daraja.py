@@ -0,0 +1,186 @@
+"""
+Minimal fake of the Safaricom Daraja API for local load tests.
+
+Implements just what services/mpesa_utils.py calls:
+  GET  /oauth/v1/generate
+  POST /mpesa/stkpush/v1/processrequest
+  POST /mpesa/stkpushquery/v1/query
+
+Point the Django server at it with:
+  MPESA_API_URL=http://127.0.0.1:8765
+  MPESA_CONSUMER_KEY=loadtest MPESA_CONSUMER_SECRET=loadtest MPESA_PASSKEY=loadtest
+  MPESA_CALLBACK_URL=https://loadtest.invalid/mpesa/callback/
+
+run_loadtest.py starts it in-process and sends the callbacks itself so it can time
+them. Standalone (for clicking through the site by hand) it posts the callback:
+  python loadtest/fake_daraja.py --callback-url http://127.0.0.1:8000/mpesa/callback/
+"""
+import argparse
+import itertools
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+
+class FakeDaraja:
+    """Thread-safe record of STK pushes, shared with the HTTP handler."""
+
+    def __init__(self, callback_url=None, callback_delay=1.0):
+        self.callback_url = callback_url
+        self.callback_delay = callback_delay
+        self._lock = threading.Lock()
+        self._counter = itertools.count(1)
+        # Part of every ID, so a run against a database an earlier run used never repeats one.
+        self._run = format(int(time.time()), 'x')
+        self._pushes = {}  # checkout_request_id -> push dict
+        self._by_reference = {}  # AccountReference -> checkout_request_id
+        self._server = None
+
+    def start(self, host='127.0.0.1', port=8765):
+        handler = type('Handler', (_Handler,), {'daraja': self})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def record_push(self, payload):
+        n = next(self._counter)
+        push = {
+            'merchant_request_id': f'fake-{self._run}-{n}',
+            'checkout_request_id': f'ws_CO_FAKE_{self._run}_{n:08d}',
+            'account_reference': payload.get('AccountReference', ''),
+            'amount': payload.get('Amount', 0),
+            'phone': payload.get('PhoneNumber', ''),
+            'result_code': None,  # None until a callback has been sent
+        }
+        with self._lock:
+            self._pushes[push['checkout_request_id']] = push
+            self._by_reference[push['account_reference']] = push['checkout_request_id']
+        if self.callback_url:
+            threading.Timer(self.callback_delay, self._send_callback, (push,)).start()
+        return push
+
+    def push_for(self, account_reference):
+        with self._lock:
+            checkout_request_id = self._by_reference.get(account_reference)
+            return dict(self._pushes[checkout_request_id]) if checkout_request_id else None
+
+    def mark_result(self, checkout_request_id, result_code):
+        with self._lock:
+            if checkout_request_id in self._pushes:
+                self._pushes[checkout_request_id]['result_code'] = result_code
+
+    def result_for(self, checkout_request_id):
+        with self._lock:
+            push = self._pushes.get(checkout_request_id)
+            return push['result_code'] if push else None
+
+    def _send_callback(self, push):
+        try:
+            requests.post(self.callback_url, json=callback_body(push), timeout=30)
+            self.mark_result(push['checkout_request_id'], 0)
+        except requests.exceptions.RequestException as e:
+            print(f"Fake Daraja: callback to {self.callback_url} failed: {e}")
+
+
+def callback_body(push, result_code=0):
+    """STK callback JSON in the shape Daraja sends to CallBackURL."""
+    stk_callback = {
+        'MerchantRequestID': push['merchant_request_id'],
+        'CheckoutRequestID': push['checkout_request_id'],
+        'ResultCode': result_code,
+        'ResultDesc': 'The service request is processed successfully.' if result_code == 0 else 'Request cancelled by user',
+    }
+    if result_code == 0:
+        stk_callback['CallbackMetadata'] = {'Item': [
+            {'Name': 'Amount', 'Value': push['amount']},
+            {'Name': 'MpesaReceiptNumber', 'Value': 'FAKE' + push['checkout_request_id'][-8:]},
+            {'Name': 'TransactionDate', 'Value': int(time.strftime('%Y%m%d%H%M%S'))},
+            {'Name': 'PhoneNumber', 'Value': push['phone']},
+        ]}
+    return {'Body': {'stkCallback': stk_callback}}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    daraja = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _json(self, body, status=200):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path.startswith('/oauth/v1/generate'):
+            return self._json({'access_token': 'fake-token', 'expires_in': '3599'})
+        return self._json({'errorMessage': 'Not found'}, status=404)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            payload = json.loads(self.rfile.read(length) or b'{}')
+        except json.JSONDecodeError:
+            return self._json({'errorMessage': 'Bad JSON'}, status=400)
+
+        if self.path.startswith('/mpesa/stkpush/v1/processrequest'):
+            push = self.daraja.record_push(payload)
+            return self._json({
+                'MerchantRequestID': push['merchant_request_id'],
+                'CheckoutRequestID': push['checkout_request_id'],
+                'ResponseCode': '0',
+                'ResponseDescription': 'Success. Request accepted for processing',
+                'CustomerMessage': 'Success. Request accepted for processing',
+            })
+        if self.path.startswith('/mpesa/stkpushquery/v1/query'):
+            checkout_request_id = payload.get('CheckoutRequestID', '')
+            result_code = self.daraja.result_for(checkout_request_id)
+            if result_code is None:
+                # Daraja answers "still processing" as an error until the user acts.
+                return self._json({
+                    'requestId': checkout_request_id,
+                    'errorCode': '500.001.1001',
+                    'errorMessage': 'The transaction is being processed',
+                }, status=500)
+            return self._json({
+                'ResponseCode': '0',
+                'ResponseDescription': 'The service request has been accepted successsfully',
+                'MerchantRequestID': '',
+                'CheckoutRequestID': checkout_request_id,
+                'ResultCode': str(result_code),
+                'ResultDesc': 'The service request is processed successfully.',
+            })
+        return self._json({'errorMessage': 'Not found'}, status=404)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a fake Daraja API for local testing.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--callback-url', help='Where to POST STK callbacks, e.g. http://127.0.0.1:8000/mpesa/callback/')
+    parser.add_argument('--callback-delay', type=float, default=1.0, help='Seconds before the callback is sent')
+    args = parser.parse_args()
+
+    daraja = FakeDaraja(args.callback_url, args.callback_delay).start(args.host, args.port)
+    print(f"Fake Daraja listening on http://{args.host}:{args.port} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        daraja.stop()
+
+
+if __name__ == '__main__':
+    main()
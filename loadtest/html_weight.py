@@ -0,0 +1,103 @@
+"""
+HTML weight report: bytes of HTML each main page sends, raw and gzipped.
+
+Renders the pages through Django's test client as a visitor, a customer, a fundi and
+an admin, and reports the size of the HTML document alone (stylesheets and scripts it
+links to are cached by the browser and not counted). Save a run with --output and pass
+it to --compare on a later run to see the change per page.
+
+Usage (from project root, DATABASE_URL pointing at a database with fake data):
+  python loadtest/html_weight.py
+  python loadtest/html_weight.py --output before.json
+  python loadtest/html_weight.py --compare before.json
+"""
+import argparse
+import gzip
+import json
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'fundi_platform.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.test import Client  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from django.urls import reverse  # noqa: E402
+
+from services.models import Booking, Fundi, User  # noqa: E402
+
+
+def pages():
+    """(label, client, path) for each page measured."""
+    booking = Booking.objects.select_related('customer', 'fundi__user').order_by('pk').first()
+    fundi = Fundi.objects.order_by('pk').first()
+    admin = User.objects.filter(is_staff=True).first() or User.objects.filter(is_superuser=True).first()
+    if booking is None or fundi is None:
+        raise SystemExit('Not enough data. Run generate_fake_data first.')
+    visitor, customer, fundi_user, staff = Client(), Client(), Client(), Client()
+    customer.force_login(booking.customer)
+    fundi_user.force_login(booking.fundi.user)
+    measured = [
+        ('home', visitor, reverse('home')),
+        ('login', visitor, reverse('login')),
+        ('register', visitor, reverse('register')),
+        ('fundi_detail', visitor, reverse('fundi_detail', args=[fundi.pk])),
+        ('category_fundis', visitor, reverse('category_fundis', args=[fundi.category])),
+        ('fundi_list', customer, reverse('fundi_list')),
+        ('create_booking', customer, reverse('create_booking', args=[fundi.pk])),
+        ('booking_detail', customer, reverse('booking_detail', args=[booking.pk])),
+        ('my_bookings', customer, reverse('my_bookings')),
+        ('fundi_dashboard', fundi_user, reverse('fundi_dashboard')),
+    ]
+    if admin is not None:
+        staff.force_login(admin)
+        measured += [
+            ('admin_dashboard', staff, reverse('admin_dashboard')),
+            ('admin_bookings', staff, reverse('admin_bookings')),
+        ]
+    return measured
+
+
+def measure():
+    results = {}
+    for label, client, path in pages():
+        response = client.get(path)
+        if response.status_code != 200:
+            print(f'{label}: {path} answered {response.status_code}, skipped')
+            continue
+        html = b''.join(response.streaming_content) if response.streaming else response.content
+        if response.get('Content-Encoding') == 'gzip':
+            html = gzip.decompress(html)
+        results[label] = {'bytes': len(html), 'gzip': len(gzip.compress(html, 6))}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report HTML bytes per page.')
+    parser.add_argument('--output', help='Write results as JSON here')
+    parser.add_argument('--compare', help='An earlier --output to compare against')
+    args = parser.parse_args()
+
+    setup_test_environment()
+    results = measure()
+    before = json.loads(Path(args.compare).read_text()) if args.compare else {}
+    print(f'{"page":<18} {"bytes":>9} {"gzip":>8}' + (f' {"before":>9} {"gzip":>8} {"change":>7}' if before else ''))
+    for label, sizes in results.items():
+        line = f'{label:<18} {sizes["bytes"]:>9,} {sizes["gzip"]:>8,}'
+        if label in before:
+            old = before[label]
+            line += f' {old["bytes"]:>9,} {old["gzip"]:>8,} {sizes["bytes"] / old["bytes"] - 1:>+7.0%}'
+        print(line)
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+        print(f'Wrote {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,378 @@
+"""
+End-to-end load test for the main user journeys.
+
+Needs only a running Django server and the fake Daraja in loadtest/fake_daraja.py,
+which this script starts in-process. See LOAD_TESTING.md for the full setup.
+
+Customer journey (one per loop, per virtual user):
+  home -> login (or register) -> fundi_list search -> fundi_detail -> create_booking
+  -> create_payment (M-Pesa STK push) -> mpesa_callback -> create_review
+Admin journey (with --admin-users):
+  admin_dashboard, admin_bookings, admin_payments, admin_customers, admin_fundis,
+  admin_fundi_activity
+
+Usage:
+  python loadtest/run_loadtest.py --base-url http://127.0.0.1:8000 --users 20 --duration 60
+  python loadtest/run_loadtest.py --compare loadtest/results/<new>.json --baseline loadtest/results/<old>.json
+
+Prints p50/p95/p99 latency and throughput per step and writes the same numbers,
+plus the git commit, to a JSON file so runs can be compared across commits.
+"""
+import argparse
+import json
+import random
+import re
+import subprocess
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import requests
+
+from fake_daraja import FakeDaraja, callback_body
+
+ROOT = Path(__file__).resolve().parent
+CUSTOMER_STEPS = [
+    'home', 'login', 'register', 'fundi_list', 'fundi_detail',
+    'create_booking', 'create_payment', 'mpesa_callback', 'create_review',
+]
+ADMIN_PAGES = [
+    ('admin_dashboard', '/admin/dashboard/'),
+    ('admin_bookings', '/admin/bookings/'),
+    ('admin_payments', '/admin/payments/'),
+    ('admin_customers', '/admin/customers/'),
+    ('admin_fundis', '/admin/fundis/'),
+    ('admin_fundi_activity', '/admin/fundi-activity/'),
+]
+SEARCH_TERMS = ['', '', '', 'Amina', 'Kamau', 'Otieno', 'experience', 'Westlands']
+CATEGORIES = ['', 'plumber', 'electrician', 'cleaner', 'carpenter', 'painter']
+
+FUNDI_LINK_RE = re.compile(r'href="/fundi/(\d+)/"')
+SERVICE_SELECT_RE = re.compile(r'<select name="service".*?</select>', re.S)
+OPTION_RE = re.compile(r'<option value="(\d+)"')
+BOOKING_URL_RE = re.compile(r'/booking/(\d+)/$')
+
+
+class StepFailed(Exception):
+    pass
+
+
+class Stats:
+    """Latency samples and error counts per step, shared by all virtual users."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = {}
+        self.errors = {}
+
+    def record(self, step, seconds, ok):
+        with self._lock:
+            self.samples.setdefault(step, []).append(seconds)
+            if not ok:
+                self.errors[step] = self.errors.get(step, 0) + 1
+
+    def summary(self, wall_seconds):
+        steps = {}
+        with self._lock:
+            for step, samples in self.samples.items():
+                ordered = sorted(samples)
+                steps[step] = {
+                    'count': len(ordered),
+                    'errors': self.errors.get(step, 0),
+                    'p50_ms': round(percentile(ordered, 50) * 1000, 2),
+                    'p95_ms': round(percentile(ordered, 95) * 1000, 2),
+                    'p99_ms': round(percentile(ordered, 99) * 1000, 2),
+                    'mean_ms': round(sum(ordered) / len(ordered) * 1000, 2),
+                    'max_ms': round(ordered[-1] * 1000, 2),
+                    'throughput_rps': round(len(ordered) / wall_seconds, 2),
+                }
+        return steps
+
+
+def percentile(ordered, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+class VirtualUser:
+    def __init__(self, args, stats, daraja, index):
+        self.args = args
+        self.stats = stats
+        self.daraja = daraja
+        self.index = index
+        self.rng = random.Random(args.seed * 10007 + index)
+        self.session = requests.Session()
+
+    def url(self, path):
+        return self.args.base_url.rstrip('/') + path
+
+    def step(self, name, func):
+        started = time.perf_counter()
+        try:
+            result = func()
+        except (StepFailed, requests.exceptions.RequestException) as e:
+            self.stats.record(name, time.perf_counter() - started, ok=False)
+            if self.args.verbose:
+                print(f"[vu {self.index}] {name} failed: {e}")
+            raise StepFailed(name) from e
+        self.stats.record(name, time.perf_counter() - started, ok=True)
+        return result
+
+    def get(self, path, **kwargs):
+        response = self.session.get(self.url(path), timeout=self.args.timeout, **kwargs)
+        if response.status_code >= 400:
+            raise StepFailed(f"GET {path} -> HTTP {response.status_code}")
+        return response
+
+    def post_form(self, path, data):
+        """GET the form (for the CSRF cookie), then POST it the way a browser would."""
+        self.get(path)
+        data = dict(data, csrfmiddlewaretoken=self.session.cookies.get('csrftoken', ''))
+        response = self.session.post(
+            self.url(path), data=data, timeout=self.args.timeout, headers={'Referer': self.url(path)}
+        )
+        if response.status_code == 429:
+            raise StepFailed(f"POST {path} was rate limited; start the server with DJANGO_RATE_LIMITS_ENABLED=False")
+        if response.status_code >= 400:
+            raise StepFailed(f"POST {path} -> HTTP {response.status_code}")
+        return response
+
+    def login(self, username, password):
+        response = self.post_form('/login/', {'username': username, 'password': password})
+        if response.url.rstrip('/').endswith('/login'):
+            raise StepFailed(f"login as {username} was rejected")
+
+    def logout(self):
+        self.session.post(
+            self.url('/logout/'),
+            data={'csrfmiddlewaretoken': self.session.cookies.get('csrftoken', '')},
+            headers={'Referer': self.url('/')},
+            timeout=self.args.timeout,
+        )
+        self.session.cookies.clear()
+
+
+class CustomerUser(VirtualUser):
+    def run_once(self, iteration):
+        args, rng = self.args, self.rng
+        self.step('home', lambda: self.get('/'))
+
+        if rng.random() < args.register_ratio:
+            self.step('register', lambda: self.register(iteration))
+        else:
+            username = f"{args.user_prefix}_c{rng.randrange(args.customer_pool)}"
+            self.step('login', lambda: self.login(username, args.password))
+
+        fundi_ids = self.step('fundi_list', self.search_fundis)
+        fundi_id = rng.choice(fundi_ids)
+        self.step('fundi_detail', lambda: self.get(f'/fundi/{fundi_id}/'))
+        booking_id = self.step('create_booking', lambda: self.create_booking(fundi_id))
+        self.step('create_payment', lambda: self.create_payment(booking_id))
+        self.step('mpesa_callback', lambda: self.send_callback(booking_id))
+        self.step('create_review', lambda: self.create_review(booking_id))
+        self.logout()
+
+    def register(self, iteration):
+        stamp = f"{int(time.time() * 1000) % 10**9}{self.index:03d}{iteration}"
+        username = f"lt_{stamp}"
+        response = self.post_form('/register/', {
+            'username': username,
+            'email': f"{username}@example.com",
+            'first_name': 'Load',
+            'last_name': 'Test',
+            'password1': self.args.password + '#R1',
+            'password2': self.args.password + '#R1',
+            'phone_number': '254708374149',
+            'address': 'Westlands, Nairobi',
+        })
+        if response.url.rstrip('/').endswith('/register'):
+            raise StepFailed(f"registration of {username} was rejected")
+
+    def search_fundis(self):
+        params = {'search': self.rng.choice(SEARCH_TERMS), 'category': self.rng.choice(CATEGORIES)}
+        ids = FUNDI_LINK_RE.findall(self.get('/fundis/', params=params).text)
+        if not ids:
+            ids = FUNDI_LINK_RE.findall(self.get('/fundis/').text)
+        if not ids:
+            raise StepFailed('fundi_list returned no fundis; run generate_fake_data first')
+        return ids
+
+    def create_booking(self, fundi_id):
+        path = f'/booking/create/{fundi_id}/'
+        select = SERVICE_SELECT_RE.search(self.get(path).text)
+        service_ids = OPTION_RE.findall(select.group(0)) if select else []
+        if not service_ids:
+            raise StepFailed(f"no services offered on {path}")
+        # A time the fundi is free, so the form's availability check lets it through. Starting
+        # the search on a random day keeps concurrent users off the same few slots.
+        hours = self.rng.randrange(1, 5)
+        start = datetime.now() + timedelta(days=self.rng.randrange(1, 30))
+        slots = self.get(f'/fundi/{fundi_id}/free-slots/', params={
+            'hours': hours, 'limit': 6, 'from': start.strftime('%Y-%m-%dT%H:%M'),
+        }).json()['slots']
+        if not slots:
+            raise StepFailed(f"fundi {fundi_id} has no free {hours}-hour slot after {start:%Y-%m-%d}")
+        # Slots come in the server's time zone, which is how the form reads a date without one.
+        when = datetime.fromisoformat(self.rng.choice(slots)['start'])
+        response = self.post_form(path, {
+            'fundi': fundi_id,
+            'service': self.rng.choice(service_ids),
+            'description': 'Load test booking',
+            'address': 'Kilimani, Nairobi',
+            'booking_date': when.strftime('%Y-%m-%dT%H:%M'),
+            'estimated_hours': hours,
+        })
+        match = BOOKING_URL_RE.search(response.url)
+        if not match:
+            raise StepFailed(f"booking was not created (ended on {response.url})")
+        return match.group(1)
+
+    def create_payment(self, booking_id):
+        response = self.post_form(f'/payment/create/{booking_id}/', {
+            'payment_method': 'mpesa',
+            'phone_number': '254708374149',
+        })
+        if not BOOKING_URL_RE.search(response.url):
+            raise StepFailed(f"STK push for booking {booking_id} failed (ended on {response.url})")
+
+    def send_callback(self, booking_id):
+        push = self.daraja.push_for(f"BOOKING_{booking_id}")
+        if not push:
+            raise StepFailed(f"fake Daraja saw no STK push for booking {booking_id}")
+        response = self.session.post(self.url('/mpesa/callback/'), json=callback_body(push), timeout=self.args.timeout)
+        if response.status_code != 200 or response.json().get('ResultCode') != 0:
+            raise StepFailed(f"callback rejected: HTTP {response.status_code} {response.text[:200]}")
+        self.daraja.mark_result(push['checkout_request_id'], 0)
+
+    def create_review(self, booking_id):
+        response = self.post_form(f'/review/create/{booking_id}/', {
+            'rating': self.rng.choice([3, 4, 4, 5, 5, 5]),
+            'comment': 'Load test review',
+        })
+        if not BOOKING_URL_RE.search(response.url):
+            raise StepFailed(f"review for booking {booking_id} was not saved")
+
+
+class AdminUser(VirtualUser):
+    def run_once(self, iteration):
+        if iteration == 0:
+            self.step('admin_login', lambda: self.login(self.args.admin_user, self.args.admin_password))
+        for name, path in ADMIN_PAGES:
+            params = {'page': self.rng.randrange(1, 20)} if name in ('admin_bookings', 'admin_payments') else None
+            self.step(name, lambda: self.get(path, params=params))
+
+
+def run_user(user, deadline, iterations):
+    iteration = 0
+    while time.monotonic() < deadline and (not iterations or iteration < iterations):
+        try:
+            user.run_once(iteration)
+        except StepFailed:
+            # The failed step is already counted; start the next journey fresh.
+            user.session.cookies.clear()
+            if isinstance(user, AdminUser):
+                return
+        iteration += 1
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def print_table(steps, baseline=None):
+    header = f"{'step':<22}{'count':>8}{'err':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>9}"
+    if baseline:
+        header += f"{'p95 vs base':>13}"
+    print(header)
+    order = CUSTOMER_STEPS + ['admin_login'] + [name for name, _ in ADMIN_PAGES]
+    for step in sorted(steps, key=lambda s: order.index(s) if s in order else len(order)):
+        row = steps[step]
+        line = (
+            f"{step:<22}{row['count']:>8}{row['errors']:>6}{row['p50_ms']:>10.1f}"
+            f"{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}{row['throughput_rps']:>9.1f}"
+        )
+        base = (baseline or {}).get(step)
+        if base and base['p95_ms']:
+            line += f"{(row['p95_ms'] / base['p95_ms'] - 1) * 100:>+12.1f}%"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the Fundi platform user journeys.')
+    parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+    parser.add_argument('--users', type=int, default=10, help='Concurrent customer virtual users')
+    parser.add_argument('--admin-users', type=int, default=1, help='Concurrent admin virtual users (needs --admin-user)')
+    parser.add_argument('--duration', type=float, default=60, help='Seconds to run')
+    parser.add_argument('--iterations', type=int, default=0, help='Stop each user after N journeys (0 = until --duration)')
+    parser.add_argument('--register-ratio', type=float, default=0.1, help='Share of journeys that register a new account')
+    parser.add_argument('--user-prefix', default='fake', help='generate_fake_data --prefix of the accounts to log in as')
+    parser.add_argument('--customer-pool', type=int, default=1000, help='How many generated customers to pick from')
+    parser.add_argument('--password', default='fundi-bench-pass', help='Password of the generated accounts')
+    parser.add_argument('--admin-user', default='', help='Staff username for the admin journey')
+    parser.add_argument('--admin-password', default='')
+    parser.add_argument('--daraja-port', type=int, default=8765, help='Port for the in-process fake Daraja')
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='Results JSON path (default: loadtest/results/<time>-<commit>.json)')
+    parser.add_argument('--compare', help='Print a saved results file instead of running (add --baseline to diff it)')
+    parser.add_argument('--baseline', help='Results JSON to show p95 changes against')
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    if args.compare:
+        current = json.loads(Path(args.compare).read_text())
+        baseline = json.loads(Path(args.baseline).read_text())['steps'] if args.baseline else None
+        print(f"Run {current['meta']['commit']} at {current['meta']['started_at']}")
+        print_table(current['steps'], baseline)
+        return
+
+    daraja = FakeDaraja().start(port=args.daraja_port)
+    stats = Stats()
+    users = [CustomerUser(args, stats, daraja, i) for i in range(args.users)]
+    if args.admin_user:
+        users += [AdminUser(args, stats, daraja, args.users + i) for i in range(args.admin_users)]
+
+    started_at = datetime.now().isoformat(timespec='seconds')
+    started = time.monotonic()
+    deadline = started + args.duration
+    threads = [threading.Thread(target=run_user, args=(user, deadline, args.iterations)) for user in users]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall_seconds = time.monotonic() - started
+    daraja.stop()
+
+    results = {
+        'meta': {
+            'commit': git_commit(),
+            'started_at': started_at,
+            'wall_seconds': round(wall_seconds, 2),
+            'base_url': args.base_url,
+            'users': args.users,
+            'admin_users': args.admin_users if args.admin_user else 0,
+            'register_ratio': args.register_ratio,
+            'seed': args.seed,
+        },
+        'steps': stats.summary(wall_seconds),
+    }
+    baseline = json.loads(Path(args.baseline).read_text())['steps'] if args.baseline else None
+    print_table(results['steps'], baseline)
+
+    output = Path(args.output) if args.output else (
+        ROOT / 'results' / f"{started_at.replace(':', '')}-{results['meta']['commit']}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(f"\nWrote {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,13 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User, Fundi, Service, Booking, Review, Payment
+from .models import (
+    User, Fundi, Service, Booking, Review, Payment, ArchivedBooking, ArchivedPayment, ArchivedReview,
+    FundiWorkingHours, FundiTimeOff, JobRequest, JobOffer,
+)
+from .versions import delete_in_bulk
+
+# Deletes that take bookings or reviews with them mark the affected fundi profiles once
+# (services/versions.py) instead of once per row.
 
 @admin.register(User)
 class UserAdmin(BaseUserAdmin):
@@ -10,11 +17,33 @@ class UserAdmin(BaseUserAdmin):
         ('Additional Info', {'fields': ('phone_number', 'address', 'is_fundi')}),
     )
 
+    def delete_model(self, request, obj):
+        self.delete_queryset(request, User.objects.filter(pk=obj.pk))
+
+    def delete_queryset(self, request, queryset):
+        delete_in_bulk(queryset, Booking.objects.filter(customer__in=queryset))
+
+class FundiWorkingHoursInline(admin.TabularInline):
+    model = FundiWorkingHours
+    extra = 0
+
+class FundiTimeOffInline(admin.TabularInline):
+    model = FundiTimeOff
+    extra = 0
+
 @admin.register(Fundi)
 class FundiAdmin(admin.ModelAdmin):
     list_display = ['user', 'category', 'experience_years', 'hourly_rate', 'is_available', 'average_rating']
     list_filter = ['category', 'is_available']
     search_fields = ['user__username', 'user__email', 'category']
+    inlines = [FundiWorkingHoursInline, FundiTimeOffInline]
+
+    def delete_model(self, request, obj):
+        self.delete_queryset(request, Fundi.objects.filter(pk=obj.pk))
+
+    def delete_queryset(self, request, queryset):
+        # Their own bookings go with them, and so do their pages.
+        delete_in_bulk(queryset, Booking.objects.none())
 
 @admin.register(Service)
 class ServiceAdmin(admin.ModelAdmin):
@@ -27,14 +56,48 @@ class BookingAdmin(admin.ModelAdmin):
     list_filter = ['status', 'booking_date']
     search_fields = ['customer__username', 'fundi__user__username']
 
+    def delete_queryset(self, request, queryset):
+        delete_in_bulk(queryset, queryset)
+
 @admin.register(Review)
 class ReviewAdmin(admin.ModelAdmin):
     list_display = ['booking', 'rating', 'created_at']
     list_filter = ['rating', 'created_at']
 
+    def delete_queryset(self, request, queryset):
+        delete_in_bulk(queryset, Booking.objects.filter(review__in=queryset))
+
 @admin.register(Payment)
 class PaymentAdmin(admin.ModelAdmin):
     list_display = ['booking', 'amount', 'status', 'payment_method', 'transaction_id', 'created_at']
     list_filter = ['status', 'payment_method']
     search_fields = ['transaction_id', 'merchant_request_id', 'checkout_request_id']
 
+class JobOfferInline(admin.TabularInline):
+    model = JobOffer
+    extra = 0
+    readonly_fields = ['fundi', 'status', 'score', 'offered_at', 'expires_at', 'responded_at']
+
+@admin.register(JobRequest)
+class JobRequestAdmin(admin.ModelAdmin):
+    list_display = ['id', 'customer', 'service', 'booking_date', 'status', 'created_at']
+    list_filter = ['status', 'category']
+    search_fields = ['customer__username']
+    raw_id_fields = ['booking']
+    inlines = [JobOfferInline]
+
+@admin.register(ArchivedBooking)
+class ArchivedBookingAdmin(admin.ModelAdmin):
+    list_display = ['id', 'customer', 'fundi', 'service', 'status', 'booking_date', 'archived_at']
+    list_filter = ['status']
+    search_fields = ['customer__username', 'fundi__user__username']
+
+@admin.register(ArchivedReview)
+class ArchivedReviewAdmin(admin.ModelAdmin):
+    list_display = ['booking', 'rating', 'created_at']
+
+@admin.register(ArchivedPayment)
+class ArchivedPaymentAdmin(admin.ModelAdmin):
+    list_display = ['booking', 'amount', 'status', 'payment_method', 'transaction_id', 'created_at']
+    list_filter = ['status', 'payment_method']
+    search_fields = ['transaction_id', 'checkout_request_id']
@@ -4,14 +4,11 @@ from django.apps import AppConfig
 class ServicesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'services'
-
-
-
-
-
-
-
-
-
-
-
+    
+    def ready(self):
+        from . import matching  # noqa: F401  (connects the match index's signal handlers)
+        from . import thumbnails  # noqa: F401  (makes thumbnails after a profile picture is saved)
+        from . import media_files  # noqa: F401  (counts which fundis use each stored picture)
+        from . import prerender  # noqa: F401  (marks a fundi's pre-rendered pages stale when it is saved)
+        from . import versions  # noqa: F401  (moves Fundi.updated_at when anything on a profile changes)
+        from . import user_cache  # noqa: F401  (drops a user's cached row when it is saved)
@@ -0,0 +1,129 @@
+"""
+Moving old bookings to the archive tables, and reading lifetime totals back.
+
+See `manage.py archive_bookings`. Archived rows keep their primary keys, so a booking
+or payment id found in an old link or export still resolves through archived_or_404().
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Sum
+from django.http import Http404
+from django.utils import timezone
+
+from .models import (
+    ArchivedBooking,
+    ArchivedPayment,
+    ArchivedReview,
+    Booking,
+    CustomerArchiveStats,
+    FundiArchiveStats,
+)
+from .versions import bulk_change
+
+TERMINAL_STATUSES = ('completed', 'cancelled')
+
+FUNDI_COUNTERS = [
+    'bookings', 'completed_bookings', 'reviews', 'rating_sum',
+    'payments', 'completed_payments', 'failed_payments', 'revenue',
+]
+
+
+def archivable_bookings(cutoff):
+    """Terminal bookings last changed before cutoff, without a payment still in flight."""
+    return (
+        Booking.objects.filter(status__in=TERMINAL_STATUSES, updated_at__lt=cutoff)
+        .exclude(payment__status='pending')
+    )
+
+
+def copy_row(model, obj, **extra):
+    # Only the columns the archive table has: it leaves out bookkeeping such as updated_at.
+    names = {field.attname for field in model._meta.concrete_fields}
+    values = {field.attname: getattr(obj, field.attname) for field in obj._meta.concrete_fields if field.attname in names}
+    return model(**values, **extra)
+
+
+def add_to_stats(model, deltas, counters):
+    """Add deltas ({primary key: {counter: amount}}) to the stats rows, creating missing ones.
+
+    Three statements however many rows: the rows are locked before they are read, so a
+    concurrent run adds to the totals this one writes rather than overwriting them.
+    """
+    model.objects.bulk_create([model(pk=pk) for pk in deltas], ignore_conflicts=True)
+    rows = list(model.objects.select_for_update().filter(pk__in=list(deltas)))
+    for row in rows:
+        for name, value in deltas[row.pk].items():
+            setattr(row, name, getattr(row, name) + value)
+    model.objects.bulk_update(rows, counters)
+
+
+def archive_batch(booking_ids, cutoff):
+    """Move one batch of bookings (and their payment/review) to the archive. Returns rows moved."""
+    archived_at = timezone.now()
+    fundi_deltas = defaultdict(lambda: dict.fromkeys(FUNDI_COUNTERS, 0))
+    customer_deltas = defaultdict(int)
+
+    with transaction.atomic():
+        # Re-check under the transaction: a booking may have changed since it was selected.
+        bookings = list(
+            archivable_bookings(cutoff).filter(pk__in=booking_ids)
+            .select_related('payment', 'review').select_for_update(of=('self',))
+        )
+        if not bookings:
+            return 0
+
+        archived_bookings, archived_payments, archived_reviews = [], [], []
+        for booking in bookings:
+            archived_bookings.append(copy_row(ArchivedBooking, booking, archived_at=archived_at))
+            fundi = fundi_deltas[booking.fundi_id]
+            fundi['bookings'] += 1
+            if booking.status == 'completed':
+                fundi['completed_bookings'] += 1
+            customer_deltas[booking.customer_id] += 1
+
+            payment = getattr(booking, 'payment', None)
+            if payment is not None:
+                archived_payments.append(copy_row(ArchivedPayment, payment))
+                fundi['payments'] += 1
+                if payment.status == 'completed':
+                    fundi['completed_payments'] += 1
+                    fundi['revenue'] += payment.amount
+                elif payment.status == 'failed':
+                    fundi['failed_payments'] += 1
+
+            review = getattr(booking, 'review', None)
+            if review is not None:
+                archived_reviews.append(copy_row(ArchivedReview, review))
+                fundi['reviews'] += 1
+                fundi['rating_sum'] += review.rating
+
+        ArchivedBooking.objects.bulk_create(archived_bookings)
+        ArchivedPayment.objects.bulk_create(archived_payments)
+        ArchivedReview.objects.bulk_create(archived_reviews)
+
+        add_to_stats(FundiArchiveStats, fundi_deltas, FUNDI_COUNTERS)
+        add_to_stats(CustomerArchiveStats, {pk: {'bookings': n} for pk, n in customer_deltas.items()}, ['bookings'])
+
+        # Cascades to the hot payment and review rows. Lifetime totals are unchanged (they
+        # include the archive), but the profiles list recent bookings: mark them once.
+        with bulk_change(list(fundi_deltas)):
+            Booking.objects.filter(pk__in=[booking.pk for booking in bookings]).delete()
+
+    return len(bookings)
+
+
+def archived_totals():
+    """Site-wide sums of the archived counters, for the admin dashboards."""
+    totals = FundiArchiveStats.objects.aggregate(**{name: Sum(name) for name in FUNDI_COUNTERS})
+    return {name: value or (Decimal('0') if name == 'revenue' else 0) for name, value in totals.items()}
+
+
+def archived_or_404(hot_queryset, archived_queryset, **lookup):
+    """Fetch a row from the hot table, falling back to the archive (same primary keys)."""
+    for queryset in (hot_queryset, archived_queryset):
+        obj = queryset.filter(**lookup).first()
+        if obj is not None:
+            return obj
+    raise Http404(f'No {hot_queryset.model._meta.object_name} matches the given query.')
@@ -0,0 +1,143 @@
+"""
+Fundi calendars: working hours, time off and booked time, and the free slots between them.
+
+A booking holds its fundi from booking_date to end_date. Both the conflict check in
+create_booking and free_slots() read only the fundi's bookings and time off that end
+after the window starts (indexes booking_fundi_end_idx and timeoff_fundi_end_idx), so a
+fundi with thousands of past bookings costs the same as a new one.
+"""
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+
+from .models import Booking, Fundi, FundiTimeOff, FundiWorkingHours
+
+# Bookings in these statuses hold the fundi's time.
+ACTIVE_STATUSES = ('pending', 'confirmed', 'in_progress')
+
+# Until a fundi sets their working hours: Monday to Saturday, 08:00-18:00.
+DEFAULT_WORKING_HOURS = {weekday: [(time(8), time(18))] for weekday in range(6)}
+
+SLOT_STEP = timedelta(minutes=30)
+MAX_SLOT_DAYS = 60
+
+
+def working_hours(fundi):
+    """{weekday: [(start_time, end_time), ...]} for the fundi, or the defaults if none are set."""
+    hours = {}
+    for weekday, start_time, end_time in fundi.working_hours.values_list('weekday', 'start_time', 'end_time'):
+        hours.setdefault(weekday, []).append((start_time, end_time))
+    return hours or DEFAULT_WORKING_HOURS
+
+
+def open_intervals(hours, start, end):
+    """Working-hour intervals between start and end, clipped to them, in order.
+
+    Touching or overlapping shifts are joined, so a booking may run from one into the next.
+    """
+    tz = timezone.get_current_timezone()
+    day = timezone.localtime(start, tz).date()
+    last_day = timezone.localtime(end, tz).date()
+    current = None
+    while day <= last_day:
+        for open_at, close_at in sorted(hours.get(day.weekday(), ())):
+            lo = max(start, timezone.make_aware(datetime.combine(day, open_at), tz))
+            hi = min(end, timezone.make_aware(datetime.combine(day, close_at), tz))
+            if lo >= hi:
+                continue
+            if current and lo <= current[1]:
+                current = (current[0], max(current[1], hi))
+            else:
+                if current:
+                    yield current
+                current = (lo, hi)
+        day += timedelta(days=1)
+    if current:
+        yield current
+
+
+def busy_intervals(fundi, start, end, exclude_booking=None):
+    """Booked and blocked intervals overlapping start-end, merged and sorted."""
+    bookings = Booking.objects.filter(
+        fundi=fundi, status__in=ACTIVE_STATUSES, end_date__gt=start, booking_date__lt=end,
+    )
+    if exclude_booking is not None:
+        bookings = bookings.exclude(pk=exclude_booking.pk)
+    time_off = FundiTimeOff.objects.filter(fundi=fundi, end__gt=start, start__lt=end)
+
+    merged = []
+    for lo, hi in sorted([*bookings.values_list('booking_date', 'end_date'), *time_off.values_list('start', 'end')]):
+        if merged and lo <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], hi)
+        else:
+            merged.append([lo, hi])
+    return merged
+
+
+def unavailable_reason(fundi, start, end, exclude_booking=None):
+    """Why the fundi cannot take a booking from start to end, or None if they can."""
+    if not fundi.is_available:
+        return 'This fundi is not taking bookings right now.'
+    if start < timezone.now():
+        return 'Choose a date and time in the future.'
+    if (start, end) not in open_intervals(working_hours(fundi), start, end):
+        return "That time is outside the fundi's working hours."
+    if busy_intervals(fundi, start, end, exclude_booking):
+        return 'The fundi is already booked or unavailable at that time. Pick one of the free slots.'
+    return None
+
+
+def available_fundi_ids(fundi_ids, start=None, end=None):
+    """The fundis among fundi_ids taking bookings and, given a window, free for all of it.
+
+    Four queries however many fundis are passed; used to filter match shortlists.
+    """
+    ids = set(Fundi.objects.filter(pk__in=fundi_ids, is_available=True).values_list('pk', flat=True))
+    if start is None or not ids:
+        return ids
+    ids -= set(Booking.objects.filter(
+        fundi_id__in=ids, status__in=ACTIVE_STATUSES, end_date__gt=start, booking_date__lt=end,
+    ).values_list('fundi_id', flat=True))
+    ids -= set(FundiTimeOff.objects.filter(
+        fundi_id__in=ids, end__gt=start, start__lt=end,
+    ).values_list('fundi_id', flat=True))
+    hours = {}
+    for fundi_id, weekday, start_time, end_time in FundiWorkingHours.objects.filter(fundi_id__in=ids).values_list(
+        'fundi_id', 'weekday', 'start_time', 'end_time',
+    ):
+        hours.setdefault(fundi_id, {}).setdefault(weekday, []).append((start_time, end_time))
+    return {
+        fundi_id for fundi_id in ids
+        if (start, end) in open_intervals(hours.get(fundi_id) or DEFAULT_WORKING_HOURS, start, end)
+    }
+
+
+def _round_up(moment, step):
+    excess = (moment - moment.replace(hour=0, minute=0, second=0, microsecond=0)) % step
+    return moment + (step - excess) if excess else moment
+
+
+def free_slots(fundi, start, duration, days=7, limit=10, step=SLOT_STEP):
+    """The first `limit` free (start, end) slots of `duration` within `days` after start."""
+    if not fundi.is_available:
+        return []
+    start = timezone.localtime(start)
+    end = start + timedelta(days=days)
+    busy = busy_intervals(fundi, start, end)
+    slots = []
+    i = 0
+    for lo, hi in open_intervals(working_hours(fundi), start, end):
+        slot_start = _round_up(lo, step)
+        while slot_start + duration <= hi:
+            slot_end = slot_start + duration
+            # busy is merged, so its ends only grow: skip past the ones already behind us.
+            while i < len(busy) and busy[i][1] <= slot_start:
+                i += 1
+            if i < len(busy) and busy[i][0] < slot_end:
+                slot_start = _round_up(timezone.localtime(busy[i][1]), step)
+                continue
+            slots.append((slot_start, slot_end))
+            if len(slots) >= limit:
+                return slots
+            slot_start = slot_end
+    return slots
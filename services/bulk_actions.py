@@ -0,0 +1,25 @@
+"""
+Status actions on the admin bookings and payments lists.
+
+Each action moves every selected row its status allows (services.transitions) with
+set-based UPDATEs: one transaction and at most two statements however many rows it
+touches. Rows in other statuses are left alone. "Select all" passes the filtered
+queryset itself, so the rows are picked by subqueries in the database and their ids are
+never loaded into Python, however many there are.
+"""
+# Ticked rows come from one page of the list (20 rows); anything past this is not a
+# browser, and would only grow the IN list towards the database's bound-variable limit.
+MAX_TICKED_ROWS = 100
+
+# action -> (label, new status)
+BOOKING_BULK_ACTIONS = {
+    'confirm': ('Confirm', 'confirmed'),
+    'complete': ('Mark completed', 'completed'),
+    'cancel': ('Cancel', 'cancelled'),
+}
+
+PAYMENT_BULK_ACTIONS = {
+    'approve': ('Approve (mark completed)', 'completed'),
+    'mark_failed': ('Mark failed', 'failed'),
+    'mark_refunded': ('Mark refunded', 'refunded'),
+}
@@ -0,0 +1,129 @@
+"""
+"Post a job": queueing a job without a fundi and offering it until one accepts.
+
+A posted JobRequest is offered to the best-matching free fundis (services.matching),
+DISPATCH_FANOUT at a time, each offer open for DISPATCH_OFFER_SECONDS. When offers are
+declined or time out, `manage.py dispatch_jobs` offers the job to the next fundis in the
+ranking. A job nobody has taken by its start time, or with no fundis left to ask, expires.
+
+Assignment is a conditional UPDATE (status 'open' -> 'assigned') inside the accepting
+transaction. However many fundis accept at once, exactly one UPDATE matches the row;
+the others see zero rows changed and roll back, so a job never gets two bookings.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .availability import unavailable_reason
+from .matching import match_fundis
+from .models import Booking, Fundi, JobOffer, JobRequest
+
+# How many of the next-best fundis to look at when topping up a job's offers.
+MATCH_LOOKAHEAD = 20
+
+
+def offer_job(job, now=None):
+    """Top the job's live offers up to DISPATCH_FANOUT. Returns the number of new offers."""
+    now = now or timezone.now()
+    with transaction.atomic():
+        # skip_locked: a second dispatcher moves on to other jobs (no-op on SQLite).
+        job = JobRequest.objects.select_for_update(skip_locked=True).filter(pk=job.pk, status='open').first()
+        if job is None:
+            return 0
+        live = job.offers.filter(status='offered', expires_at__gt=now).count()
+        wanted = settings.DISPATCH_FANOUT - live
+        if wanted <= 0:
+            return 0
+
+        asked = set(job.offers.values_list('fundi_id', flat=True))
+        matches = match_fundis(
+            job.category, start=job.booking_date, hours=job.estimated_hours, budget=job.budget,
+            location=job.address, limit=len(asked) + MATCH_LOOKAHEAD,
+        )
+        expires_at = now + timedelta(seconds=settings.DISPATCH_OFFER_SECONDS)
+        offers = [
+            JobOffer(job=job, fundi_id=match['fundi_id'], score=match['score'], expires_at=expires_at)
+            for match in matches if match['fundi_id'] not in asked
+        ][:wanted]
+        if not offers and not live:
+            # Everyone suitable has been asked (or nobody is free): give up on the job.
+            JobRequest.objects.filter(pk=job.pk, status='open').update(status='expired', updated_at=now)
+            return 0
+        JobOffer.objects.bulk_create(offers, ignore_conflicts=True)
+    return len(offers)
+
+
+def accept_offer(offer, now=None):
+    """Fundi accepts an offer. Returns (booking, None) or (None, reason it failed)."""
+    now = now or timezone.now()
+    job = offer.job
+    fundi = offer.fundi
+    end = job.booking_date + timedelta(hours=job.estimated_hours)
+    with transaction.atomic():
+        # Same lock as create_booking, so a direct booking cannot take the slot meanwhile.
+        Fundi.objects.select_for_update().filter(pk=fundi.pk).first()
+        reason = unavailable_reason(fundi, job.booking_date, end)
+        if reason is not None:
+            return None, reason
+        # The job row first, then its offers, the order cancel_job and the withdrawal below
+        # use; taking this offer's row first deadlocks against a fundi accepting the same job.
+        if not JobRequest.objects.filter(pk=job.pk, status='open').update(
+            status='assigned', assigned_at=now, updated_at=now,
+        ):
+            if JobRequest.objects.filter(pk=job.pk, status='assigned').exists():
+                return None, 'Another fundi has already taken this job.'
+            return None, 'This offer has expired or was withdrawn.'
+        if not JobOffer.objects.filter(pk=offer.pk, status='offered', expires_at__gt=now).update(
+            status='accepted', responded_at=now, updated_at=now,
+        ):
+            transaction.set_rollback(True)
+            return None, 'This offer has expired or was withdrawn.'
+
+        booking = Booking.objects.create(
+            customer_id=job.customer_id,
+            fundi=fundi,
+            service_id=job.service_id,
+            description=job.description,
+            address=job.address,
+            booking_date=job.booking_date,
+            estimated_hours=job.estimated_hours,
+            status='confirmed',
+        )
+        JobRequest.objects.filter(pk=job.pk).update(booking=booking, updated_at=now)
+        JobOffer.objects.filter(job=job, status='offered').update(status='withdrawn', responded_at=now, updated_at=now)
+    return booking, None
+
+
+def decline_offer(offer, now=None):
+    now = now or timezone.now()
+    if JobOffer.objects.filter(pk=offer.pk, status='offered').update(status='declined', responded_at=now, updated_at=now):
+        offer_job(offer.job, now)
+
+
+def cancel_job(job, now=None):
+    now = now or timezone.now()
+    with transaction.atomic():
+        if JobRequest.objects.filter(pk=job.pk, status='open').update(status='cancelled', updated_at=now):
+            JobOffer.objects.filter(job=job, status='offered').update(status='withdrawn', responded_at=now, updated_at=now)
+            return True
+    return False
+
+
+def dispatch_tick(batch_size=200, now=None):
+    """One pass of the dispatcher. Returns counts of what changed."""
+    now = now or timezone.now()
+    expired_offers = JobOffer.objects.filter(status='offered', expires_at__lte=now).update(
+        status='expired', updated_at=now,
+    )
+    started = JobRequest.objects.filter(status='open', booking_date__lte=now)
+    JobOffer.objects.filter(job__in=started.values('pk'), status='offered').update(
+        status='withdrawn', responded_at=now, updated_at=now,
+    )
+    expired_jobs = started.update(status='expired', updated_at=now)
+
+    new_offers = 0
+    for job in JobRequest.objects.filter(status='open').order_by('created_at')[:batch_size]:
+        new_offers += offer_job(job, now)
+    return {'expired_offers': expired_offers, 'expired_jobs': expired_jobs, 'new_offers': new_offers}
@@ -1,6 +1,7 @@
 from django import forms
 from django.contrib.auth.forms import UserCreationForm
-from .models import User, Fundi, Service, Booking, Review, Payment
+from django.utils import timezone
+from .models import User, Fundi, Service, Booking, Review, Payment, FundiWorkingHours, FundiTimeOff, JobRequest
 
 
 class CustomUserCreationForm(UserCreationForm):
@@ -38,6 +39,31 @@ class FundiProfileForm(forms.ModelForm):
         }
 
 
+WorkingHoursFormSet = forms.inlineformset_factory(
+    Fundi,
+    FundiWorkingHours,
+    fields=['weekday', 'start_time', 'end_time'],
+    widgets={
+        'weekday': forms.Select(attrs={'class': 'form-select'}),
+        'start_time': forms.TimeInput(attrs={'type': 'time', 'class': 'form-control'}, format='%H:%M'),
+        'end_time': forms.TimeInput(attrs={'type': 'time', 'class': 'form-control'}, format='%H:%M'),
+    },
+    extra=1,
+    can_delete=True,
+)
+
+
+class FundiTimeOffForm(forms.ModelForm):
+    class Meta:
+        model = FundiTimeOff
+        fields = ['start', 'end', 'reason']
+        widgets = {
+            'start': forms.DateTimeInput(attrs={'type': 'datetime-local', 'class': 'form-control'}),
+            'end': forms.DateTimeInput(attrs={'type': 'datetime-local', 'class': 'form-control'}),
+            'reason': forms.TextInput(attrs={'class': 'form-control'}),
+        }
+
+
 class BookingForm(forms.ModelForm):
     class Meta:
         model = Booking
@@ -138,6 +164,42 @@ class BookingForm(forms.ModelForm):
             self.fields['service'].empty_label = "Select a service..."
 
 
+class JobRequestForm(forms.ModelForm):
+    class Meta:
+        model = JobRequest
+        fields = ['service', 'description', 'address', 'booking_date', 'estimated_hours', 'budget']
+        widgets = {
+            'service': forms.Select(attrs={'class': 'form-select'}),
+            'description': forms.Textarea(attrs={
+                'rows': 4,
+                'class': 'form-control',
+                'placeholder': 'Describe the job...'
+            }),
+            'address': forms.Textarea(attrs={
+                'rows': 2,
+                'class': 'form-control',
+                'placeholder': 'e.g. Kilimani, Nairobi'
+            }),
+            'booking_date': forms.DateTimeInput(attrs={'type': 'datetime-local', 'class': 'form-control'}),
+            'estimated_hours': forms.NumberInput(attrs={'class': 'form-control', 'min': '1'}),
+            'budget': forms.NumberInput(attrs={'class': 'form-control', 'min': '0', 'placeholder': 'KSh (optional)'}),
+        }
+        labels = {
+            'booking_date': 'When',
+        }
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['service'].queryset = Service.objects.order_by('category', 'name')
+        self.fields['service'].label_from_instance = lambda service: f"{service.get_category_display()} - {service.name}"
+    
+    def clean_booking_date(self):
+        booking_date = self.cleaned_data['booking_date']
+        if booking_date <= timezone.now():
+            raise forms.ValidationError('Choose a date and time in the future.')
+        return booking_date
+
+
 class ReviewForm(forms.ModelForm):
     class Meta:
         model = Review
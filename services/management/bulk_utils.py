@@ -0,0 +1,25 @@
+"""
+Helpers shared by the bulk data management commands.
+"""
+from contextlib import contextmanager
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """Let bulk_create keep the created_at/updated_at values already set on objects.
+
+    auto_now/auto_now_add would otherwise stamp every row with the current time,
+    unlike loaddata's raw saves. Only use this in management commands: the fields
+    are switched back when the block exits, but other threads see the change meanwhile.
+    """
+    saved = []
+    for model in models:
+        for field in model._meta.concrete_fields:
+            if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False):
+                saved.append((field, field.auto_now, field.auto_now_add))
+                field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
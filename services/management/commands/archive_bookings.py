@@ -0,0 +1,65 @@
+"""
+Move old completed/cancelled bookings (with their payment and review) to the archive tables.
+
+Usage (from project root, with venv active):
+  python manage.py archive_bookings --dry-run
+  python manage.py archive_bookings --months 12
+  python manage.py archive_bookings --months 6 --batch-size 500 --limit 100000
+
+A booking is archived when its status is completed or cancelled, it has not changed for
+--months months, and its payment (if any) is not pending. Each batch is one transaction,
+so the command can be stopped and re-run at any time.
+
+Lifetime fundi ratings, booking counts and revenue stay the same: the archived amounts are
+added to per-fundi and per-customer totals (FundiArchiveStats, CustomerArchiveStats).
+Admin booking and payment detail pages still open archived records by id.
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from services.archive import archivable_bookings, archive_batch
+
+
+class Command(BaseCommand):
+    help = "Move completed/cancelled bookings older than N months to the archive tables, in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--months", type=int, default=12, help="Archive bookings unchanged for this long (default: 12)")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Bookings moved per transaction (default: 1000)")
+        parser.add_argument("--limit", type=int, help="Stop after this many bookings")
+        parser.add_argument("--dry-run", action="store_true", help="Only count what would be archived")
+
+    def handle(self, *args, **options):
+        if options["months"] < 1:
+            raise CommandError("--months must be at least 1.")
+        # 30-day months: exact enough for a retention cutoff.
+        cutoff = timezone.now() - timedelta(days=30 * options["months"])
+        candidates = archivable_bookings(cutoff)
+
+        if options["dry_run"]:
+            self.stdout.write(f"{candidates.count()} bookings last changed before {cutoff:%Y-%m-%d} would be archived.")
+            return
+
+        limit = options["limit"]
+        batch_size = options["batch_size"]
+        moved = 0
+        started = timezone.now()
+        last_pk = 0
+        while limit is None or moved < limit:
+            size = batch_size if limit is None else min(batch_size, limit - moved)
+            # Walk by primary key so bookings that are skipped on re-check are not selected again.
+            ids = list(
+                candidates.filter(pk__gt=last_pk).order_by("pk").values_list("pk", flat=True)[:size]
+            )
+            if not ids:
+                break
+            last_pk = ids[-1]
+            moved += archive_batch(ids, cutoff)
+            self.stdout.write(f"  {moved} bookings archived")
+
+        elapsed = (timezone.now() - started).total_seconds()
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {moved} bookings older than {cutoff:%Y-%m-%d} in {elapsed:.1f}s"
+        ))
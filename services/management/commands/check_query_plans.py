@@ -0,0 +1,118 @@
+"""
+EXPLAIN the hot Booking/Payment queries and check that each one uses an index.
+
+Usage (from project root, with venv active):
+  python manage.py generate_fake_data --bookings 10000000   # on a scratch database
+  python manage.py check_query_plans
+  python manage.py check_query_plans --verbose              # print the full plans
+
+The query shapes mirror views.py and admin.py. A query fails when the plan reads
+services_booking or services_payment with a full table scan (SQLite "SCAN <table>",
+PostgreSQL "Seq Scan") or sorts them without an index. Exits non-zero on failure,
+so it can run in CI after migrations.
+
+On PostgreSQL run ANALYZE first so the planner sees the real table sizes.
+"""
+import re
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from services.availability import ACTIVE_STATUSES
+from services.models import Booking, Payment
+
+WATCHED_TABLES = ("services_booking", "services_payment")
+
+FULL_SCAN_PATTERNS = {
+    # "SCAN services_booking" with nothing after it is a table scan; "SCAN ... USING INDEX" is fine.
+    "sqlite": [re.compile(r"\bSCAN (%s)\s*$" % "|".join(WATCHED_TABLES), re.M)],
+    "postgresql": [re.compile(r"Seq Scan on (%s)\b" % "|".join(WATCHED_TABLES))],
+}
+SORT_PATTERNS = {
+    "sqlite": re.compile(r"USE TEMP B-TREE FOR ORDER BY"),
+    "postgresql": re.compile(r"^\s*(->\s*)?Sort\b", re.M),
+}
+INDEX_NAME_RE = re.compile(r"(?:USING (?:COVERING )?INDEX|using|on) (\w+_idx|\w+_[0-9a-f]{8}|\w+_key|\w+_pkey)")
+
+
+def hot_queries():
+    """(name, queryset) pairs matching what the views run on every request."""
+    sample = Booking.objects.order_by("-created_at").values("fundi_id", "customer_id", "fundi__user_id").first()
+    if not sample:
+        raise CommandError("No bookings to plan against. Run generate_fake_data first.")
+    fundi_id, customer_id, fundi_user_id = sample["fundi_id"], sample["customer_id"], sample["fundi__user_id"]
+    checkout_request_id = (
+        Payment.objects.exclude(checkout_request_id="").values_list("checkout_request_id", flat=True).first()
+        or "ws_CO_0"
+    )
+    week_ago = timezone.now() - timedelta(days=7)
+
+    return [
+        # fundi_detail / fundi_dashboard / admin_fundi_detail
+        ("fundi recent bookings", Booking.objects.filter(fundi_id=fundi_id).order_by("-created_at")[:10]),
+        ("fundi completed count", Booking.objects.filter(fundi_id=fundi_id, status="completed").values("pk")),
+        ("fundi pending count", Booking.objects.filter(fundi_id=fundi_id, status="pending").values("pk")),
+        # my_bookings / admin_customer_detail
+        ("customer bookings", Booking.objects.filter(customer_id=customer_id).order_by("-created_at")),
+        ("fundi user bookings", Booking.objects.filter(fundi__user_id=fundi_user_id).order_by("-created_at")),
+        # admin_dashboard / admin_bookings
+        ("recent bookings", Booking.objects.select_related("customer", "fundi__user", "service").order_by("-created_at")[:20]),
+        ("bookings by status", Booking.objects.filter(status="pending").order_by("-created_at")[:20]),
+        ("booking status count", Booking.objects.filter(status="pending").values("pk")),
+        # create_booking overlap check / fundi_free_slots
+        ("fundi booking overlap", Booking.objects.filter(
+            fundi_id=fundi_id, status__in=ACTIVE_STATUSES, end_date__gt=week_ago, booking_date__lt=week_ago + timedelta(days=7),
+        ).values("booking_date", "end_date")),
+        # BookingAdmin list_filter on booking_date
+        ("bookings this week", Booking.objects.filter(booking_date__gte=week_ago).values("pk")),
+        # admin_dashboard / admin_payments
+        ("recent payments", Payment.objects.select_related("booking__customer").order_by("-created_at")[:20]),
+        ("payments by status", Payment.objects.filter(status="pending").order_by("-created_at")[:20]),
+        ("payments by method", Payment.objects.filter(payment_method="cash").order_by("-created_at")[:20]),
+        ("payment status count", Payment.objects.filter(status="failed").values("pk")),
+        # mpesa_callback
+        ("callback by checkout id", Payment.objects.filter(checkout_request_id=checkout_request_id)),
+        ("callback by merchant id", Payment.objects.filter(merchant_request_id="fake-0")),
+    ]
+
+
+class Command(BaseCommand):
+    help = "EXPLAIN the hot booking and payment queries and fail if any scans a whole table."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--verbose", action="store_true", help="Print the full plan for every query")
+
+    def handle(self, *args, **options):
+        vendor = connection.vendor
+        if vendor not in FULL_SCAN_PATTERNS:
+            raise CommandError(f"Plan checks are written for SQLite and PostgreSQL, not {vendor}.")
+
+        rows = Booking.objects.count()
+        self.stdout.write(f"{vendor}: {rows} bookings, {Payment.objects.count()} payments")
+        if rows < 100000:
+            self.stdout.write(self.style.WARNING(
+                "Small tables: the planner may prefer scans. Results are meaningful at 1M+ rows."
+            ))
+
+        failures = []
+        for name, queryset in hot_queries():
+            plan = queryset.explain()
+            problems = [f"full scan of {m.group(1)}" for p in FULL_SCAN_PATTERNS[vendor] for m in p.finditer(plan)]
+            if SORT_PATTERNS[vendor].search(plan) and queryset.query.order_by:
+                problems.append("sort without index")
+            indexes = sorted(set(INDEX_NAME_RE.findall(plan)))
+
+            if problems:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f"  FAIL {name}: {', '.join(problems)}"))
+            else:
+                self.stdout.write(f"  ok   {name}: {', '.join(indexes) or 'index'}")
+            if options["verbose"] or problems:
+                for line in plan.splitlines():
+                    self.stdout.write(f"         {line}")
+
+        if failures:
+            raise CommandError(f"{len(failures)} hot queries are not index-backed: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS("All hot queries use an index."))
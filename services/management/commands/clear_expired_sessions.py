@@ -0,0 +1,55 @@
+"""
+Delete expired sessions from the database, in batches.
+
+Usage (from project root, with venv active):
+  python manage.py clear_expired_sessions --dry-run
+  python manage.py clear_expired_sessions                  # e.g. daily from cron
+  python manage.py clear_expired_sessions --batch-size 1000
+
+Sessions are stored in django_session with the db and cached_db engines (SESSION_ENGINE)
+and nothing removes them when they expire, so the table only grows. Django's own
+clearsessions deletes them in one statement, which on a large table holds locks for a
+long time; this deletes a batch at a time, each in its own short transaction. Cached
+copies (cached_db) expire from the cache by themselves. With signed_cookies nothing is
+stored and there is nothing to do.
+"""
+import time
+from importlib import import_module
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = "Delete expired sessions from the database, a batch at a time."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000, help="Sessions deleted per statement (default: 5000)")
+        parser.add_argument("--dry-run", action="store_true", help="Only count expired sessions")
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        store = import_module(settings.SESSION_ENGINE).SessionStore
+        if not hasattr(store, "get_model_class"):
+            self.stdout.write(f"{settings.SESSION_ENGINE} keeps no sessions in the database; nothing to do.")
+            return
+        sessions = store.get_model_class().objects
+        now = timezone.now()
+        expired = sessions.filter(expire_date__lt=now)
+        if options["dry_run"]:
+            self.stdout.write(f"{expired.count()} expired sessions of {sessions.count()} would be deleted")
+            return
+
+        started = time.perf_counter()
+        deleted = 0
+        while True:
+            keys = list(expired.values_list("session_key", flat=True)[:options["batch_size"]])
+            if not keys:
+                break
+            deleted += expired.filter(session_key__in=keys).delete()[0]
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Deleted {deleted} expired sessions in {elapsed:.1f}s; {sessions.count()} remain"
+        ))
@@ -0,0 +1,40 @@
+"""
+Run the job dispatcher: expire old offers and offer open posted jobs to the next fundis.
+
+Usage (from project root, with venv active):
+  python manage.py dispatch_jobs              # loop every 5 seconds until stopped
+  python manage.py dispatch_jobs --interval 10
+  python manage.py dispatch_jobs --once       # one pass, e.g. from a cron job
+
+Posting a job and declining an offer already offer the job straight away; this loop
+handles offers that time out (DJANGO_DISPATCH_OFFER_SECONDS) and jobs whose start time
+passes. Running two dispatchers is safe: assignment is atomic either way.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from services.dispatch import dispatch_tick
+
+
+class Command(BaseCommand):
+    help = "Offer open posted jobs to fundis, expiring offers nobody answered."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, default=5, help="Seconds between passes (default: 5)")
+        parser.add_argument("--batch-size", type=int, default=200, help="Open jobs handled per pass (default: 200)")
+        parser.add_argument("--once", action="store_true", help="Run a single pass and exit")
+
+    def handle(self, *args, **options):
+        while True:
+            close_old_connections()
+            counts = dispatch_tick(batch_size=options["batch_size"])
+            if any(counts.values()) or options["verbosity"] > 1:
+                self.stdout.write(
+                    f"{counts['new_offers']} offers sent, {counts['expired_offers']} offers expired, "
+                    f"{counts['expired_jobs']} jobs expired"
+                )
+            if options["once"]:
+                return
+            time.sleep(options["interval"])
@@ -3,64 +3,188 @@ Export app data from your local DB (e.g. SQLite) for loading on Render/Postgres.
 
 Usage (from project root, with venv active):
   python manage.py export_local_data
-  python manage.py export_local_data --output my_backup.json
+  python manage.py export_local_data --output my_backup
+  python manage.py export_local_data --since 2026-01-01T00:00:00
+  python manage.py export_local_data --compression zstd   (needs: pip install zstandard)
+  python manage.py export_local_data --format fixture -o local_export.json.gz
+
+The default output is a folder with one compressed JSON Lines file per model plus
+manifest.json (row counts and checksums). Rows are streamed in primary-key order with
+iterator(chunk_size=...), so memory stays flat however large the tables are.
 
 Then on the live server (Render Shell or SSH):
-  python manage.py loaddata my_backup.json
+  python manage.py import_data my_backup
+or, for --format fixture:
+  python manage.py loaddata local_export.json.gz
 
 Copy the media/ folder to production so profile images work (see command help).
 """
+import gzip
+import hashlib
+import json
 from pathlib import Path
 
-from django.core.management import call_command
-from django.core.management.base import BaseCommand
+from django.core import serializers
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from fundi_platform.db_router import replica_reads
+from services.models import (
+    ArchivedBooking,
+    ArchivedPayment,
+    ArchivedReview,
+    Booking,
+    CustomerArchiveStats,
+    Fundi,
+    FundiArchiveStats,
+    FundiTimeOff,
+    FundiWorkingHours,
+    JobOffer,
+    JobRequest,
+    MediaFile,
+    Payment,
+    Review,
+    Service,
+    User,
+)
+
+# Dependency order: a model only points at models listed before it.
+EXPORT_MODELS = [
+    User, Service, Fundi, FundiWorkingHours, FundiTimeOff, Booking, Review, Payment,
+    ArchivedBooking, ArchivedReview, ArchivedPayment, FundiArchiveStats, CustomerArchiveStats,
+    JobRequest, JobOffer, MediaFile,
+]
+
+# Timestamps that move when a row is created or changed, used by --since.
+# Models without any are always exported in full; they are small.
+CHANGE_FIELDS = {
+    User: ["date_joined", "last_login"],
+    Service: [],
+    Fundi: ["updated_at"],
+    # Small, and edited in place without a timestamp: always exported in full.
+    FundiWorkingHours: [],
+    FundiTimeOff: [],
+    Booking: ["updated_at"],
+    Review: ["created_at"],
+    Payment: ["updated_at"],
+    JobRequest: ["updated_at"],
+    JobOffer: ["updated_at"],
+    # Stored pictures and how many fundis use each; updated_at moves with the count.
+    MediaFile: ["updated_at"],
+    ArchivedBooking: ["archived_at"],
+    ArchivedReview: ["booking__archived_at"],
+    ArchivedPayment: ["booking__archived_at"],
+    # Running totals, one row per fundi/customer: always exported in full.
+    FundiArchiveStats: [],
+    CustomerArchiveStats: [],
+}
+
+MANIFEST_NAME = "manifest.json"
+FORMAT_VERSION = 1
+
+
+def open_compressed(path, mode, compression):
+    """Binary file object for a .gz or .zst file ("rb" or "wb")."""
+    if compression == "gzip":
+        return gzip.open(path, mode, compresslevel=6) if "w" in mode else gzip.open(path, mode)
+    try:
+        import zstandard
+    except ImportError:
+        raise CommandError("zstd compression needs the zstandard package: pip install zstandard")
+    fh = open(path, mode)
+    if "w" in mode:
+        return zstandard.ZstdCompressor(level=3).stream_writer(fh, closefd=True)
+    return zstandard.ZstdDecompressor().stream_reader(fh, closefd=True)
+
+
+def model_label(model):
+    return model._meta.label_lower
 
 
 class Command(BaseCommand):
     help = (
-        "Dump all services.* models to a JSON fixture for production import. "
-        "Run against your local database that has the data you want to copy."
+        "Stream all services.* models to compressed JSON Lines (or a gzipped fixture) "
+        "for production import. Run against your local database that has the data you want to copy."
     )
 
     def add_arguments(self, parser):
         parser.add_argument(
             "--output",
             "-o",
-            default="local_export.json",
-            help="Output file path (default: local_export.json in project root)",
+            default="local_export",
+            help="Output folder, or file for --format fixture (default: local_export in project root)",
+        )
+        parser.add_argument(
+            "--format",
+            choices=["jsonl", "fixture"],
+            default="jsonl",
+            help="jsonl: one file per model + manifest (default). fixture: one .json.gz for loaddata.",
+        )
+        parser.add_argument(
+            "--compression",
+            choices=["gzip", "zstd"],
+            default="gzip",
+            help="Compression for jsonl files (default: gzip; zstd needs the zstandard package)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Rows fetched per database round trip (default: 2000)",
+        )
+        parser.add_argument(
+            "--since",
+            help="Only export rows created or changed after this ISO timestamp, e.g. 2026-01-01T00:00:00",
         )
 
     def handle(self, *args, **options):
+        from django.conf import settings
+
         out = Path(options["output"])
         if not out.is_absolute():
-            from django.conf import settings
-
             out = Path(settings.BASE_DIR) / out
 
-        self.stdout.write(
-            "Exporting services app (users, fundis, bookings, reviews, payments)..."
-        )
-        with out.open("w", encoding="utf-8") as fh:
-            call_command(
-                "dumpdata",
-                "services",
-                natural_foreign=True,
-                natural_primary=True,
-                indent=2,
-                stdout=fh,
+        since = None
+        if options["since"]:
+            since = parse_datetime(options["since"])
+            if since is None:
+                raise CommandError(f"--since must be an ISO timestamp, got {options['since']!r}")
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+
+        self.chunk_size = options["chunk_size"]
+        if options["format"] == "fixture":
+            if options["compression"] != "gzip":
+                raise CommandError("--format fixture is always gzip (loaddata reads .json.gz).")
+            if not out.name.endswith(".json.gz"):
+                out = out.with_name(out.name + ".json.gz")
+            self.stdout.write("Exporting services app to a gzipped fixture...")
+            # Reads from a replica when DATABASE_REPLICA_URLS is set.
+            with replica_reads():
+                self._write_fixture(out, since)
+        else:
+            self.stdout.write(
+                "Exporting services app (users, fundis, bookings, reviews, payments)..."
             )
+            with replica_reads():
+                self._write_jsonl(out, since, options["compression"])
+
         self.stdout.write(self.style.SUCCESS(f"Wrote {out}"))
         self.stdout.write("")
         self.stdout.write(
             self.style.WARNING(
-                "Security: this file contains password hashes. Do not commit it to git."
+                "Security: this export contains password hashes. Do not commit it to git."
             )
         )
         self.stdout.write("")
         self.stdout.write("Next steps for production:")
         self.stdout.write(
             "  A) Automated one-time import (build.sh): "
-            "upload local_export.json to private cloud storage, copy a direct-download HTTPS link."
+            "tar the export folder (tar -cf local_export.tar -C local_export .), upload it to "
+            "private cloud storage, copy a direct-download HTTPS link."
         )
         self.stdout.write(
             "     In Render Dashboard: Web Service - Environment, add (as Secret):"
@@ -75,5 +199,79 @@ class Command(BaseCommand):
             "and the URL vars (or set RUN_SEED_IMPORT false) so the next deploy does not re-import."
         )
         self.stdout.write(
-            "  B) Manual: Render Shell: upload file, run: python manage.py loaddata local_export.json"
+            "  B) Manual: Render Shell: upload and untar the export, run: python manage.py import_data local_export"
         )
+
+    def _queryset(self, model, since):
+        qs = model._default_manager.order_by("pk")
+        if since is not None and CHANGE_FIELDS[model]:
+            changed = Q()
+            for field in CHANGE_FIELDS[model]:
+                changed |= Q(**{f"{field}__gt": since})
+            qs = qs.filter(changed)
+        m2m = [f.name for f in model._meta.many_to_many]
+        if m2m:
+            qs = qs.prefetch_related(*m2m)
+        return qs
+
+    def _rows(self, model, since):
+        """Yield one serialized JSON line per row, fetching chunk_size rows at a time."""
+        serializer = serializers.get_serializer("python")()
+        chunk = []
+        for obj in self._queryset(model, since).iterator(chunk_size=self.chunk_size):
+            chunk.append(obj)
+            if len(chunk) >= self.chunk_size:
+                yield from self._serialize(serializer, chunk)
+                chunk = []
+        if chunk:
+            yield from self._serialize(serializer, chunk)
+
+    def _serialize(self, serializer, objects):
+        for row in serializer.serialize(objects):
+            yield json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False, separators=(",", ":"))
+
+    def _write_jsonl(self, out, since, compression):
+        out.mkdir(parents=True, exist_ok=True)
+        suffix = ".jsonl.gz" if compression == "gzip" else ".jsonl.zst"
+        manifest = {
+            "format": "jsonl",
+            "version": FORMAT_VERSION,
+            "compression": compression,
+            "created_at": timezone.now().isoformat(),
+            "since": since.isoformat() if since else None,
+            "models": [],
+        }
+        for model in EXPORT_MODELS:
+            label = model_label(model)
+            path = out / f"{label}{suffix}"
+            digest = hashlib.sha256()
+            rows = 0
+            with open_compressed(path, "wb", compression) as fh:
+                for line in self._rows(model, since):
+                    data = (line + "\n").encode("utf-8")
+                    digest.update(data)
+                    fh.write(data)
+                    rows += 1
+            manifest["models"].append({
+                "model": label,
+                "file": path.name,
+                "rows": rows,
+                "sha256": digest.hexdigest(),
+            })
+            self.stdout.write(f"  {label}: {rows} rows")
+
+        # Written last: a folder without a manifest is an interrupted export.
+        (out / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+
+    def _write_fixture(self, out, since):
+        with gzip.open(out, "wt", encoding="utf-8", compresslevel=6) as fh:
+            fh.write("[")
+            first = True
+            for model in EXPORT_MODELS:
+                rows = 0
+                for line in self._rows(model, since):
+                    fh.write(line if first else ",\n" + line)
+                    first = False
+                    rows += 1
+                self.stdout.write(f"  {model_label(model)}: {rows} rows")
+            fh.write("]\n")
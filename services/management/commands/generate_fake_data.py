@@ -0,0 +1,320 @@
+"""
+Generate a large synthetic dataset for performance testing.
+
+Usage (from project root, with venv active):
+  python manage.py generate_fake_data
+  python manage.py generate_fake_data --customers 200000 --fundis 20000 --bookings 10000000
+  python manage.py generate_fake_data --seed 7 --prefix bench7
+
+Everything is written with bulk_create in batches (never one save() per row), so
+millions of bookings take minutes rather than hours. The same --seed, --prefix and
+--until always produce the same rows.
+
+Every generated account shares one password (--password, hashed once), so load
+tests can log in as any fake customer or fundi. Do not run this against production.
+"""
+import random
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from services.management.bulk_utils import explicit_timestamps
+from services.models import Booking, Fundi, Payment, Review, Service, User
+
+# Booking status mix for generated history (weights, roughly what production shows).
+BOOKING_STATUS_WEIGHTS = {
+    "completed": 55,
+    "cancelled": 10,
+    "pending": 15,
+    "confirmed": 12,
+    "in_progress": 8,
+}
+
+# Share of fundis per category; cleaners and plumbers are the busiest trades.
+CATEGORY_WEIGHTS = {
+    "plumber": 25,
+    "electrician": 20,
+    "cleaner": 25,
+    "carpenter": 12,
+    "painter": 12,
+    "other": 6,
+}
+
+SERVICE_NAMES = {
+    "plumber": ["Pipe Repair", "Drain Cleaning", "Toilet Installation", "Water Heater Repair", "General Plumbing"],
+    "electrician": ["Wiring Installation", "Light Fixture Installation", "Outlet Repair", "Circuit Breaker Repair", "General Electrical Work"],
+    "cleaner": ["House Cleaning", "Office Cleaning", "Deep Cleaning", "Window Cleaning", "Carpet Cleaning"],
+    "carpenter": ["Furniture Repair", "Cabinet Installation", "Door Installation", "Shelf Installation", "General Carpentry"],
+    "painter": ["Interior Painting", "Exterior Painting", "Room Painting", "Wall Repair & Paint", "General Painting"],
+    "other": ["General Service", "Consultation", "Other"],
+}
+
+FIRST_NAMES = ["Amina", "Brian", "Cynthia", "David", "Esther", "Felix", "Grace", "Hassan", "Irene", "James",
+               "Kevin", "Lucy", "Mercy", "Njeri", "Otieno", "Peter", "Rose", "Samuel", "Wanjiku", "Zawadi"]
+LAST_NAMES = ["Achieng", "Barasa", "Chege", "Kamau", "Kiptoo", "Mwangi", "Njoroge", "Odhiambo", "Omondi",
+              "Onyango", "Otieno", "Wafula", "Wambui", "Wanjala", "Mutua"]
+AREAS = ["Westlands", "Kilimani", "Karen", "Kasarani", "Embakasi", "Langata", "Ruaka", "Rongai",
+         "Kileleshwa", "South B", "Donholm", "Syokimau", "Thika Road", "Ngong Road"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Create synthetic users, fundis, services, bookings, reviews and payments "
+        "with bulk inserts, for benchmark-scale databases."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--customers", type=int, default=1000, help="Customer accounts to create (default: 1000)")
+        parser.add_argument("--fundis", type=int, default=200, help="Fundi accounts and profiles to create (default: 200)")
+        parser.add_argument("--bookings", type=int, default=10000, help="Bookings to create (default: 10000)")
+        parser.add_argument(
+            "--review-rate",
+            type=float,
+            default=0.6,
+            help="Share of completed bookings that get a review (default: 0.6)",
+        )
+        parser.add_argument(
+            "--payment-rate",
+            type=float,
+            default=0.9,
+            help="Share of completed bookings that have a payment (default: 0.9)",
+        )
+        parser.add_argument("--days", type=int, default=730, help="Spread created_at over this many days (default: 730)")
+        parser.add_argument(
+            "--until",
+            default=None,
+            help="Newest created_at, YYYY-MM-DD (default: today). Fix it to reproduce a dataset exactly.",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000, help="Rows per INSERT (default: 5000)")
+        parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42)")
+        parser.add_argument(
+            "--prefix",
+            default="fake",
+            help="Username prefix for generated accounts, must be unused (default: fake)",
+        )
+        parser.add_argument(
+            "--password",
+            default="fundi-bench-pass",
+            help="Password set on every generated account (default: fundi-bench-pass)",
+        )
+
+    def handle(self, *args, **options):
+        if not connection.features.can_return_rows_from_bulk_insert:
+            raise CommandError(
+                f"{connection.vendor} does not return primary keys from bulk inserts; "
+                "use PostgreSQL or SQLite 3.35+."
+            )
+        if min(options["customers"], options["fundis"], options["bookings"]) < 0:
+            raise CommandError("Counts cannot be negative.")
+        if options["batch_size"] < 1 or options["days"] < 1:
+            raise CommandError("--batch-size and --days must be at least 1.")
+        if options["bookings"] and not (options["customers"] and options["fundis"]):
+            raise CommandError("Bookings need at least one customer and one fundi.")
+
+        self.prefix = options["prefix"]
+        if User.objects.filter(username__startswith=f"{self.prefix}_").exists():
+            raise CommandError(
+                f"Users with prefix '{self.prefix}_' already exist. Pick another --prefix."
+            )
+
+        self.rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        if options["until"]:
+            until = datetime.strptime(options["until"], "%Y-%m-%d").date()
+        else:
+            until = timezone.localdate()
+        self.until = timezone.make_aware(datetime.combine(until, time(23, 59)))
+        self.window_seconds = options["days"] * 86400
+        self.password_hash = make_password(options["password"])
+
+        started = timezone.now()
+        with explicit_timestamps(Fundi, Booking, Review, Payment):
+            services = self._ensure_services()
+            customer_ids = self._create_users("c", options["customers"], is_fundi=False)
+            fundi_user_ids = self._create_users("f", options["fundis"], is_fundi=True)
+            fundis = self._create_fundis(fundi_user_ids)
+            if options["bookings"]:
+                self._create_bookings(
+                    options["bookings"], customer_ids, fundis, services,
+                    options["review_rate"], options["payment_rate"],
+                )
+
+        elapsed = (timezone.now() - started).total_seconds()
+        self.stdout.write(self.style.SUCCESS(f"Done in {elapsed:.1f}s"))
+
+    def _random_moment(self):
+        return self.until - timedelta(seconds=self.rng.randrange(self.window_seconds))
+
+    def _ensure_services(self):
+        """Return {category: [service_id, ...]}, creating the default catalogue where missing."""
+        existing = {}
+        for service_id, category in Service.objects.values_list("id", "category").order_by("id"):
+            existing.setdefault(category, []).append(service_id)
+
+        missing = [
+            Service(name=name, category=category, description=f"{name} service")
+            for category, names in SERVICE_NAMES.items()
+            if category not in existing
+            for name in names
+        ]
+        for service in Service.objects.bulk_create(missing):
+            existing.setdefault(service.category, []).append(service.id)
+        self.stdout.write(f"Services: {len(missing)} created, {sum(map(len, existing.values()))} total")
+        return existing
+
+    def _create_users(self, kind, count, is_fundi):
+        label = "fundi users" if is_fundi else "customers"
+        ids = []
+        for start in range(0, count, self.batch_size):
+            batch = []
+            for n in range(start, min(start + self.batch_size, count)):
+                username = f"{self.prefix}_{kind}{n}"
+                batch.append(User(
+                    username=username,
+                    email=f"{username}@example.com",
+                    first_name=self.rng.choice(FIRST_NAMES),
+                    last_name=self.rng.choice(LAST_NAMES),
+                    phone_number=f"2547{self.rng.randrange(10**8):08d}",
+                    address=f"{self.rng.choice(AREAS)}, Nairobi",
+                    is_fundi=is_fundi,
+                    password=self.password_hash,
+                    date_joined=self._random_moment(),
+                ))
+            with transaction.atomic():
+                ids.extend(user.id for user in User.objects.bulk_create(batch))
+            self.stdout.write(f"  {label}: {len(ids)}/{count}")
+        return ids
+
+    def _create_fundis(self, user_ids):
+        """Create fundi profiles; returns (id, category, hourly_rate, quality) tuples."""
+        categories = list(CATEGORY_WEIGHTS)
+        category_cum = list(accumulate(CATEGORY_WEIGHTS.values()))
+        fundis = []
+        for start in range(0, len(user_ids), self.batch_size):
+            batch = []
+            for user_id in user_ids[start:start + self.batch_size]:
+                experience = min(int(self.rng.expovariate(1 / 6)), 40)
+                rate = Decimal(self.rng.randrange(300, 1500, 50) + experience * 25)
+                fundi = Fundi(
+                    user_id=user_id,
+                    category=self.rng.choices(categories, cum_weights=category_cum)[0],
+                    experience_years=experience,
+                    hourly_rate=rate,
+                    bio=f"{experience} years of experience around {self.rng.choice(AREAS)}.",
+                    is_available=self.rng.random() < 0.85,
+                    created_at=self._random_moment(),
+                )
+                fundi.updated_at = fundi.created_at
+                batch.append(fundi)
+            with transaction.atomic():
+                created = Fundi.objects.bulk_create(batch)
+            for fundi in created:
+                # A per-fundi "quality" keeps each fundi's ratings consistent.
+                quality = min(5.0, max(1.5, self.rng.gauss(4.1, 0.6)))
+                fundis.append((fundi.id, fundi.category, fundi.hourly_rate, quality))
+        self.stdout.write(f"  fundi profiles: {len(fundis)}")
+        return fundis
+
+    def _create_bookings(self, count, customer_ids, fundis, services, review_rate, payment_rate):
+        # Zipf-like popularity: a few fundis get most of the work, like real marketplaces.
+        order = list(range(len(fundis)))
+        self.rng.shuffle(order)
+        fundi_cum = list(accumulate(1 / (rank + 1) ** 0.9 for rank in range(len(fundis))))
+        customer_cum = list(accumulate(1 / (rank + 1) ** 0.6 for rank in range(len(customer_ids))))
+        statuses = list(BOOKING_STATUS_WEIGHTS)
+        status_cum = list(accumulate(BOOKING_STATUS_WEIGHTS.values()))
+        rng = self.rng
+
+        made = reviews_made = payments_made = 0
+        while made < count:
+            size = min(self.batch_size, count - made)
+            picked_fundis = rng.choices(order, cum_weights=fundi_cum, k=size)
+            picked_customers = rng.choices(customer_ids, cum_weights=customer_cum, k=size)
+            picked_statuses = rng.choices(statuses, cum_weights=status_cum, k=size)
+
+            bookings = []
+            meta = []
+            for fundi_index, customer_id, status in zip(picked_fundis, picked_customers, picked_statuses):
+                fundi_id, category, rate, quality = fundis[fundi_index]
+                created_at = self._random_moment()
+                hours = min(1 + int(rng.expovariate(1 / 2.5)), 12)
+                booking_date = created_at + timedelta(days=rng.randrange(0, 15), hours=rng.randrange(7, 18))
+                bookings.append(Booking(
+                    customer_id=customer_id,
+                    fundi_id=fundi_id,
+                    service_id=rng.choice(services.get(category) or services["other"]),
+                    description="Synthetic booking for load testing.",
+                    address=f"{rng.choice(AREAS)}, Nairobi",
+                    booking_date=booking_date,
+                    estimated_hours=hours,
+                    end_date=booking_date + timedelta(hours=hours),
+                    status=status,
+                    created_at=created_at,
+                    updated_at=max(created_at, min(booking_date, self.until)),
+                ))
+                meta.append((rate * hours, quality))
+
+            reviews = []
+            payments = []
+            with transaction.atomic():
+                Booking.objects.bulk_create(bookings)
+                for booking, (amount, quality) in zip(bookings, meta):
+                    payment = self._payment_for(booking, amount, payment_rate)
+                    if payment:
+                        payments.append(payment)
+                    if booking.status == "completed" and rng.random() < review_rate:
+                        rating = min(5, max(1, round(rng.gauss(quality, 0.8))))
+                        reviews.append(Review(
+                            booking_id=booking.id,
+                            rating=rating,
+                            comment="" if rng.random() < 0.4 else "Good work, arrived on time.",
+                            created_at=booking.updated_at,
+                        ))
+                Payment.objects.bulk_create(payments)
+                Review.objects.bulk_create(reviews)
+
+            made += size
+            payments_made += len(payments)
+            reviews_made += len(reviews)
+            self.stdout.write(
+                f"  bookings: {made}/{count} (payments {payments_made}, reviews {reviews_made})"
+            )
+
+    def _payment_for(self, booking, amount, payment_rate):
+        """Payment matching the booking's status, or None (not every booking is paid)."""
+        rng = self.rng
+        method = "mpesa" if rng.random() < 0.7 else "cash"
+        if booking.status == "completed":
+            if rng.random() >= payment_rate:
+                return None
+            status = "completed"
+        elif booking.status == "cancelled":
+            roll = rng.random()
+            if roll < 0.6:
+                return None
+            status = "refunded" if roll < 0.8 else "failed"
+        elif rng.random() < 0.25:
+            status = "pending" if method == "mpesa" else "completed"
+        else:
+            return None
+
+        payment = Payment(
+            booking_id=booking.id,
+            amount=amount,
+            status=status,
+            payment_method=method,
+            created_at=booking.updated_at,
+            completed_at=booking.updated_at if status == "completed" else None,
+            updated_at=booking.updated_at,
+        )
+        if method == "mpesa":
+            ref = f"ws_CO_{booking.id:012d}"
+            payment.merchant_request_id = f"{booking.id}-{rng.randrange(10**6)}"
+            payment.checkout_request_id = ref
+            payment.transaction_id = f"FAKE{booking.id:010d}" if status == "completed" else ref
+        return payment
@@ -0,0 +1,81 @@
+"""
+Make profile picture thumbnails (services/thumbnails.py) for fundis that lack current ones.
+
+Usage (from project root, with venv active):
+  python manage.py make_thumbnails                # every picture without current thumbnails, then exit
+  python manage.py make_thumbnails --workers 4    # the same, spread over 4 processes
+  python manage.py make_thumbnails --all          # remake them all, e.g. after changing THUMBNAIL_WIDTHS
+  python manage.py make_thumbnails --watch 10     # keep going, picking up new uploads every 10 seconds
+
+New uploads get thumbnails from a thread in the web process unless DJANGO_THUMBNAILS_IN_THREAD=False;
+then run this with --watch alongside the web server. Decoding and encoding images is CPU
+bound, so --workers uses separate processes; each fundi is independent.
+"""
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+from services.models import Fundi
+from services.thumbnails import available_formats, make_thumbnails, pending_fundis
+
+
+def _make(fundi_id, reuse=True):
+    try:
+        return fundi_id, make_thumbnails(fundi_id, reuse=reuse), None
+    except Exception as error:
+        return fundi_id, False, str(error)
+
+
+def _close_connections():
+    # Forked workers must not share the parent's database connections.
+    connections.close_all()
+
+
+class Command(BaseCommand):
+    help = "Make WebP/AVIF/JPEG thumbnails of fundi profile pictures."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=1, help="Processes to use (default: 1)")
+        parser.add_argument("--all", action="store_true", help="Remake thumbnails for every picture")
+        parser.add_argument("--watch", type=float, metavar="SECONDS", help="Keep running, checking this often")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Formats: {', '.join(available_formats())}")
+        remake_all = options["all"]
+        while True:
+            close_old_connections()
+            if remake_all:
+                fundis = Fundi.objects.exclude(profile_picture="").exclude(profile_picture=None)
+            else:
+                fundis = pending_fundis()
+            ids = list(fundis.order_by("pk").values_list("pk", flat=True))
+            if ids:
+                # Remaking must not copy the old thumbnails of another fundi with the same picture.
+                self._run(ids, options["workers"], reuse=not remake_all)
+            remake_all = False
+            if not options["watch"]:
+                return
+            time.sleep(options["watch"])
+
+    def _run(self, ids, workers, reuse):
+        started = time.perf_counter()
+        made = failed = 0
+        if workers > 1:
+            _close_connections()
+            with ProcessPoolExecutor(max_workers=workers, initializer=_close_connections) as pool:
+                results = list(pool.map(_make, ids, repeat(reuse), chunksize=8))
+        else:
+            results = [_make(fundi_id, reuse) for fundi_id in ids]
+        for fundi_id, done, error in results:
+            if error:
+                failed += 1
+                self.stdout.write(self.style.ERROR(f"Fundi #{fundi_id}: {error}"))
+            elif done:
+                made += 1
+        self.stdout.write(self.style.SUCCESS(
+            f"Made thumbnails for {made} of {len(ids)} fundis in {time.perf_counter() - started:.1f}s"
+            + (f" ({failed} failed)" if failed else "")
+        ))
@@ -0,0 +1,66 @@
+"""
+Delete profile pictures (and their thumbnails) that no fundi uses any more.
+
+Usage (from project root, with venv active):
+  python manage.py media_gc --dry-run
+  python manage.py media_gc                    # pictures unused for 24 hours
+  python manage.py media_gc --grace-hours 1
+  python manage.py media_gc --adopt            # first move older uploads to content-addressed names
+  python manage.py media_gc --scan             # also delete files in the media folders nothing refers to
+
+Pictures are stored once per distinct image (ContentAddressedStorage), with a count of
+the fundis using each (services/media_files.py). Each run first recounts from the Fundi
+table, so counts that drifted (bulk updates, import_data) are corrected before anything
+is deleted. Safe to run from cron, e.g. daily.
+
+Run with --adopt once after upgrading, and before zipping media/ for MEDIA_ZIP_URL
+(build.sh), so duplicate uploads are shipped once.
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, Sum
+
+from services.media_files import adopt_legacy_files, collect_garbage, picture_storage, recount, stray_files
+from services.models import MediaFile
+
+
+class Command(BaseCommand):
+    help = "Delete profile pictures and thumbnails no fundi uses, after a grace period."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--grace-hours", type=float, default=24, help="Keep unused pictures this long (default: 24)")
+        parser.add_argument("--adopt", action="store_true", help="Move older uploads to content-addressed names first")
+        parser.add_argument("--scan", action="store_true", help="Also delete unreferenced files found in the media folders")
+        parser.add_argument("--dry-run", action="store_true", help="Only report what would be deleted")
+
+    def handle(self, *args, **options):
+        if options["grace_hours"] < 0:
+            raise CommandError("--grace-hours cannot be negative.")
+        grace = timedelta(hours=options["grace_hours"])
+        dry_run = options["dry_run"]
+        verb = "Would free" if dry_run else "Freed"
+
+        if options["adopt"]:
+            moved = adopt_legacy_files(dry_run=dry_run)
+            self.stdout.write(f"{'Would move' if dry_run else 'Moved'} {moved} pictures to content-addressed names")
+
+        if not dry_run:
+            self.stdout.write(f"Recounted: {recount()} counts corrected")
+        files, freed = collect_garbage(grace, dry_run=dry_run)
+        self.stdout.write(f"{verb} {files} unused pictures ({freed / 1e6:.1f} MB)")
+
+        if options["scan"]:
+            storage = picture_storage()
+            count = size = 0
+            for name, file_size in stray_files(grace):
+                if not dry_run:
+                    storage.delete(name)
+                count += 1
+                size += file_size
+            self.stdout.write(f"{verb} {count} stray files ({size / 1e6:.1f} MB)")
+
+        stored = MediaFile.objects.aggregate(files=Count("pk"), size=Sum("size"))
+        self.stdout.write(self.style.SUCCESS(
+            f"Profile pictures stored: {stored['files']} files, {(stored['size'] or 0) / 1e6:.1f} MB"
+        ))
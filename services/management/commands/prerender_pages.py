@@ -0,0 +1,97 @@
+"""
+Pre-render public fundi profiles and category pages (services/prerender.py) to PRERENDER_ROOT.
+
+Usage (from project root, with venv active):
+  python manage.py prerender_pages --all              # every page; after deploys and bulk imports
+  python manage.py prerender_pages --all --workers 4  # the same, spread over 4 processes
+  python manage.py prerender_pages                    # only pages marked stale, then exit
+  python manage.py prerender_pages --watch 5          # keep re-rendering stale pages every 5 seconds
+
+Pages are served only with DJANGO_PRERENDER_PAGES=True. Changes mark their pages stale and the
+web process re-renders them in a thread unless DJANGO_PRERENDER_IN_THREAD=False; then run this
+with --watch alongside the web server. Rendering is CPU bound (templates), so --workers uses
+separate processes; each page is independent.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+from services.prerender import all_paths, fundi_path, page_file, refresh, stale_paths
+
+
+def _refresh(path):
+    try:
+        return path, refresh(path), None
+    except Exception as error:
+        return path, False, str(error)
+
+
+def _close_connections():
+    # Forked workers must not share the parent's database connections.
+    connections.close_all()
+
+
+class Command(BaseCommand):
+    help = "Pre-render public fundi profiles and category pages to PRERENDER_ROOT."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", help="Render every page, not only stale ones")
+        parser.add_argument("--workers", type=int, default=1, help="Processes to use (default: 1)")
+        parser.add_argument("--watch", type=float, metavar="SECONDS", help="Keep running, checking this often")
+
+    def handle(self, *args, **options):
+        if not settings.PRERENDER_PAGES:
+            self.stdout.write(self.style.WARNING("DJANGO_PRERENDER_PAGES is off: pages are written but not served."))
+        if options["all"]:
+            paths = all_paths()
+            self._run(paths, options["workers"])
+            self._prune(paths)
+        while True:
+            close_old_connections()
+            paths = stale_paths()
+            if paths:
+                self._run(paths, options["workers"])
+            if not options["watch"]:
+                return
+            time.sleep(options["watch"])
+
+    def _run(self, paths, workers):
+        started = time.perf_counter()
+        written = failed = 0
+        if workers > 1:
+            _close_connections()
+            with ProcessPoolExecutor(max_workers=workers, initializer=_close_connections) as pool:
+                results = pool.map(_refresh, paths, chunksize=64)
+                for path, done, error in results:
+                    written, failed = self._count(path, done, error, written, failed)
+        else:
+            for path in paths:
+                written, failed = self._count(*_refresh(path), written, failed)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Rendered {written} of {len(paths)} pages in {elapsed:.1f}s ({len(paths) / max(elapsed, 1e-9):.0f}/s)"
+            + (f" ({failed} failed)" if failed else "")
+        ))
+
+    def _count(self, path, done, error, written, failed):
+        if error:
+            self.stdout.write(self.style.ERROR(f"{path}: {error}"))
+            return written, failed + 1
+        return written + done, failed
+
+    def _prune(self, paths):
+        # Profiles of fundis deleted without signals (bulk deletes, restores).
+        folder = page_file(fundi_path(1)).parent
+        keep = {page_file(path).name for path in paths}
+        removed = 0
+        for name in os.listdir(folder) if folder.is_dir() else ():
+            if name.endswith((".html", ".html.gz")) and name.removesuffix(".gz") not in keep:
+                os.remove(Path(folder, name))
+                removed += 1
+        if removed:
+            self.stdout.write(f"Removed {removed} files of fundis that no longer exist")
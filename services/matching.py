@@ -0,0 +1,236 @@
+"""
+Ranking fundis for a job: category, time window, budget and (optionally) area.
+
+Scoring reads a per-process MatchIndex instead of the database. For each category it
+holds one compact array per feature (hourly rate, smoothed rating, experience, area,
+working days, availability), so ranking a few thousand candidates is a plain loop over numbers. Only
+the top of the ranking goes to the database, a chunk at a time, to drop fundis who are
+booked, off or outside their working hours (services.availability).
+
+The index is built on first use. Saving a Fundi, Review or working hours marks that fundi dirty, and
+the next match in the same process reloads just those rows. Every
+MATCHING_INDEX_MAX_AGE seconds the whole index is rebuilt, which is how other worker
+processes pick up changes. A stale row can only misplace a fundi in the ranking: the
+availability check always reads the database.
+"""
+import threading
+import time
+from array import array
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .availability import DEFAULT_WORKING_HOURS, available_fundi_ids
+from .models import Booking, Fundi, FundiWorkingHours, Review
+from .versions import in_bulk_change
+
+WEIGHTS = {'rating': 0.5, 'price': 0.3, 'experience': 0.2}
+LOCATION_BONUS = 0.15
+
+# Ratings are pulled towards PRIOR_RATING as if every fundi had PRIOR_REVIEWS more reviews,
+# so a single five-star review does not outrank fifty four-star ones.
+PRIOR_RATING = 3.5
+PRIOR_REVIEWS = 5
+EXPERIENCE_CAP = 20  # years; more does not score higher
+
+DEFAULT_DAYS = sum(1 << weekday for weekday in DEFAULT_WORKING_HOURS)
+
+# Ranked candidates are checked against bookings and time off in chunks, starting with
+# this many and doubling, so a job few fundis can take costs a handful of queries.
+CHECK_CHUNK = 25
+
+
+def area_of(address):
+    """'Kilimani, Nairobi' -> 'kilimani'"""
+    return (address or '').split(',')[0].strip().lower()
+
+
+class CategoryIndex:
+    """Column arrays for one category; a fundi is the same position in each."""
+
+    def __init__(self):
+        self.ids = array('q')
+        self.rates = array('d')
+        self.scores = array('d')  # rating and experience part of the score, 0-0.7
+        self.ratings = array('d')  # plain average, for display
+        self.reviews = array('l')
+        self.areas = array('l')
+        self.days = bytearray()  # bit n set: works on weekday n
+        self.available = bytearray()
+
+
+class MatchIndex:
+    def __init__(self):
+        self.categories = {}
+        self.positions = {}  # fundi id -> (category, position)
+        self.area_codes = {}
+        self.built_at = time.monotonic()
+
+    @classmethod
+    def build(cls):
+        index = cls()
+        index.load(Fundi.objects.all())
+        return index
+
+    def load(self, fundis):
+        days = {}
+        for fundi_id, weekday in FundiWorkingHours.objects.filter(fundi__in=fundis).values_list('fundi_id', 'weekday'):
+            days[fundi_id] = days.get(fundi_id, 0) | 1 << weekday
+        rows = fundis.with_lifetime_stats().values_list(
+            'id', 'category', 'hourly_rate', 'experience_years', 'is_available',
+            'user__address', 'review_count', 'avg_rating',
+        )
+        for row in rows.iterator(chunk_size=2000):
+            self.put(*row, days=days.get(row[0], DEFAULT_DAYS))
+
+    def refresh(self, fundi_ids):
+        """Reload the given fundis; deleted ones are marked unavailable."""
+        fundi_ids = set(fundi_ids)
+        self.load(Fundi.objects.filter(pk__in=fundi_ids))
+        for fundi_id in fundi_ids - set(Fundi.objects.filter(pk__in=fundi_ids).values_list('pk', flat=True)):
+            self.drop(fundi_id)
+
+    def drop(self, fundi_id):
+        if fundi_id in self.positions:
+            category, position = self.positions[fundi_id]
+            self.categories[category].available[position] = 0
+
+    def put(self, fundi_id, category, rate, experience, is_available, address, reviews, avg_rating, days=DEFAULT_DAYS):
+        area = area_of(address)
+        area_code = self.area_codes.setdefault(area, len(self.area_codes)) if area else -1
+        smoothed = (PRIOR_RATING * PRIOR_REVIEWS + (avg_rating or 0) * reviews) / (PRIOR_REVIEWS + reviews)
+        static_score = (
+            WEIGHTS['rating'] * smoothed / 5
+            + WEIGHTS['experience'] * min(experience, EXPERIENCE_CAP) / EXPERIENCE_CAP
+        )
+        values = (fundi_id, float(rate), static_score, avg_rating or 0.0, reviews, area_code, days, int(is_available))
+
+        where = self.positions.get(fundi_id)
+        if where is not None and where[0] != category:
+            self.drop(fundi_id)  # changed category: the old row stays, unavailable
+            where = None
+        if where is None:
+            columns = self.categories.setdefault(category, CategoryIndex())
+            self.positions[fundi_id] = (category, len(columns.ids))
+            for column, value in zip(self._columns(columns), values):
+                column.append(value)
+        else:
+            columns = self.categories[category]
+            for column, value in zip(self._columns(columns), values):
+                column[where[1]] = value
+
+    @staticmethod
+    def _columns(columns):
+        return (
+            columns.ids, columns.rates, columns.scores, columns.ratings, columns.reviews,
+            columns.areas, columns.days, columns.available,
+        )
+
+    def rank(self, category, max_rate=None, location=None, weekday=None):
+        """All available fundis in the category as (score, position), best first.
+
+        With weekday (0 = Monday), only fundis with working hours that day.
+        """
+        columns = self.categories.get(category)
+        if columns is None or not columns.ids:
+            return columns, []
+        area_code = self.area_codes.get(area_of(location), -2) if location else -2
+        max_rate = float('inf') if max_rate is None else float(max_rate)
+        # Price scores 0 for the dearest fundi in the category and up to WEIGHTS['price'] for free.
+        price_per_shilling = WEIGHTS['price'] / (max(columns.rates) or 1.0)
+        price_weight = WEIGHTS['price']
+        day_bit = 0x7f if weekday is None else 1 << weekday
+
+        scored = []
+        for position, (available, days, rate, score, area) in enumerate(
+            zip(columns.available, columns.days, columns.rates, columns.scores, columns.areas)
+        ):
+            if not available or not days & day_bit or rate > max_rate:
+                continue
+            score += price_weight - price_per_shilling * rate
+            if area == area_code:
+                score += LOCATION_BONUS
+            scored.append((score, position))
+        scored.sort(reverse=True)
+        return columns, scored
+
+
+_index = None
+_dirty = set()
+_lock = threading.Lock()
+
+
+def get_index():
+    """This process's index, rebuilt when older than MATCHING_INDEX_MAX_AGE."""
+    global _index
+    with _lock:
+        # Signal handlers add to _dirty without the lock, so take only what was seen.
+        dirty = set(_dirty)
+        _dirty.difference_update(dirty)
+        if _index is None or time.monotonic() - _index.built_at > settings.MATCHING_INDEX_MAX_AGE:
+            _index = MatchIndex.build()
+        elif dirty:
+            _index.refresh(dirty)
+        return _index
+
+
+def match_fundis(category, start=None, hours=1, budget=None, location=None, limit=10):
+    """Best fundis for a job, as a list of dicts (fundi_id, score, rating, reviews), best first.
+
+    budget is the most the customer will pay for the whole job (hourly_rate * hours).
+    With start, only fundis free from start to start + hours are returned.
+    """
+    index = get_index()
+    max_rate = float(budget) / hours if budget is not None else None
+    end = start + timedelta(hours=hours) if start is not None else None
+    weekday = timezone.localtime(start).weekday() if start is not None else None
+    columns, ranked = index.rank(category, max_rate, location, weekday)
+
+    shortlist = []
+    offset, chunk_size = 0, CHECK_CHUNK
+    while offset < len(ranked):
+        chunk = [(columns.ids[position], score, position) for score, position in ranked[offset:offset + chunk_size]]
+        offset += chunk_size
+        chunk_size *= 2
+        free = available_fundi_ids([fundi_id for fundi_id, _, _ in chunk], start, end)
+        for fundi_id, score, position in chunk:
+            if fundi_id in free:
+                shortlist.append({
+                    'fundi_id': fundi_id,
+                    'score': round(score, 4),
+                    'rating': round(columns.ratings[position], 2),
+                    'reviews': columns.reviews[position],
+                })
+                if len(shortlist) >= limit:
+                    return shortlist
+    return shortlist
+
+
+def fundis_changed(fundi_ids):
+    """Reload these fundis into the index when it is next used."""
+    _dirty.update(fundi_ids)
+
+
+@receiver(post_save, sender=Fundi)
+@receiver(post_delete, sender=Fundi)
+def _fundi_changed(sender, instance, **kwargs):
+    _dirty.add(instance.pk)
+
+
+@receiver(post_save, sender=FundiWorkingHours)
+@receiver(post_delete, sender=FundiWorkingHours)
+def _working_hours_changed(sender, instance, **kwargs):
+    _dirty.add(instance.fundi_id)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def _review_changed(sender, instance, **kwargs):
+    if in_bulk_change():
+        return  # the caller passes the fundis to fundis_changed()
+    fundi_id = Booking.objects.filter(pk=instance.booking_id).values_list('fundi_id', flat=True).first()
+    if fundi_id is not None:
+        _dirty.add(fundi_id)
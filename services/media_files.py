@@ -0,0 +1,186 @@
+"""
+Reference counts for content-addressed profile pictures, and collecting unused ones.
+
+ContentAddressedStorage stores identical uploads once, so a fundi replacing their
+picture cannot simply delete the old file: another fundi may use it. Instead each
+stored picture has a MediaFile row counting the fundis that use it. Saving or deleting
+a Fundi moves the counts, and `manage.py media_gc` deletes pictures (and their
+thumbnails) whose count has been zero for GRACE. The counts are a shortcut: media_gc
+recounts from the Fundi table first and checks it again before deleting, so bulk
+updates and imports, which skip signals, cannot lose a file in use.
+"""
+import os
+from datetime import timedelta
+from pathlib import PurePosixPath
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, F, Value, When
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Fundi, MediaFile
+from .thumbnails import FORMATS, THUMBNAIL_DIR, THUMBNAIL_WIDTHS, delete_thumbnails, thumbnail_name
+from .versions import profiles_changed
+
+# An unused picture is kept this long, in case an upload of the same image is in flight.
+GRACE = timedelta(hours=24)
+
+ALL_THUMBNAILS = {'widths': THUMBNAIL_WIDTHS, 'formats': list(FORMATS)}
+
+
+def picture_storage():
+    return Fundi._meta.get_field('profile_picture').storage
+
+
+def upload_dir():
+    return Fundi._meta.get_field('profile_picture').upload_to.rstrip('/')
+
+
+def _size(name):
+    try:
+        return picture_storage().size(name)
+    except OSError:
+        return 0
+
+
+def _pictures_in_use():
+    return Fundi.objects.exclude(profile_picture='').exclude(profile_picture=None)
+
+
+def add_ref(name):
+    if MediaFile.objects.filter(name=name).update(refs=F('refs') + 1, updated_at=timezone.now()):
+        return
+    try:
+        with transaction.atomic():
+            MediaFile.objects.create(name=name, refs=1, size=_size(name))
+    except IntegrityError:  # created by a concurrent upload of the same image
+        MediaFile.objects.filter(name=name).update(refs=F('refs') + 1, updated_at=timezone.now())
+
+
+def release(name):
+    MediaFile.objects.filter(name=name, refs__gt=0).update(refs=F('refs') - 1, updated_at=timezone.now())
+
+
+def recount():
+    """Set every MediaFile's count from the Fundi table, adding rows for pictures without one
+    (and filling in sizes the migration left at 0). Returns how many rows changed.
+    """
+    now = timezone.now()
+    counts = dict(_pictures_in_use().order_by().values_list('profile_picture').annotate(n=Count('pk')))
+    changed = []
+    for media in MediaFile.objects.only('pk', 'name', 'refs', 'size', 'updated_at').iterator(chunk_size=2000):
+        refs = counts.pop(media.name, 0)
+        if media.refs != refs or not media.size:
+            if media.refs != refs:
+                media.refs, media.updated_at = refs, now
+            media.size = media.size or _size(media.name)
+            changed.append(media)
+    MediaFile.objects.bulk_update(changed, ['refs', 'size', 'updated_at'], batch_size=500)
+    MediaFile.objects.bulk_create(
+        [MediaFile(name=name, refs=refs, size=_size(name)) for name, refs in counts.items()],
+        batch_size=500, ignore_conflicts=True,
+    )
+    return len(changed) + len(counts)
+
+
+def collect_garbage(grace=GRACE, dry_run=False):
+    """Delete pictures no fundi has used for `grace`, with their thumbnails. Returns (files, bytes)."""
+    storage = picture_storage()
+    files = freed = 0
+    for media in MediaFile.objects.filter(refs=0, updated_at__lt=timezone.now() - grace):
+        if Fundi.objects.filter(profile_picture=media.name).exists():
+            continue  # miscounted; the next recount fixes it
+        if not dry_run:
+            # Conditional, so a picture that just gained a fundi again is kept.
+            if not MediaFile.objects.filter(pk=media.pk, refs=0).delete()[0]:
+                continue
+            storage.delete(media.name)
+            delete_thumbnails(media.name, ALL_THUMBNAILS)
+        files += 1
+        freed += media.size
+    return files, freed
+
+
+def stray_files(grace=GRACE):
+    """Pictures and thumbnails nothing refers to, older than grace: uploads whose save failed
+    and files left from before reference counting. Yields (name, size)."""
+    storage = picture_storage()
+    in_use = set(_pictures_in_use().values_list('profile_picture', flat=True))
+    stems = {PurePosixPath(name).stem for name in in_use}
+    cutoff = timezone.now() - grace
+    for folder, is_used in (
+        (upload_dir(), lambda name: name in in_use),
+        (THUMBNAIL_DIR, lambda name: PurePosixPath(name).stem.rsplit('-', 1)[0] in stems),
+    ):
+        try:
+            _, filenames = storage.listdir(folder)
+        except FileNotFoundError:
+            continue
+        for filename in filenames:
+            name = f'{folder}/{filename}'
+            if not is_used(name) and storage.get_modified_time(name) < cutoff:
+                yield name, storage.size(name)
+
+
+def adopt_legacy_files(dry_run=False):
+    """Move pictures saved before content addressing to content-addressed names.
+
+    Duplicates end up as one file. Thumbnails move with their picture. Returns how many
+    pictures were moved.
+    """
+    storage = picture_storage()
+    moved = 0
+    for old in list(_pictures_in_use().order_by().values_list('profile_picture', flat=True).distinct()):
+        if storage.is_content_addressed(old) or not storage.exists(old):
+            continue
+        moved += 1
+        if dry_run:
+            continue
+        with storage.open(old) as f:
+            new = storage.save(old, f)  # writes nothing if the same image is already stored
+        for width in THUMBNAIL_WIDTHS:
+            for fmt in FORMATS:
+                source, target = thumbnail_name(old, width, fmt), thumbnail_name(new, width, fmt)
+                if storage.exists(source) and not storage.exists(target):
+                    os.replace(storage.path(source), storage.path(target))
+        fundis = Fundi.objects.filter(profile_picture=old)
+        profiles_changed(fundis.values_list('pk', flat=True), fundis.values_list('category', flat=True))
+        fundis.update(
+            profile_picture=new,
+            thumbnail_source=Case(When(thumbnail_source=old, then=Value(new)), default=F('thumbnail_source')),
+        )
+        storage.delete(old)
+        delete_thumbnails(old, ALL_THUMBNAILS)
+    return moved
+
+
+def _picture_name(instance):
+    # Read the raw attribute: a deferred profile_picture must not cost a query per instance.
+    value = instance.__dict__.get('profile_picture')
+    return getattr(value, 'name', value) or ''
+
+
+@receiver(post_init, sender=Fundi)
+def _remember_picture(sender, instance, **kwargs):
+    instance._stored_picture = _picture_name(instance)
+
+
+@receiver(post_save, sender=Fundi)
+def _picture_changed(sender, instance, created, **kwargs):
+    if 'profile_picture' not in instance.__dict__:
+        return
+    new = _picture_name(instance)
+    old = '' if created else instance._stored_picture
+    if new != old:
+        if new:
+            add_ref(new)
+        if old:
+            release(old)
+        instance._stored_picture = new
+
+
+@receiver(post_delete, sender=Fundi)
+def _fundi_deleted(sender, instance, **kwargs):
+    if instance._stored_picture:
+        release(instance._stored_picture)
@@ -0,0 +1,38 @@
+"""
+Custom migration operations.
+"""
+from django.db.migrations import AddIndex
+
+
+class AddIndexConcurrentlyIfPostgres(AddIndex):
+    """
+    AddIndex that builds the index with CREATE INDEX CONCURRENTLY on PostgreSQL, so large
+    tables stay writable while it runs, and with a plain CREATE INDEX everywhere else.
+    Migrations using it must set atomic = False.
+
+    If a concurrent build fails, PostgreSQL leaves an INVALID index behind: drop it and
+    run migrate again.
+    """
+
+    atomic = False
+
+    def describe(self):
+        return "Create index %s on field(s) %s of model %s (concurrently on PostgreSQL)" % (
+            self.index.name,
+            ", ".join(self.index.fields),
+            self.model_name,
+        )
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return super().database_forwards(app_label, schema_editor, from_state, to_state)
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.add_index(model, self.index, concurrently=True)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return super().database_backwards(app_label, schema_editor, from_state, to_state)
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.remove_index(model, self.index, concurrently=True)
@@ -0,0 +1,61 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:25
+
+from django.db import migrations, models
+
+from services.migration_operations import AddIndexConcurrentlyIfPostgres
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ('services', '0003_alter_payment_payment_method'),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyIfPostgres(
+            model_name='booking',
+            index=models.Index(fields=['fundi', 'status'], name='booking_fundi_status_idx'),
+        ),
+        AddIndexConcurrentlyIfPostgres(
+            model_name='booking',
+            index=models.Index(fields=['fundi', '-created_at'], name='booking_fundi_created_idx'),
+        ),
+        AddIndexConcurrentlyIfPostgres(
+            model_name='booking',
+            index=models.Index(fields=['customer', '-created_at'], name='booking_customer_created_idx'),
+        ),
+        AddIndexConcurrentlyIfPostgres(
+            model_name='booking',
+            index=models.Index(fields=['status', '-created_at'], name='booking_status_created_idx'),
+        ),
+        AddIndexConcurrentlyIfPostgres(
+            model_name='booking',
+            index=models.Index(fields=['-created_at'], name='booking_created_idx'),
+        ),
+        AddIndexConcurrentlyIfPostgres(
+            model_name='booking',
+            index=models.Index(fields=['booking_date'], name='booking_date_idx'),
+        ),
+        AddIndexConcurrentlyIfPostgres(
+            model_name='payment',
+            index=models.Index(fields=['status', '-created_at'], name='payment_status_created_idx'),
+        ),
+        AddIndexConcurrentlyIfPostgres(
+            model_name='payment',
+            index=models.Index(fields=['payment_method', '-created_at'], name='payment_method_created_idx'),
+        ),
+        AddIndexConcurrentlyIfPostgres(
+            model_name='payment',
+            index=models.Index(fields=['-created_at'], name='payment_created_idx'),
+        ),
+        AddIndexConcurrentlyIfPostgres(
+            model_name='payment',
+            index=models.Index(fields=['checkout_request_id'], name='payment_checkout_req_idx'),
+        ),
+        AddIndexConcurrentlyIfPostgres(
+            model_name='payment',
+            index=models.Index(fields=['merchant_request_id'], name='payment_merchant_req_idx'),
+        ),
+    ]
@@ -0,0 +1,91 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:33
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0004_booking_payment_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedBooking',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('description', models.TextField()),
+                ('address', models.TextField()),
+                ('booking_date', models.DateTimeField()),
+                ('estimated_hours', models.IntegerField(default=1)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('confirmed', 'Confirmed'), ('in_progress', 'In Progress'), ('completed', 'Completed'), ('cancelled', 'Cancelled')], max_length=20)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('customer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_customer_bookings', to=settings.AUTH_USER_MODEL)),
+                ('fundi', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_fundi_bookings', to='services.fundi')),
+                ('service', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='services.service')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CustomerArchiveStats',
+            fields=[
+                ('customer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='archive_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('bookings', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='FundiArchiveStats',
+            fields=[
+                ('fundi', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='archive_stats', serialize=False, to='services.fundi')),
+                ('bookings', models.PositiveIntegerField(default=0)),
+                ('completed_bookings', models.PositiveIntegerField(default=0)),
+                ('reviews', models.PositiveIntegerField(default=0)),
+                ('rating_sum', models.PositiveIntegerField(default=0)),
+                ('payments', models.PositiveIntegerField(default=0)),
+                ('completed_payments', models.PositiveIntegerField(default=0)),
+                ('failed_payments', models.PositiveIntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedReview',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('rating', models.IntegerField()),
+                ('comment', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField()),
+                ('booking', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='review', to='services.archivedbooking')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedPayment',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('completed', 'Completed'), ('failed', 'Failed'), ('refunded', 'Refunded')], max_length=20)),
+                ('payment_method', models.CharField(choices=[('mpesa', 'M-Pesa'), ('cash', 'Cash')], max_length=20)),
+                ('transaction_id', models.CharField(blank=True, max_length=200)),
+                ('merchant_request_id', models.CharField(blank=True, max_length=200)),
+                ('checkout_request_id', models.CharField(blank=True, max_length=200)),
+                ('created_at', models.DateTimeField()),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('booking', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='payment', to='services.archivedbooking')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='archivedbooking',
+            index=models.Index(fields=['customer', '-created_at'], name='archbooking_customer_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedbooking',
+            index=models.Index(fields=['fundi', '-created_at'], name='archbooking_fundi_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedbooking',
+            index=models.Index(fields=['archived_at'], name='archbooking_archived_idx'),
+        ),
+    ]
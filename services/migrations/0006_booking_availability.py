@@ -0,0 +1,86 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:43
+
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.db.models import F
+import django.db.models.deletion
+
+
+def fill_end_dates(apps, schema_editor):
+    # One UPDATE per distinct estimated_hours: portable date arithmetic, set-based on large tables.
+    for model_name in ('Booking', 'ArchivedBooking'):
+        model = apps.get_model('services', model_name)
+        for hours in model.objects.values_list('estimated_hours', flat=True).distinct().order_by():
+            model.objects.filter(estimated_hours=hours).update(end_date=F('booking_date') + timedelta(hours=hours))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0005_booking_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FundiTimeOff',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start', models.DateTimeField()),
+                ('end', models.DateTimeField()),
+                ('reason', models.CharField(blank=True, max_length=200)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Fundi time off',
+                'ordering': ['start'],
+            },
+        ),
+        migrations.CreateModel(
+            name='FundiWorkingHours',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weekday', models.PositiveSmallIntegerField(choices=[(0, 'Monday'), (1, 'Tuesday'), (2, 'Wednesday'), (3, 'Thursday'), (4, 'Friday'), (5, 'Saturday'), (6, 'Sunday')])),
+                ('start_time', models.TimeField()),
+                ('end_time', models.TimeField()),
+            ],
+            options={
+                'verbose_name_plural': 'Fundi working hours',
+                'ordering': ['weekday', 'start_time'],
+            },
+        ),
+        migrations.AddField(
+            model_name='archivedbooking',
+            name='end_date',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='booking',
+            name='end_date',
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.RunPython(fill_end_dates, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='booking',
+            name='end_date',
+            field=models.DateTimeField(editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['fundi', 'end_date'], name='booking_fundi_end_idx'),
+        ),
+        migrations.AddField(
+            model_name='fundiworkinghours',
+            name='fundi',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='working_hours', to='services.fundi'),
+        ),
+        migrations.AddField(
+            model_name='funditimeoff',
+            name='fundi',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='time_off', to='services.fundi'),
+        ),
+        migrations.AddIndex(
+            model_name='funditimeoff',
+            index=models.Index(fields=['fundi', 'end'], name='timeoff_fundi_end_idx'),
+        ),
+    ]
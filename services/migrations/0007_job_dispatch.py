@@ -0,0 +1,67 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:50
+
+from django.conf import settings
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0006_booking_availability'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobRequest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(choices=[('plumber', 'Plumber'), ('electrician', 'Electrician'), ('cleaner', 'Cleaner'), ('carpenter', 'Carpenter'), ('painter', 'Painter'), ('other', 'Other')], editable=False, max_length=50)),
+                ('description', models.TextField()),
+                ('address', models.TextField()),
+                ('booking_date', models.DateTimeField()),
+                ('estimated_hours', models.IntegerField(default=1, validators=[django.core.validators.MinValueValidator(1)])),
+                ('budget', models.DecimalField(blank=True, decimal_places=2, help_text='Most you want to pay for the whole job (optional)', max_digits=10, null=True, validators=[django.core.validators.MinValueValidator(0)])),
+                ('status', models.CharField(choices=[('open', 'Finding a fundi'), ('assigned', 'Assigned'), ('expired', 'No fundi found'), ('cancelled', 'Cancelled')], default='open', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('assigned_at', models.DateTimeField(blank=True, null=True)),
+                ('booking', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='job_request', to='services.booking')),
+                ('customer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_requests', to=settings.AUTH_USER_MODEL)),
+                ('service', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='services.service')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='JobOffer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('offered', 'Offered'), ('accepted', 'Accepted'), ('declined', 'Declined'), ('expired', 'Expired'), ('withdrawn', 'Withdrawn')], default='offered', max_length=20)),
+                ('score', models.FloatField(default=0)),
+                ('offered_at', models.DateTimeField(auto_now_add=True)),
+                ('expires_at', models.DateTimeField()),
+                ('responded_at', models.DateTimeField(blank=True, null=True)),
+                ('fundi', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_offers', to='services.fundi')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='offers', to='services.jobrequest')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='jobrequest',
+            index=models.Index(fields=['status', 'created_at'], name='job_queue_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobrequest',
+            index=models.Index(fields=['customer', '-created_at'], name='job_customer_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='joboffer',
+            index=models.Index(fields=['fundi', 'status', 'expires_at'], name='joboffer_fundi_live_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='joboffer',
+            index=models.Index(fields=['status', 'expires_at'], name='joboffer_expiry_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='joboffer',
+            constraint=models.UniqueConstraint(fields=('job', 'fundi'), name='joboffer_job_fundi_unique'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0007_job_dispatch'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fundi',
+            name='thumbnail_source',
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='fundi',
+            name='thumbnails',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
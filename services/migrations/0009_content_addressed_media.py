@@ -0,0 +1,46 @@
+# Generated by Django 4.2.7 on 2026-10-19 16:04
+
+from django.db import migrations, models
+from django.db.models import Count
+import django.utils.timezone
+import fundi_platform.media
+
+
+def count_pictures(apps, schema_editor):
+    # Start the reference counts from the pictures already in use (sizes are filled by media_gc).
+    Fundi = apps.get_model('services', 'Fundi')
+    MediaFile = apps.get_model('services', 'MediaFile')
+    counts = (
+        Fundi.objects.exclude(profile_picture='').exclude(profile_picture=None)
+        .order_by().values_list('profile_picture').annotate(n=Count('pk'))
+    )
+    MediaFile.objects.bulk_create([MediaFile(name=name, refs=refs) for name, refs in counts], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0008_fundi_thumbnails'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='fundi',
+            name='profile_picture',
+            field=models.ImageField(blank=True, null=True, storage=fundi_platform.media.ContentAddressedStorage(), upload_to='fundi_profiles/'),
+        ),
+        migrations.CreateModel(
+            name='MediaFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('size', models.PositiveBigIntegerField(default=0)),
+                ('refs', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['refs', 'updated_at'], name='mediafile_orphan_idx')],
+            },
+        ),
+        migrations.RunPython(count_pictures, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-19 16:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0009_content_addressed_media'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fundi',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='payment',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0010_version_stamps'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='joboffer',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='jobrequest',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -1,7 +1,15 @@
+from datetime import timedelta
+
 from django.db import models
+from django.db.models import Count, F, Sum
 from django.contrib.auth.models import AbstractUser
+from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.db.models.functions import Cast, Coalesce, NullIf
 from django.utils import timezone
+from django.utils.functional import cached_property
+
+from fundi_platform.media import ContentAddressedStorage
 
 
 class User(AbstractUser):
@@ -12,6 +20,20 @@ class User(AbstractUser):
     def __str__(self):
         return self.username
 
+    @cached_property
+    def fundi_profile_id(self):
+        """pk of the user's Fundi profile, or None. services.user_cache fills it in without a query."""
+        if self.pk is None:
+            return None
+        return Fundi.objects.filter(user=self).values_list('pk', flat=True).first()
+
+    def get_session_auth_hash(self):
+        # services.user_cache loads users without the password hash and sets
+        # cached_session_auth_hash instead; once the password is loaded or set, use that.
+        if 'password' not in self.__dict__ and 'cached_session_auth_hash' in self.__dict__:
+            return self.cached_session_auth_hash
+        return super().get_session_auth_hash()
+
 
 class Service(models.Model):
     CATEGORY_CHOICES = [
@@ -31,26 +53,64 @@ class Service(models.Model):
         return self.name
 
 
+class FundiQuerySet(models.QuerySet):
+    def with_lifetime_stats(self):
+        """Annotate avg_rating, review_count and total_bookings, archived bookings included."""
+        review_count = Count('fundi_bookings__review') + Coalesce(F('archive_stats__reviews'), 0)
+        rating_sum = Coalesce(Sum('fundi_bookings__review__rating'), 0) + Coalesce(F('archive_stats__rating_sum'), 0)
+        return self.annotate(
+            review_count=review_count,
+            avg_rating=Cast(rating_sum, models.FloatField()) / NullIf(review_count, 0),
+            total_bookings=Count('fundi_bookings') + Coalesce(F('archive_stats__bookings'), 0),
+        )
+
+
 class Fundi(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='fundi_profile')
     category = models.CharField(max_length=50, choices=Service.CATEGORY_CHOICES)
     experience_years = models.IntegerField(default=0)
     hourly_rate = models.DecimalField(max_digits=10, decimal_places=2, validators=[MinValueValidator(0)])
     bio = models.TextField(blank=True)
-    profile_picture = models.ImageField(upload_to='fundi_profiles/', blank=True, null=True)
+    # Named by content, so fundis uploading the same image share one file (see MediaFile).
+    profile_picture = models.ImageField(upload_to='fundi_profiles/', storage=ContentAddressedStorage(), blank=True, null=True)
+    # The profile_picture the thumbnails were made from, and what was made ({'formats': [...], 'widths': [...]},
+    # empty if the picture could not be read). See services/thumbnails.py.
+    thumbnail_source = models.CharField(max_length=100, blank=True, editable=False)
+    thumbnails = models.JSONField(default=dict, blank=True, editable=False)
     is_available = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Moves whenever anything on the public profile changes, bookings and reviews included
+    # (services/versions.py), so it validates cached copies of the page.
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    objects = FundiQuerySet.as_manager()
+    
+    @property
+    def picture(self):
+        """Thumbnail srcsets for profile_picture, or None until they are made"""
+        from .thumbnails import picture_sources
+        return picture_sources(self)
     
     @property
+    def archived_stats(self):
+        try:
+            return self.archive_stats
+        except FundiArchiveStats.DoesNotExist:
+            return FundiArchiveStats(fundi=self)
+    
+    # Cached per instance: a profile page shows it several times.
+    @cached_property
     def average_rating(self):
-        reviews = Review.objects.filter(booking__fundi=self)
-        if reviews.exists():
-            return round(reviews.aggregate(models.Avg('rating'))['rating__avg'], 2)
+        stats = Review.objects.filter(booking__fundi=self).aggregate(total=Sum('rating'), count=Count('id'))
+        archived = self.archived_stats
+        count = stats['count'] + archived.reviews
+        if count:
+            return round(((stats['total'] or 0) + archived.rating_sum) / count, 2)
         return 0.0
     
-    @property
+    @cached_property
     def total_reviews(self):
-        return Review.objects.filter(booking__fundi=self).count()
+        return Review.objects.filter(booking__fundi=self).count() + self.archived_stats.reviews
     
     def __str__(self):
         return f"{self.user.username} - {self.get_category_display()}"
@@ -72,18 +132,184 @@ class Booking(models.Model):
     address = models.TextField()
     booking_date = models.DateTimeField()
     estimated_hours = models.IntegerField(default=1, validators=[MinValueValidator(1)])
+    # booking_date + estimated_hours, kept by save() so overlap checks are one indexed range query.
+    end_date = models.DateTimeField(editable=False)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    class Meta:
+        # Shaped after the hot queries in views.py/admin.py; see `manage.py check_query_plans`.
+        indexes = [
+            models.Index(fields=['fundi', 'status'], name='booking_fundi_status_idx'),
+            models.Index(fields=['fundi', '-created_at'], name='booking_fundi_created_idx'),
+            models.Index(fields=['customer', '-created_at'], name='booking_customer_created_idx'),
+            models.Index(fields=['status', '-created_at'], name='booking_status_created_idx'),
+            models.Index(fields=['-created_at'], name='booking_created_idx'),
+            models.Index(fields=['booking_date'], name='booking_date_idx'),
+            # Overlap checks and free slots: a fundi's bookings ending after a given moment.
+            models.Index(fields=['fundi', 'end_date'], name='booking_fundi_end_idx'),
+        ]
+    
     @property
     def total_cost(self):
         return self.fundi.hourly_rate * self.estimated_hours
     
+    def set_end_date(self):
+        self.end_date = self.booking_date + timedelta(hours=self.estimated_hours)
+    
+    def save(self, *args, **kwargs):
+        self.set_end_date()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'booking_date', 'estimated_hours'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'end_date'}
+        super().save(*args, **kwargs)
+    
     def __str__(self):
         return f"{self.customer.username} - {self.fundi.user.username} - {self.service.name}"
 
 
+class FundiWorkingHours(models.Model):
+    WEEKDAY_CHOICES = [
+        (0, 'Monday'),
+        (1, 'Tuesday'),
+        (2, 'Wednesday'),
+        (3, 'Thursday'),
+        (4, 'Friday'),
+        (5, 'Saturday'),
+        (6, 'Sunday'),
+    ]
+    
+    fundi = models.ForeignKey(Fundi, on_delete=models.CASCADE, related_name='working_hours')
+    weekday = models.PositiveSmallIntegerField(choices=WEEKDAY_CHOICES)
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+    
+    class Meta:
+        ordering = ['weekday', 'start_time']
+        verbose_name_plural = 'Fundi working hours'
+    
+    def clean(self):
+        if self.start_time and self.end_time and self.end_time <= self.start_time:
+            raise ValidationError({'end_time': 'End time must be after the start time.'})
+    
+    def __str__(self):
+        return f"{self.fundi.user.username} - {self.get_weekday_display()} {self.start_time:%H:%M}-{self.end_time:%H:%M}"
+
+
+class FundiTimeOff(models.Model):
+    fundi = models.ForeignKey(Fundi, on_delete=models.CASCADE, related_name='time_off')
+    start = models.DateTimeField()
+    end = models.DateTimeField()
+    reason = models.CharField(max_length=200, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['start']
+        verbose_name_plural = 'Fundi time off'
+        indexes = [
+            models.Index(fields=['fundi', 'end'], name='timeoff_fundi_end_idx'),
+        ]
+    
+    def clean(self):
+        if self.start and self.end and self.end <= self.start:
+            raise ValidationError({'end': 'End must be after the start.'})
+    
+    def __str__(self):
+        return f"{self.fundi.user.username} off {self.start:%Y-%m-%d %H:%M} - {self.end:%Y-%m-%d %H:%M}"
+
+
+class MediaFile(models.Model):
+    """A stored profile picture and how many fundis use it (services/media_files.py).
+
+    `manage.py media_gc` deletes files whose count has dropped to zero.
+    """
+    name = models.CharField(max_length=100, unique=True)
+    size = models.PositiveBigIntegerField(default=0)
+    refs = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)  # when refs last changed
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['refs', 'updated_at'], name='mediafile_orphan_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.name} ({self.refs} refs)"
+
+
+class JobRequest(models.Model):
+    """A job posted without choosing a fundi; services.dispatch offers it until one accepts."""
+    STATUS_CHOICES = [
+        ('open', 'Finding a fundi'),
+        ('assigned', 'Assigned'),
+        ('expired', 'No fundi found'),
+        ('cancelled', 'Cancelled'),
+    ]
+    
+    customer = models.ForeignKey(User, on_delete=models.CASCADE, related_name='job_requests')
+    service = models.ForeignKey(Service, on_delete=models.CASCADE)
+    category = models.CharField(max_length=50, choices=Service.CATEGORY_CHOICES, editable=False)
+    description = models.TextField()
+    address = models.TextField()
+    booking_date = models.DateTimeField()
+    estimated_hours = models.IntegerField(default=1, validators=[MinValueValidator(1)])
+    budget = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, validators=[MinValueValidator(0)],
+                                 help_text='Most you want to pay for the whole job (optional)')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='open')
+    booking = models.OneToOneField(Booking, on_delete=models.SET_NULL, null=True, blank=True, related_name='job_request')
+    created_at = models.DateTimeField(auto_now_add=True)
+    assigned_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        indexes = [
+            # The dispatcher's queue: open jobs, oldest first.
+            models.Index(fields=['status', 'created_at'], name='job_queue_idx'),
+            models.Index(fields=['customer', '-created_at'], name='job_customer_idx'),
+        ]
+    
+    def save(self, *args, **kwargs):
+        self.category = self.service.category
+        super().save(*args, **kwargs)
+    
+    def __str__(self):
+        return f"{self.customer.username} - {self.service.name} ({self.get_status_display()})"
+
+
+class JobOffer(models.Model):
+    STATUS_CHOICES = [
+        ('offered', 'Offered'),
+        ('accepted', 'Accepted'),
+        ('declined', 'Declined'),
+        ('expired', 'Expired'),
+        ('withdrawn', 'Withdrawn'),
+    ]
+    
+    job = models.ForeignKey(JobRequest, on_delete=models.CASCADE, related_name='offers')
+    fundi = models.ForeignKey(Fundi, on_delete=models.CASCADE, related_name='job_offers')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='offered')
+    score = models.FloatField(default=0)
+    offered_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+    responded_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        constraints = [
+            # A fundi is offered a job at most once.
+            models.UniqueConstraint(fields=['job', 'fundi'], name='joboffer_job_fundi_unique'),
+        ]
+        indexes = [
+            # Live offers on a fundi's dashboard, and the dispatcher's expiry sweep.
+            models.Index(fields=['fundi', 'status', 'expires_at'], name='joboffer_fundi_live_idx'),
+            models.Index(fields=['status', 'expires_at'], name='joboffer_expiry_idx'),
+        ]
+    
+    def __str__(self):
+        return f"Offer of job {self.job_id} to {self.fundi} ({self.get_status_display()})"
+
+
 class Review(models.Model):
     booking = models.OneToOneField(Booking, on_delete=models.CASCADE, related_name='review')
     rating = models.IntegerField(validators=[MinValueValidator(1), MaxValueValidator(5)])
@@ -116,7 +342,109 @@ class Payment(models.Model):
     checkout_request_id = models.CharField(max_length=200, blank=True, help_text='M-Pesa Checkout Request ID')
     created_at = models.DateTimeField(auto_now_add=True)
     completed_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', '-created_at'], name='payment_status_created_idx'),
+            models.Index(fields=['payment_method', '-created_at'], name='payment_method_created_idx'),
+            models.Index(fields=['-created_at'], name='payment_created_idx'),
+            # M-Pesa callbacks look payments up by these.
+            models.Index(fields=['checkout_request_id'], name='payment_checkout_req_idx'),
+            models.Index(fields=['merchant_request_id'], name='payment_merchant_req_idx'),
+        ]
     
     def __str__(self):
         return f"Payment for {self.booking} - {self.amount}"
 
+
+
+# Archive: terminal bookings older than a cutoff are moved here (with their payment and
+# review) by `manage.py archive_bookings`, keeping their ids. Same columns as the hot
+# tables, plus archived_at. The *ArchiveStats rows keep lifetime counts, ratings and
+# revenue correct without reading the archive.
+
+class ArchivedBooking(models.Model):
+    is_archived = True
+    
+    id = models.BigIntegerField(primary_key=True)
+    customer = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_customer_bookings')
+    fundi = models.ForeignKey(Fundi, on_delete=models.CASCADE, related_name='archived_fundi_bookings')
+    service = models.ForeignKey(Service, on_delete=models.CASCADE, related_name='+')
+    description = models.TextField()
+    address = models.TextField()
+    booking_date = models.DateTimeField()
+    estimated_hours = models.IntegerField(default=1)
+    end_date = models.DateTimeField(null=True, blank=True)
+    status = models.CharField(max_length=20, choices=Booking.STATUS_CHOICES)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['customer', '-created_at'], name='archbooking_customer_idx'),
+            models.Index(fields=['fundi', '-created_at'], name='archbooking_fundi_idx'),
+            models.Index(fields=['archived_at'], name='archbooking_archived_idx'),
+        ]
+    
+    @property
+    def total_cost(self):
+        return self.fundi.hourly_rate * self.estimated_hours
+    
+    def __str__(self):
+        return f"{self.customer.username} - {self.fundi.user.username} - {self.service.name}"
+
+
+class ArchivedReview(models.Model):
+    is_archived = True
+    
+    id = models.BigIntegerField(primary_key=True)
+    booking = models.OneToOneField(ArchivedBooking, on_delete=models.CASCADE, related_name='review')
+    rating = models.IntegerField()
+    comment = models.TextField(blank=True)
+    created_at = models.DateTimeField()
+    
+    def __str__(self):
+        return f"Review for {self.booking} - {self.rating} stars"
+
+
+class ArchivedPayment(models.Model):
+    is_archived = True
+    
+    id = models.BigIntegerField(primary_key=True)
+    booking = models.OneToOneField(ArchivedBooking, on_delete=models.CASCADE, related_name='payment')
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    status = models.CharField(max_length=20, choices=Payment.STATUS_CHOICES)
+    payment_method = models.CharField(max_length=20, choices=Payment.PAYMENT_METHOD_CHOICES)
+    transaction_id = models.CharField(max_length=200, blank=True)
+    merchant_request_id = models.CharField(max_length=200, blank=True)
+    checkout_request_id = models.CharField(max_length=200, blank=True)
+    created_at = models.DateTimeField()
+    completed_at = models.DateTimeField(null=True, blank=True)
+    
+    def __str__(self):
+        return f"Payment for {self.booking} - {self.amount}"
+
+
+class FundiArchiveStats(models.Model):
+    fundi = models.OneToOneField(Fundi, on_delete=models.CASCADE, primary_key=True, related_name='archive_stats')
+    bookings = models.PositiveIntegerField(default=0)
+    completed_bookings = models.PositiveIntegerField(default=0)
+    reviews = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    payments = models.PositiveIntegerField(default=0)
+    completed_payments = models.PositiveIntegerField(default=0)
+    failed_payments = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    
+    def __str__(self):
+        return f"Archive stats for {self.fundi}"
+
+
+class CustomerArchiveStats(models.Model):
+    customer = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='archive_stats')
+    bookings = models.PositiveIntegerField(default=0)
+    
+    def __str__(self):
+        return f"Archive stats for {self.customer}"
@@ -4,10 +4,18 @@ M-Pesa Daraja API Integration Utilities
 import requests
 import base64
 from datetime import datetime
+from urllib.parse import urlparse
 from django.conf import settings
 import json
 
 
+def _is_loopback_url(url):
+    """
+    True for http(s)://localhost or 127.0.0.1 URLs, e.g. the fake Daraja used by loadtest/.
+    """
+    return urlparse(url).hostname in ('localhost', '127.0.0.1')
+
+
 def get_access_token():
     """
     Get M-Pesa OAuth access token
@@ -23,7 +31,7 @@ def get_access_token():
     if consumer_key == "your_consumer_key_here" or consumer_secret == "your_consumer_secret_here":
         print("M-Pesa Access Token Error: Placeholder M-Pesa credentials detected in settings/.env.")
         return None
-    if not api_base_url.startswith("https://"):
+    if not api_base_url.startswith("https://") and not _is_loopback_url(api_base_url):
         print(f"M-Pesa Access Token Error: Invalid MPESA_API_URL '{api_base_url}'. Must start with https://")
         return None
     
@@ -4,9 +4,10 @@ M-Pesa Webhook/Callback Views
 from django.views.decorators.csrf import csrf_exempt
 from django.http import JsonResponse, HttpResponse
 from django.conf import settings
+from django.utils import timezone
 import json
 from .models import Payment
-from django.utils import timezone
+from .transitions import transition_payment
 
 
 @csrf_exempt
@@ -69,29 +70,23 @@ def mpesa_callback(request):
             
             print(f"M-Pesa Callback - Payment successful. Transaction ID: {transaction_id}, Amount: {amount}")
             
-            # Update payment
-            payment.status = 'completed'
-            payment.transaction_id = transaction_id or checkout_request_id
-            payment.completed_at = timezone.now()
-            payment.save()
-            
-            print(f"M-Pesa Callback - Payment #{payment.id} updated to completed. Booking ID: {payment.booking.id}")
-            
-            # Automatically update booking status to completed when payment is completed
-            booking = payment.booking
-            if booking.status != 'completed':
-                booking.status = 'completed'
-                booking.save()
-                print(f"M-Pesa Callback - Booking #{booking.id} updated to completed")
+            # Complete the payment and its booking. If the STK query sync got there first,
+            # only record the receipt number it did not have.
+            receipt = transaction_id or checkout_request_id
+            if transition_payment(payment, 'completed', transaction_id=receipt):
+                print(f"M-Pesa Callback - Payment #{payment.id} updated to completed. Booking ID: {payment.booking_id}")
+            elif Payment.objects.filter(pk=payment.pk, status='completed').update(
+                transaction_id=receipt, updated_at=timezone.now(),
+            ):
+                print(f"M-Pesa Callback - Payment #{payment.id} was already completed; receipt recorded")
             
             return JsonResponse({
                 'ResultCode': 0,
                 'ResultDesc': 'Payment processed successfully'
             })
         else:
-            # Payment failed
-            payment.status = 'failed'
-            payment.save()
+            # Payment failed (only a pending payment: a late failure never undoes a completion)
+            transition_payment(payment, 'failed')
             
             return JsonResponse({
                 'ResultCode': 0,  # Acknowledge receipt
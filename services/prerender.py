@@ -0,0 +1,258 @@
+"""
+Public fundi profiles and category landing pages, pre-rendered to files.
+
+Visitors who are not logged in all see the same HTML for /fundi/<id>/ and
+/fundis/category/<category>/, so `manage.py prerender_pages --all` renders each one once
+(through the normal views, as an anonymous GET) into PRERENDER_ROOT, and
+PrerenderedPageMiddleware sends the file, with sendfile() and a gzip copy, without
+opening a session or querying the database. Anyone with a session cookie, a query string
+(review pages, sorting) or a page not rendered yet gets the normal view.
+
+Keeping pages current: saving a Fundi marks its pages stale once the transaction
+commits, and so does anything services.versions counts as a profile change (its user,
+bookings, reviews, booking status changes). Marking drops the page, so the view serves
+it meanwhile, and leaves a marker file in PRERENDER_ROOT/.stale; pages are re-rendered
+from the markers in a thread (PRERENDER_IN_THREAD) or by `manage.py prerender_pages --watch`. A page is only written if
+its marker did not change while it rendered, so an edit that commits mid-render is never
+lost. Bulk changes that skip signals (generate_fake_data, import_data, editing services)
+need `prerender_pages --all`. WhiteNoise is not used for these files because it indexes
+its folders once at startup and would not see pages written afterwards.
+"""
+import gzip
+import os
+import tempfile
+import threading
+from pathlib import Path
+from urllib.parse import quote, unquote
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.db import close_old_connections, transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotFound
+from django.test import RequestFactory
+from django.urls import Resolver404, resolve, reverse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+from .models import Fundi, Service
+
+# URL names whose anonymous GET is pre-rendered.
+PAGE_NAMES = ('fundi_detail', 'category_fundis')
+STALE_DIR = '.stale'
+
+
+def fundi_path(fundi_id):
+    return reverse('fundi_detail', args=[fundi_id])
+
+
+def category_path(category):
+    return reverse('category_fundis', args=[category])
+
+
+def all_paths():
+    paths = [category_path(category) for category, _ in Service.CATEGORY_CHOICES]
+    paths += [fundi_path(fundi_id) for fundi_id in Fundi.objects.order_by('pk').values_list('pk', flat=True).iterator()]
+    return paths
+
+
+def page_file(path):
+    """/fundi/12/ -> PRERENDER_ROOT/fundi/12.html"""
+    return Path(settings.PRERENDER_ROOT) / f"{path.strip('/')}.html"
+
+
+def _marker(path):
+    return Path(settings.PRERENDER_ROOT) / STALE_DIR / quote(path, safe='')
+
+
+def _mtime(file):
+    try:
+        return os.stat(file).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def _remove(file):
+    for name in (file, f'{file}.gz'):
+        try:
+            os.remove(name)
+        except FileNotFoundError:
+            pass
+
+
+def _write(file, data):
+    # Written beside the target and renamed over it, so readers never see half a page.
+    file.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=file.parent, prefix='.tmp-')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    os.chmod(tmp, 0o644)  # mkstemp makes it private; a front-end server may read these
+    return tmp
+
+
+def render(path):
+    """The anonymous response for path, from its view."""
+    request = RequestFactory().get(path)
+    request.user = AnonymousUser()
+    match = resolve(path)
+    return match.func(request, *match.args, **match.kwargs)
+
+
+def refresh(path):
+    """Render path's page to its file, or remove the file if the page is gone.
+
+    Returns True if the page was written. Nothing is written if the page was marked stale
+    again while it rendered; its marker stays for the next pass.
+    """
+    file, marker = page_file(path), _marker(path)
+    marked = _mtime(marker)
+    try:
+        response = render(path)
+    except Http404:
+        response = HttpResponseNotFound()
+    if response.status_code == 404:
+        _remove(file)
+    elif response.status_code != 200:
+        print(f"Prerender: {path} answered {response.status_code}, left as it is")
+        return False
+    else:
+        page = _write(file, response.content)
+        packed = _write(file, gzip.compress(response.content, 6))
+        if _mtime(marker) != marked:
+            os.remove(page)
+            os.remove(packed)
+            return False
+        os.replace(packed, f'{file}.gz')
+        os.replace(page, file)
+    if marked is not None and _mtime(marker) == marked:
+        os.remove(marker)
+    return response.status_code == 200
+
+
+def stale_paths():
+    try:
+        return [unquote(name) for name in os.listdir(Path(settings.PRERENDER_ROOT) / STALE_DIR)]
+    except FileNotFoundError:
+        return []
+
+
+def refresh_stale():
+    """Re-render every page marked stale. Returns how many were written."""
+    return sum(refresh(path) for path in stale_paths())
+
+
+def mark_stale(paths):
+    """Drop the pages at paths and mark them for re-rendering."""
+    stale = Path(settings.PRERENDER_ROOT) / STALE_DIR
+    stale.mkdir(parents=True, exist_ok=True)
+    for path in paths:
+        _marker(path).touch()  # touch() moves the mtime on, which refresh() checks
+        _remove(page_file(path))
+    if settings.PRERENDER_IN_THREAD:
+        _wake_refresher()
+
+
+def pages_changed(fundi_ids=(), categories=()):
+    """Mark the profiles of fundi_ids and the category pages once the transaction commits.
+
+    Either may be a queryset; they are only evaluated when pre-rendering is on.
+    """
+    if not settings.PRERENDER_PAGES:
+        return
+    paths = {fundi_path(fundi_id) for fundi_id in fundi_ids}
+    paths.update(category_path(category) for category in categories if category)
+    if paths:
+        transaction.on_commit(lambda: mark_stale(paths))
+
+
+# One refresher thread per process; marking wakes it, and it re-renders every marker.
+_wake = threading.Event()
+_refresher = None
+_refresher_lock = threading.Lock()
+
+
+def _refresh_loop():
+    while True:
+        _wake.wait()
+        _wake.clear()
+        close_old_connections()
+        try:
+            refresh_stale()
+        except Exception as error:
+            print(f"Prerender refresh failed: {error}")
+
+
+def _wake_refresher():
+    global _refresher
+    with _refresher_lock:
+        if _refresher is None or not _refresher.is_alive():
+            _refresher = threading.Thread(target=_refresh_loop, name='prerender', daemon=True)
+            _refresher.start()
+    _wake.set()
+
+
+class PrerenderedPageMiddleware:
+    """Answer anonymous GETs for pre-rendered pages from PRERENDER_ROOT."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if settings.PRERENDER_PAGES and request.method in ('GET', 'HEAD') and self._anonymous(request):
+            response = self._page(request)
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    @staticmethod
+    def _anonymous(request):
+        # Cookies only: looking the session up would cost the query this saves. A leftover
+        # cookie just means the view renders the page.
+        return not request.META.get('QUERY_STRING') and not (
+            settings.SESSION_COOKIE_NAME in request.COOKIES or 'messages' in request.COOKIES
+        )
+
+    def _page(self, request):
+        try:
+            if resolve(request.path_info).url_name not in PAGE_NAMES:
+                return None
+        except Resolver404:
+            return None
+        file = page_file(request.path_info)
+        try:
+            st = os.stat(file)
+        except FileNotFoundError:
+            return None
+
+        headers = HttpResponse()
+        headers['Last-Modified'] = http_date(st.st_mtime)
+        headers['Cache-Control'] = 'no-cache'
+        patch_vary_headers(headers, ('Cookie', 'Accept-Encoding'))
+        response = get_conditional_response(request, last_modified=int(st.st_mtime), response=headers)
+        if response is not headers:
+            return response
+
+        gzipped = 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', '')
+        try:
+            body = open(f'{file}.gz' if gzipped else file, 'rb')
+        except FileNotFoundError:
+            return None  # marked stale a moment ago
+        response = FileResponse(body, content_type='text/html; charset=utf-8')
+        if gzipped:
+            response['Content-Encoding'] = 'gzip'
+        for name in ('Last-Modified', 'Cache-Control', 'Vary'):
+            response[name] = headers[name]
+        return response
+
+
+@receiver(post_init, sender=Fundi)
+def _remember_category(sender, instance, **kwargs):
+    instance._stored_category = instance.__dict__.get('category')
+
+
+@receiver(post_save, sender=Fundi)
+@receiver(post_delete, sender=Fundi)
+def _fundi_changed(sender, instance, **kwargs):
+    pages_changed([instance.pk], {instance.category, instance._stored_category})
+    instance._stored_category = instance.category
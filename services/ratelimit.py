@@ -0,0 +1,214 @@
+"""
+Rate limits for the endpoints bots and retry storms go for: login, create_payment (each
+POST is an STK push to Daraja) and contact_fundi.
+
+Each endpoint has token buckets in settings.RATE_LIMITS, one per key: the client's IP,
+the logged-in user, the M-Pesa phone number or the username being tried. A bucket
+'5/10m' holds 5 tokens and gets one back every 2 minutes; a request needs a token from
+every bucket it falls into, and takes none if one of them is empty, so a rejected request
+does not use up the others. Only POSTs take tokens, so showing the forms is never
+limited. A request that finds a bucket empty is answered 429 with Retry-After before the
+view runs, so it costs no queries and no Daraja call.
+
+A bucket is stored as a single number, the time it will be full again (GCRA, which
+behaves exactly like a token bucket). With DJANGO_CACHE_URL (Redis) buckets are shared by
+every worker, and a request's buckets are checked and updated atomically in one round
+trip by a small Lua script. Without it, or while Redis is unreachable, each process keeps
+its own buckets in a dict, updated without locks; concurrent requests may let a token or
+two more through, which is fine for this purpose.
+
+Rejections are counted per endpoint and key (rejections()), as are Redis failures, and
+each process prints the counts at most once a minute while they are happening.
+"""
+import time
+from collections import Counter
+from functools import wraps
+from hashlib import sha256
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+from .mpesa_utils import format_phone_number
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+# In-process buckets kept before expired ones are dropped.
+MAX_LOCAL_BUCKETS = 50000
+REPORT_SECONDS = 60
+# After a Redis error, use the in-process buckets this long before trying Redis again.
+REDIS_RETRY_SECONDS = 10
+
+# KEYS the buckets. ARGV: now, then seconds per token and bucket size for each bucket.
+# Takes a token from every bucket, or from none if one is empty. Returns {0} if allowed,
+# else {number of the first empty bucket, seconds until all have a token}.
+TAKE_TOKENS = """
+local now = tonumber(ARGV[1])
+local full, empty, wait = {}, 0, 0
+for i, key in ipairs(KEYS) do
+    local interval, size = tonumber(ARGV[2 * i]), tonumber(ARGV[2 * i + 1])
+    full[i] = math.max(tonumber(redis.call('GET', key) or '0'), now) + interval
+    if full[i] - now > size * interval then
+        if empty == 0 then empty = i end
+        wait = math.max(wait, full[i] - now - size * interval)
+    end
+end
+if empty > 0 then
+    return {empty, tostring(wait)}
+end
+for i, key in ipairs(KEYS) do
+    redis.call('SET', key, tostring(full[i]), 'PX', math.ceil((full[i] - now) * 1000))
+end
+return {0}
+"""
+
+
+def parse_rate(rate):
+    """'5/10m' -> (5 tokens, 120 seconds per token)"""
+    count, _, period = rate.partition('/')
+    number = period[:-1] or '1'
+    return int(count), int(number) * PERIODS[period[-1]] / int(count)
+
+
+def client_ip(request):
+    """The client's address, from X-Forwarded-For when TRUSTED_PROXY_COUNT proxies add to it."""
+    proxies = settings.TRUSTED_PROXY_COUNT
+    forwarded = request.META.get('HTTP_X_FORWARDED_FOR', '')
+    if proxies and forwarded:
+        hops = [hop.strip() for hop in forwarded.split(',')]
+        return hops[-min(proxies, len(hops))]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def _user(request):
+    return request.user.pk if request.user.is_authenticated else None
+
+
+# Key kind -> what identifies the client; None leaves that bucket out.
+KEYS = {
+    'ip': client_ip,
+    'user': _user,
+    'phone': lambda request: format_phone_number(request.POST.get('phone_number')),
+    'username': lambda request: request.POST.get('username', '').strip().casefold() or None,
+}
+
+
+class LocalBuckets:
+    """This process's buckets: key -> time it is full again."""
+
+    def __init__(self):
+        self._full_at = {}
+
+    def take(self, buckets, now):
+        """Same as TAKE_TOKENS, for [(key, seconds per token, size)]; the index is 0-based."""
+        full, empty, wait = [], None, 0
+        for i, (key, interval, size) in enumerate(buckets):
+            full.append(max(self._full_at.get(key, now), now) + interval)
+            if full[i] - now > size * interval:
+                empty = i if empty is None else empty
+                wait = max(wait, full[i] - now - size * interval)
+        if empty is not None:
+            return wait, empty
+        if len(self._full_at) + len(buckets) > MAX_LOCAL_BUCKETS:
+            self._prune(now)
+        for (key, _, _), full_at in zip(buckets, full):
+            self._full_at[key] = full_at
+        return 0, None
+
+    def _prune(self, now):
+        for key, full_at in list(self._full_at.items()):
+            if full_at <= now:
+                self._full_at.pop(key, None)
+        if len(self._full_at) >= MAX_LOCAL_BUCKETS:
+            self._full_at.clear()  # a flood of distinct keys: start over rather than grow
+
+
+_local = LocalBuckets()
+_script = None
+_rejected = Counter()
+_redis_errors = Counter()
+_redis_down_until = 0.0
+_reported_at = 0.0
+
+
+def _shared_client():
+    """The Redis client behind the default cache, or None if it is not Redis."""
+    if not settings.CACHE_URL:
+        return None
+    get_client = getattr(getattr(cache, '_cache', None), 'get_client', None)
+    return get_client(write=True) if get_client else None
+
+
+def take(buckets):
+    """Take a token from each of [(key, rate)], or from none if one is empty.
+
+    Returns (0, None), or the seconds until every bucket has a token and the index of the
+    first empty one.
+    """
+    global _script, _redis_down_until
+    buckets = [(key, *reversed(parse_rate(rate))) for key, rate in buckets]
+    now = time.time()
+    client = _shared_client() if now >= _redis_down_until else None
+    if client is not None:
+        try:
+            if _script is None:
+                _script = client.register_script(TAKE_TOKENS)
+            args = [now]
+            for _, interval, size in buckets:
+                args += [interval, size]
+            result = _script(keys=[cache.make_key(key) for key, _, _ in buckets], args=args, client=client)
+            return (float(result[1]), int(result[0]) - 1) if int(result[0]) else (0, None)
+        except Exception as error:
+            _redis_down_until = now + REDIS_RETRY_SECONDS
+            _redis_errors[type(error).__name__] += 1
+            _report()
+    return _local.take(buckets, now)
+
+
+def _report():
+    global _reported_at
+    now = time.monotonic()
+    if now - _reported_at < REPORT_SECONDS:
+        return
+    _reported_at = now
+    counts = ', '.join(f'{endpoint} by {kind}: {n}' for (endpoint, kind), n in sorted(_rejected.items()))
+    errors = ', '.join(f'{name}: {n}' for name, n in sorted(_redis_errors.items()))
+    print(f"Rate limit rejections since start: {counts or 'none'}"
+          + (f"; Redis failed, used this process's buckets ({errors})" if errors else ''))
+
+
+def rejections():
+    """{(endpoint, key kind): requests rejected} in this process since it started."""
+    return dict(_rejected)
+
+
+def too_many_requests(retry_after):
+    response = HttpResponse('Too many attempts. Please wait a moment and try again.\n',
+                            status=429, content_type='text/plain; charset=utf-8')
+    response['Retry-After'] = str(max(1, round(retry_after)))
+    # Counted and reported above; Django would otherwise log a warning for every one.
+    response._has_been_logged = True
+    return response
+
+
+def rate_limit(endpoint, methods=('POST',)):
+    """View decorator applying settings.RATE_LIMITS[endpoint] to requests with these methods."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if settings.RATE_LIMITS_ENABLED and request.method in methods:
+                kinds, buckets = [], []
+                for kind, rate in settings.RATE_LIMITS.get(endpoint, {}).items():
+                    value = KEYS[kind](request)
+                    if value in (None, ''):
+                        continue
+                    digest = sha256(str(value).encode()).hexdigest()[:24]
+                    kinds.append(kind)
+                    buckets.append((f'ratelimit:{endpoint}:{kind}:{digest}', rate))
+                wait, empty = take(buckets) if buckets else (0, None)
+                if wait:
+                    _rejected[endpoint, kinds[empty]] += 1
+                    _report()
+                    return too_many_requests(wait)
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,161 @@
+"""
+Profile picture thumbnails: THUMBNAIL_WIDTHS wide, as AVIF and WebP with a JPEG fallback.
+
+Uploads are stored as they come (often multi-megabyte phone photos). Shrinking them
+happens outside the upload request: in a thread started once the save commits
+(THUMBNAILS_IN_THREAD), or by `manage.py make_thumbnails`, which also backfills
+existing pictures across several processes. Until a fundi's thumbnails match their
+current picture, templates show the original file.
+
+AVIF needs the optional pillow-avif-plugin package; without it only WebP and JPEG are made.
+"""
+import threading
+from io import BytesIO
+from pathlib import PurePosixPath
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+try:
+    import pillow_avif  # noqa: F401  (registers the AVIF plugin with Pillow)
+except ImportError:
+    pass
+
+from .models import Fundi
+from .versions import profiles_changed
+
+# 180 is the profile page avatar; 360 and 720 cover the list cards at 1x and 2x.
+THUMBNAIL_WIDTHS = (180, 360, 720)
+THUMBNAIL_DIR = 'fundi_profiles/thumbs'
+
+# format -> (Pillow format, file extension, MIME type, save options), best first
+FORMATS = {
+    'avif': ('AVIF', 'avif', 'image/avif', {'quality': 60}),
+    'webp': ('WEBP', 'webp', 'image/webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', 'jpg', 'image/jpeg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+
+def available_formats():
+    """The formats this Pillow can write; always includes jpeg."""
+    Image.init()
+    return [fmt for fmt, (pillow_format, _, _, _) in FORMATS.items() if pillow_format in Image.SAVE]
+
+
+def thumbnail_name(source, width, fmt):
+    return f'{THUMBNAIL_DIR}/{PurePosixPath(source).stem}-{width}.{FORMATS[fmt][1]}'
+
+
+def picture_sources(fundi):
+    """{'sources': [(MIME type, srcset), ...], 'src': url, 'srcset': JPEG srcset}, or None if not made yet."""
+    name = fundi.profile_picture.name if fundi.profile_picture else ''
+    made = fundi.thumbnails
+    if not name or fundi.thumbnail_source != name or not made:
+        return None
+
+    def srcset(fmt):
+        return ', '.join(f'{default_storage.url(thumbnail_name(name, width, fmt))} {width}w' for width in made['widths'])
+
+    return {
+        'sources': [(FORMATS[fmt][2], srcset(fmt)) for fmt in made['formats'] if fmt != 'jpeg'],
+        'src': default_storage.url(thumbnail_name(name, made['widths'][-1], 'jpeg')),
+        'srcset': srcset('jpeg'),
+    }
+
+
+def pending_fundis():
+    """Fundis with a picture whose thumbnails are missing or were made from an older picture."""
+    return Fundi.objects.filter(~Q(profile_picture=''), profile_picture__isnull=False).exclude(
+        thumbnail_source=F('profile_picture'),
+    )
+
+
+def _open(name, width):
+    with default_storage.open(name) as f:
+        image = Image.open(f)
+        # JPEGs decode straight at 1/2, 1/4 or 1/8 scale when that is still big enough.
+        image.draft('RGB', (width, width))
+        image = ImageOps.exif_transpose(image)
+        if image.mode in ('RGBA', 'LA', 'P'):
+            image = image.convert('RGBA')
+            background = Image.new('RGB', image.size, 'white')
+            background.paste(image, mask=image.getchannel('A'))
+            return background
+        return image.convert('RGB')
+
+
+def make_thumbnails(fundi_id, formats=None, reuse=True):
+    """Make thumbnails of the fundi's current picture. Returns True if the fundi now has some.
+
+    Pictures are stored by content, so fundis with the same image share thumbnails: with
+    reuse, ones already made for another fundi are taken as they are. A picture that
+    cannot be read is recorded with no thumbnails, so it is not retried and templates keep
+    showing the original. Thumbnails of a replaced picture are left for `manage.py media_gc`.
+    """
+    fundi = Fundi.objects.filter(pk=fundi_id).only('profile_picture', 'category').first()
+    if fundi is None or not fundi.profile_picture:
+        return False
+    name = fundi.profile_picture.name
+    made = None
+    if reuse:
+        shared = Fundi.objects.filter(thumbnail_source=name).exclude(pk=fundi_id).values_list('thumbnails', flat=True)
+        made = next((made for made in shared[:5] if made), None)
+    if made is None:
+        made = _make(name, formats or available_formats())
+
+    # Only record them if the picture was not replaced while we worked.
+    updated = Fundi.objects.filter(pk=fundi_id, profile_picture=name).update(thumbnail_source=name, thumbnails=made)
+    if updated:
+        profiles_changed([fundi_id], [fundi.category])
+    return bool(updated and made)
+
+
+def _make(name, formats):
+    try:
+        image = _open(name, THUMBNAIL_WIDTHS[-1])
+    except (OSError, UnidentifiedImageError) as error:
+        print(f"Thumbnails: cannot read {name}: {error}")
+        return {}
+    widths = [width for width in THUMBNAIL_WIDTHS if width <= image.width] or [THUMBNAIL_WIDTHS[0]]
+    # Largest first, each size resized from the one before: cheaper than from the original.
+    for width in reversed(widths):
+        image = image.resize((width, max(1, round(image.height * width / image.width))), Image.LANCZOS)
+        for fmt in formats:
+            pillow_format, _, _, options = FORMATS[fmt]
+            buffer = BytesIO()
+            image.save(buffer, pillow_format, **options)
+            target = thumbnail_name(name, width, fmt)
+            default_storage.delete(target)  # replace, rather than save beside it under a new name
+            default_storage.save(target, ContentFile(buffer.getvalue()))
+    return {'formats': formats, 'widths': widths}
+
+
+def delete_thumbnails(source, made):
+    for width in made.get('widths', ()):
+        for fmt in made.get('formats', ()):
+            default_storage.delete(thumbnail_name(source, width, fmt))
+
+
+def _make_in_thread(fundi_id):
+    try:
+        make_thumbnails(fundi_id)
+    except Exception as error:
+        print(f"Thumbnails for fundi #{fundi_id} failed: {error}")
+    finally:
+        connection.close()
+
+
+@receiver(post_save, sender=Fundi)
+def _picture_saved(sender, instance, raw=False, **kwargs):
+    if raw or not settings.THUMBNAILS_IN_THREAD or not instance.profile_picture:
+        return
+    if instance.thumbnail_source == instance.profile_picture.name:
+        return
+    fundi_id = instance.pk
+    transaction.on_commit(lambda: threading.Thread(target=_make_in_thread, args=(fundi_id,), daemon=True).start())
@@ -0,0 +1,106 @@
+"""
+Booking and payment status changes, as compare-and-set UPDATEs.
+
+Every status change in the app goes through here. A change is one statement,
+UPDATE ... SET status = new WHERE id IN (...) AND status IN (statuses allowed to move to new),
+so the database decides who wins when two writers race (an M-Pesa callback and the
+STK-query sync on a page view, a fundi and an admin). The loser sees 0 rows changed
+instead of overwriting the winner, and a status the table does not allow is never written.
+
+Only the status and the fields passed in are written, and no row lock is taken, so
+callers make their Daraja calls before or after, never while holding anything.
+"""
+from django.db import transaction
+from django.db.models import DateTimeField, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Booking, Payment
+from .versions import profiles_changed
+
+# status -> statuses it may move to. Completed and cancelled bookings are final.
+BOOKING_TRANSITIONS = {
+    'pending': ('confirmed', 'in_progress', 'completed', 'cancelled'),
+    'confirmed': ('in_progress', 'completed', 'cancelled'),
+    'in_progress': ('completed', 'cancelled'),
+    'completed': (),
+    'cancelled': (),
+}
+
+# A failed payment may still complete: the STK query recovers payments a premature
+# callback marked failed. Refunds are final.
+PAYMENT_TRANSITIONS = {
+    'pending': ('completed', 'failed'),
+    'failed': ('completed',),
+    'completed': ('refunded',),
+    'refunded': (),
+}
+
+
+def allowed_from(transitions, status):
+    """The statuses that may move to status."""
+    return [current for current, targets in transitions.items() if status in targets]
+
+
+def set_booking_status(bookings, status, **fields):
+    """Move the bookings whose status allows it to status; returns how many rows changed."""
+    bookings = bookings.filter(status__in=allowed_from(BOOKING_TRANSITIONS, status))
+    with transaction.atomic():
+        # Public profiles list recent bookings with their status (services/versions.py).
+        profiles_changed(bookings.values('fundi_id'))
+        # update() skips auto_now, so stamp updated_at here.
+        return bookings.update(status=status, updated_at=timezone.now(), **fields)
+
+
+def set_payment_status(payments, status, **fields):
+    """Move the payments whose status allows it to status; completing a payment also completes its booking.
+
+    Returns (payments changed, bookings completed).
+    """
+    now = timezone.now()
+    payments = payments.filter(status__in=allowed_from(PAYMENT_TRANSITIONS, status))
+    with transaction.atomic():
+        bookings_completed = 0
+        if status == 'completed':
+            # Before the payment UPDATE, while `payments` still selects the rows being changed.
+            bookings_completed = set_booking_status(Booking.objects.filter(payment__in=payments.values('pk')), 'completed')
+            fields.setdefault('completed_at', Coalesce('completed_at', Value(now, output_field=DateTimeField())))
+        changed = payments.update(status=status, updated_at=now, **fields)
+    return changed, bookings_completed
+
+
+def transition_booking(booking, status, **fields):
+    """Move one booking to status if its current status in the database allows it.
+
+    Returns True if this call made the change, and updates the instance to match.
+    """
+    if not set_booking_status(Booking.objects.filter(pk=booking.pk), status, **fields):
+        return False
+    booking.status = status
+    for name, value in fields.items():
+        setattr(booking, name, value)
+    return True
+
+
+def transition_payment(payment, status, **fields):
+    """Move one payment to status if its current status in the database allows it.
+
+    Completing it also completes the booking. Returns True if this call made the
+    change, and updates the instance to match.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        if status == 'completed':
+            fields.setdefault('completed_at', Coalesce('completed_at', Value(now, output_field=DateTimeField())))
+        if not Payment.objects.filter(
+            pk=payment.pk, status__in=allowed_from(PAYMENT_TRANSITIONS, status),
+        ).update(status=status, updated_at=now, **fields):
+            return False
+        if status == 'completed':
+            set_booking_status(Booking.objects.filter(pk=payment.booking_id), 'completed')
+    payment.status, payment.updated_at = status, now
+    for name, value in fields.items():
+        if name == 'completed_at' and isinstance(value, Coalesce):
+            value = payment.completed_at or now
+        setattr(payment, name, value)
+    return True
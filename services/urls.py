@@ -2,25 +2,36 @@ from django.urls import path
 from django.contrib.auth import views as auth_views
 from . import views
 from . import mpesa_views
+from .ratelimit import rate_limit
 
 urlpatterns = [
     path('', views.home, name='home'),
     path('register/', views.register, name='register'),
-    path('login/', auth_views.LoginView.as_view(template_name='services/login.html'), name='login'),
+    path('login/', rate_limit('login')(auth_views.LoginView.as_view(template_name='services/login.html')), name='login'),
     path('logout/', auth_views.LogoutView.as_view(), name='logout'),
     
     # Fundi related
     path('fundis/', views.fundi_list, name='fundi_list'),
+    path('fundis/match/', views.fundi_matches, name='fundi_matches'),
+    path('fundis/category/<slug:category>/', views.category_fundis, name='category_fundis'),
     path('fundi/<int:fundi_id>/', views.fundi_detail, name='fundi_detail'),
     path('fundi/<int:fundi_id>/contact/', views.contact_fundi, name='contact_fundi'),
     path('fundi/create-profile/', views.create_fundi_profile, name='create_fundi_profile'),
     path('fundi/dashboard/', views.fundi_dashboard, name='fundi_dashboard'),
     path('fundi/edit-profile/', views.edit_fundi_profile, name='edit_fundi_profile'),
+    path('fundi/availability/', views.fundi_availability, name='fundi_availability'),
+    path('fundi/<int:fundi_id>/free-slots/', views.fundi_free_slots, name='fundi_free_slots'),
     
     # Booking related
     path('booking/create/<int:fundi_id>/', views.create_booking, name='create_booking'),
     path('booking/<int:booking_id>/', views.booking_detail, name='booking_detail'),
     path('bookings/', views.my_bookings, name='my_bookings'),
+    
+    # Posted jobs (dispatch)
+    path('jobs/post/', views.post_job, name='post_job'),
+    path('jobs/<int:job_id>/', views.job_detail, name='job_detail'),
+    path('fundi/offers/', views.fundi_job_offers, name='fundi_job_offers'),
+    path('fundi/offers/<int:offer_id>/respond/', views.respond_job_offer, name='respond_job_offer'),
     path('booking/<int:booking_id>/update-status/', views.update_booking_status, name='update_booking_status'),
     
     # Payment related
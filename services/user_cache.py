@@ -0,0 +1,90 @@
+"""
+The logged-in user, cached, so AuthenticationMiddleware does not query for it on every request.
+
+CachedUserBackend.get_user() reads the user's row, with the id of their Fundi profile
+(User.fundi_profile_id), from the cache for up to USER_CACHE_SECONDS, and loads it in
+one query on a miss. The password hash is never cached: the row holds the session auth
+hash instead (an HMAC of it, which the session stores anyway) for the per-request session
+check, and the password is a deferred field, read from the database if something needs it.
+Within a request Django already keeps the user on the request, so it is looked up at most
+once per request either way. Saving or deleting a User, or creating or deleting a Fundi,
+drops the user's entry (again once the transaction commits, so a request in between cannot
+cache the old row for long).
+
+With the default per-process cache (no DJANGO_CACHE_URL) other processes keep their copy
+until it expires: a deactivated user or a password change takes up to USER_CACHE_SECONDS
+to reach them. Point DJANGO_CACHE_URL at Redis to share the cache and invalidate everywhere.
+"""
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Fundi, User
+
+FIELDS = [field.attname for field in User._meta.concrete_fields if field.attname != 'password']
+
+
+def _key(user_id):
+    return f'user-row:{user_id}'
+
+
+def cached_user(user_id):
+    """The User with user_id (password deferred) and its fundi_profile_id, from the cache when it is there. None if no such user."""
+    key = _key(user_id)
+    row = cache.get(key)
+    if row is None:
+        row = User._default_manager.filter(pk=user_id).values_list(*FIELDS, 'password', 'fundi_profile__id').first()
+        if row is None:
+            return None
+        *values, password, fundi_profile_id = row
+        session_auth_hash = User.from_db(DEFAULT_DB_ALIAS, ['password'], [password]).get_session_auth_hash()
+        row = (*values, session_auth_hash, fundi_profile_id)
+        if settings.USER_CACHE_SECONDS:
+            cache.set(key, row, settings.USER_CACHE_SECONDS)
+    user = User.from_db(DEFAULT_DB_ALIAS, FIELDS, row[:-2])
+    user.cached_session_auth_hash = row[-2]
+    user.fundi_profile_id = row[-1]
+    return user
+
+
+def forget_user(user_id):
+    """Drop user_id's cached row, now and once the current transaction commits."""
+    key = _key(user_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+class CachedUserBackend(ModelBackend):
+    """ModelBackend whose get_user() (run on every authenticated request) uses cached_user()."""
+
+    def get_user(self, user_id):
+        user = cached_user(user_id)
+        return user if user is not None and self.user_can_authenticate(user) else None
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def _user_changed(sender, instance, **kwargs):
+    forget_user(instance.pk)
+
+
+def _profile_added_or_removed(fundi):
+    forget_user(fundi.user_id)
+    # The user object this request holds (create_fundi_profile sets fundi.user = request.user).
+    user = fundi._state.fields_cache.get('user')
+    if user is not None:
+        user.__dict__.pop('fundi_profile_id', None)
+
+
+@receiver(post_save, sender=Fundi)
+def _fundi_saved(sender, instance, created, **kwargs):
+    if created:
+        _profile_added_or_removed(instance)
+
+
+@receiver(post_delete, sender=Fundi)
+def _fundi_deleted(sender, instance, **kwargs):
+    _profile_added_or_removed(instance)
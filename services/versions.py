@@ -0,0 +1,205 @@
+"""
+Version stamps for pages, and conditional GET (ETag / 304) built on them.
+
+Fundi, Booking and Payment carry an updated_at. A Fundi's also moves when anything its
+public profile shows changes: a booking or review of theirs, a booking's status, the name
+or contact details of the fundi's user or of a customer who booked them. Callers that
+change rows with queryset update() (services.transitions, thumbnails) call
+profiles_changed() themselves; the rest is caught by the signals below. Deleting a
+queryset sends a signal per row it takes with it, so bulk deletes (archiving, the admin)
+go through delete_in_bulk(), which marks the fundis once and silences the per-row work.
+
+conditional_page() turns a view's stamp, read with one small indexed query, into an
+ETag. A request whose If-None-Match matches gets a 304 before the view runs any of its
+own queries or renders anything. The ETag also covers who is looking (the navigation and
+buttons differ per user), the CSRF cookie the page's forms carry, and the release, so a
+deploy with new templates does not 304 to old HTML.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from hashlib import sha256
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.db import transaction
+from django.db.models import Count, Max, OuterRef, Q, QuerySet, Subquery
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from django.template.utils import get_app_template_dirs
+from django.utils import timezone
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+
+from .models import Booking, Fundi, JobRequest, Review, User
+from .prerender import pages_changed
+
+
+def _deployed_files_hash():
+    """A hash of what the pages are made from: the git commit, templates and static manifest.
+
+    Every worker started from the same checkout gets the same value, so their ETags agree,
+    and it changes whenever a deploy changes any of them.
+    """
+    base = Path(settings.BASE_DIR)
+    files = [base / '.git' / 'HEAD', Path(settings.STATIC_ROOT) / 'staticfiles.json']
+    head = files[0].read_text().strip() if files[0].is_file() else ''
+    if head.startswith('ref: '):
+        files.append(base / '.git' / head[5:])
+        files.append(base / '.git' / 'packed-refs')
+    for directory in [*settings.TEMPLATES[0]['DIRS'], *get_app_template_dirs('templates')]:
+        files.extend(sorted(Path(directory).rglob('*.html')))
+    digest = sha256()
+    for path in files:
+        if path.is_file():
+            digest.update(str(path.relative_to(base) if path.is_relative_to(base) else path).encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:12]
+
+
+# DJANGO_RELEASE (or Render's commit), else a hash of the deployed files.
+RELEASE = settings.RELEASE or _deployed_files_hash()
+
+# User fields the pages show: a fundi's name and contact details, customers' names.
+SHOWN_USER_FIELDS = ('username', 'first_name', 'last_name', 'email', 'phone_number', 'address')
+
+
+def profiles_changed(fundi_ids, categories=()):
+    """Move the fundis' updated_at and mark their pre-rendered pages stale.
+
+    fundi_ids may be a queryset of ids, which goes to the database as a subquery rather
+    than being loaded here, however many rows it selects.
+    """
+    if not isinstance(fundi_ids, QuerySet):
+        fundi_ids = list(fundi_ids)
+        if not fundi_ids:
+            return
+    Fundi.objects.filter(pk__in=fundi_ids).update(updated_at=timezone.now())
+    pages_changed(fundi_ids, categories)
+
+
+# True inside bulk_change(): the per-row receivers below and in services.matching do nothing.
+_bulk_change = ContextVar('bulk_change', default=False)
+
+
+def in_bulk_change():
+    return _bulk_change.get()
+
+
+@contextmanager
+def bulk_change(fundi_ids, categories=()):
+    """Mark fundi_ids changed once, then run the block with the per-row receivers silenced.
+
+    fundi_ids and categories may be querysets; they are read before the block runs, so
+    they can select rows the block deletes.
+    """
+    from .matching import fundis_changed  # matching imports this module
+
+    with transaction.atomic():
+        profiles_changed(fundi_ids, categories)
+        fundis_changed(fundi_ids)
+        token = _bulk_change.set(True)
+        try:
+            yield
+        finally:
+            _bulk_change.reset(token)
+
+
+def delete_in_bulk(queryset, bookings):
+    """queryset.delete(), marking the fundis of bookings (what goes with it) changed once."""
+    fundi_ids = bookings.values_list('fundi_id', flat=True)
+    with bulk_change(fundi_ids, Fundi.objects.filter(pk__in=fundi_ids).values_list('category', flat=True)):
+        return queryset.delete()
+
+
+def fundi_page_stamp(request, fundi_id):
+    return Fundi.objects.filter(pk=fundi_id).values_list('updated_at', flat=True).first()
+
+
+def booking_page_stamp(request, booking_id):
+    row = Booking.objects.filter(pk=booking_id).values_list(
+        'customer_id', 'fundi__user_id', 'updated_at', 'fundi__updated_at',
+        'payment__updated_at', 'payment__status', 'payment__payment_method', 'payment__checkout_request_id',
+        'review__pk',
+    ).first()
+    if row is None or request.user.pk not in row[:2]:
+        return None  # the view answers with a 404 or a redirect
+    status, method, checkout_request_id = row[5:8]
+    if method == 'mpesa' and checkout_request_id and status in ('pending', 'failed'):
+        return None  # the view asks Daraja for news, so it must run
+    return row
+
+
+def bookings_page_stamp(request):
+    user = request.user
+    if user.is_fundi:
+        bookings = Booking.objects.filter(fundi__user=OuterRef('pk')).order_by().values('fundi__user')
+    else:
+        bookings = Booking.objects.filter(customer=OuterRef('pk')).order_by().values('customer')
+    jobs = JobRequest.objects.filter(customer=OuterRef('pk')).order_by().values('customer')
+    return User.objects.filter(pk=user.pk).values_list(
+        Subquery(bookings.annotate(n=Count('pk')).values('n')),
+        Subquery(bookings.annotate(t=Max('updated_at')).values('t')),
+        Subquery(bookings.annotate(t=Max('fundi__updated_at')).values('t')),
+        # Jobs only ever leave 'open' for a final status, so these counts move on every change.
+        Subquery(jobs.annotate(n=Count('pk')).values('n')),
+        Subquery(jobs.annotate(n=Count('pk', filter=Q(status='open'))).values('n')),
+        Subquery(jobs.annotate(n=Count('pk', filter=Q(status='assigned'))).values('n')),
+    ).first()
+
+
+def conditional_page(page_stamp):
+    """View decorator: an ETag from page_stamp(request, *args, **kwargs), and a 304 when it matches.
+
+    page_stamp returns None when the page must always run (the view redirects, 404s or
+    has work to do); such responses get no ETag.
+    """
+    def etag(request, *args, **kwargs):
+        if len(get_messages(request)):
+            return None  # the page would show them
+        stamp = page_stamp(request, *args, **kwargs)
+        if stamp is None:
+            return None
+        user = request.user
+        viewer = (user.pk, user.get_username(), getattr(user, 'is_fundi', False), user.is_staff)
+        csrf = request.COOKIES.get(settings.CSRF_COOKIE_NAME, '')
+        return sha256(repr((RELEASE, viewer, csrf, stamp)).encode()).hexdigest()[:32]
+
+    def decorator(view):
+        return cache_control(private=True, no_cache=True)(condition(etag_func=etag)(view))
+    return decorator
+
+
+@receiver(post_init, sender=User)
+def _remember_user(sender, instance, **kwargs):
+    instance._shown_fields = tuple(instance.__dict__.get(name) for name in SHOWN_USER_FIELDS)
+
+
+@receiver(post_save, sender=User)
+def _user_changed(sender, instance, created, **kwargs):
+    shown = tuple(instance.__dict__.get(name) for name in SHOWN_USER_FIELDS)
+    if created or shown == instance._shown_fields:
+        return  # logins and password changes do not show anywhere
+    instance._shown_fields = shown
+    # A fundi's own profile and cards, and the profiles listing this user's bookings and reviews.
+    own = list(Fundi.objects.filter(user=instance).values_list('pk', 'category'))
+    booked = Booking.objects.filter(customer=instance).values_list('fundi_id', flat=True).distinct()
+    profiles_changed({fundi_id for fundi_id, _ in own} | set(booked), [category for _, category in own])
+
+
+@receiver(post_save, sender=Booking)
+@receiver(post_delete, sender=Booking)
+def _booking_changed(sender, instance, **kwargs):
+    if in_bulk_change():
+        return
+    profiles_changed([instance.fundi_id])
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def _review_changed(sender, instance, **kwargs):
+    if in_bulk_change():
+        return
+    fundi = Booking.objects.filter(pk=instance.booking_id).values_list('fundi_id', 'fundi__category').first()
+    if fundi is not None:
+        profiles_changed([fundi[0]], [fundi[1]])
@@ -1,20 +1,33 @@
 from django.shortcuts import render, redirect, get_object_or_404
-from django.contrib.auth import login, authenticate
+from django.contrib.auth import login
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
-from django.db.models import Q, Avg, Count, Sum
+from django.db.models import Q, Count, F, Sum
+from django.db.models.functions import Coalesce
 from django.core.paginator import Paginator
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.db import transaction
 from django.views.decorators.csrf import csrf_exempt
-from django.http import JsonResponse, HttpResponse
+from django.http import Http404, JsonResponse, HttpResponse
 from django.conf import settings
+from django.urls import reverse
 from django import forms
 import json
 from datetime import timedelta
 from urllib.parse import urlparse
-from .models import User, Fundi, Service, Booking, Review, Payment
-from .forms import CustomUserCreationForm, FundiProfileForm, BookingForm, ReviewForm, PaymentForm, ContactFundiForm
+from .models import User, Fundi, Service, Booking, Review, Payment, ArchivedBooking, ArchivedPayment, FundiTimeOff, JobOffer, JobRequest
+from .forms import CustomUserCreationForm, FundiProfileForm, BookingForm, ReviewForm, PaymentForm, ContactFundiForm, WorkingHoursFormSet, FundiTimeOffForm, JobRequestForm
 from .mpesa_utils import initiate_stk_push, query_stk_status
+from .exports import stream_csv
+from .archive import archived_or_404, archived_totals
+from .availability import MAX_SLOT_DAYS, free_slots, unavailable_reason
+from .matching import match_fundis
+from .dispatch import accept_offer, cancel_job, decline_offer, offer_job
+from .bulk_actions import BOOKING_BULK_ACTIONS, MAX_TICKED_ROWS, PAYMENT_BULK_ACTIONS
+from .transitions import set_booking_status, set_payment_status, transition_booking, transition_payment
+from .ratelimit import rate_limit
+from .versions import booking_page_stamp, bookings_page_stamp, conditional_page, delete_in_bulk, fundi_page_stamp
 
 
 def _sync_mpesa_payment_with_stk_query(payment, booking):
@@ -38,17 +51,8 @@ def _sync_mpesa_payment_with_stk_query(payment, booking):
         result_desc = stk_status.get('result_description', '')
 
         if result_code == '0':
-            payment.status = 'completed'
-            if not payment.completed_at:
-                payment.completed_at = timezone.now()
-            if not payment.transaction_id:
-                payment.transaction_id = payment.checkout_request_id
-            payment.save(update_fields=['status', 'completed_at', 'transaction_id'])
-
-            if booking.status != 'completed':
-                booking.status = 'completed'
-                booking.save(update_fields=['status'])
-
+            # Loses quietly if the callback completed the payment meanwhile.
+            transition_payment(payment, 'completed', transaction_id=payment.transaction_id or payment.checkout_request_id)
             booking.refresh_from_db()
             payment.refresh_from_db()
         elif payment.status == 'pending' and result_code:
@@ -65,10 +69,7 @@ def home(request):
     """Home page with featured fundis and categories"""
     categories = Service.CATEGORY_CHOICES
     # Get all available fundis, prioritizing those with ratings but including new ones
-    featured_fundis = Fundi.objects.filter(is_available=True).annotate(
-        avg_rating=Avg('fundi_bookings__review__rating'),
-        review_count=Count('fundi_bookings__review')
-    ).order_by('-review_count', '-avg_rating', '-created_at')[:12]  # Show up to 12 fundis, including new ones
+    featured_fundis = Fundi.objects.filter(is_available=True).with_lifetime_stats().order_by('-review_count', '-avg_rating', '-created_at')[:12]  # Show up to 12 fundis, including new ones
     
     # Get recent testimonials/reviews for home page (visible to all, no login required)
     recent_reviews = Review.objects.select_related(
@@ -91,15 +92,12 @@ def register(request):
         form = CustomUserCreationForm(request.POST)
         if form.is_valid():
             user = form.save()
-            username = form.cleaned_data.get('username')
-            password = form.cleaned_data.get('password1')
-            user = authenticate(username=username, password=password)
-            if user:
-                login(request, user)
-                messages.success(request, f'Account created successfully! Welcome {username}')
-                if user.is_fundi:
-                    return redirect('create_fundi_profile')
-                return redirect('home')
+            # Saving hashed the password; authenticate() would hash it a second time to check it.
+            login(request, user, backend='services.user_cache.CachedUserBackend')
+            messages.success(request, f'Account created successfully! Welcome {user.username}')
+            if user.is_fundi:
+                return redirect('create_fundi_profile')
+            return redirect('home')
     else:
         form = CustomUserCreationForm()
     return render(request, 'services/register.html', {'form': form})
@@ -108,7 +106,7 @@ def register(request):
 @login_required
 def create_fundi_profile(request):
     """Create fundi profile after registration"""
-    if hasattr(request.user, 'fundi_profile'):
+    if request.user.fundi_profile_id is not None:
         messages.info(request, 'You already have a fundi profile!')
         return redirect('fundi_dashboard')
     
@@ -131,8 +129,18 @@ def create_fundi_profile(request):
 @login_required
 def fundi_list(request):
     """List all available fundis with filters"""
+    return _fundi_list_page(request, request.GET.get('category'))
+
+
+def category_fundis(request, category):
+    """Public landing page for one category (pre-rendered for visitors, see services/prerender.py)"""
+    if category not in dict(Service.CATEGORY_CHOICES):
+        raise Http404('Unknown category')
+    return _fundi_list_page(request, category)
+
+
+def _fundi_list_page(request, category):
     fundis = Fundi.objects.filter(is_available=True)
-    category = request.GET.get('category')
     search = request.GET.get('search')
     sort_by = request.GET.get('sort', 'rating')
     
@@ -147,11 +155,8 @@ def fundi_list(request):
             Q(bio__icontains=search)
         )
     
-    # Annotate with average rating
-    fundis = fundis.annotate(
-        avg_rating=Avg('fundi_bookings__review__rating'),
-        review_count=Count('fundi_bookings__review')
-    )
+    # Annotate with average rating (archived reviews included)
+    fundis = fundis.with_lifetime_stats()
     
     if sort_by == 'rating':
         fundis = fundis.order_by('-avg_rating', '-review_count', '-created_at')
@@ -176,19 +181,22 @@ def fundi_list(request):
     return render(request, 'services/fundi_list.html', context)
 
 
+@conditional_page(fundi_page_stamp)
 def fundi_detail(request, fundi_id):
     """Fundi profile page"""
-    fundi = get_object_or_404(Fundi, id=fundi_id)
+    fundi = get_object_or_404(Fundi.objects.select_related('user', 'archive_stats'), id=fundi_id)
     
     # Get all reviews with pagination
-    all_reviews = Review.objects.filter(booking__fundi=fundi).order_by('-created_at')
+    all_reviews = Review.objects.filter(booking__fundi=fundi).select_related(
+        'booking__customer', 'booking__service'
+    ).order_by('-created_at')
     paginator = Paginator(all_reviews, 5)
     page_number = request.GET.get('review_page')
     reviews_page = paginator.get_page(page_number)
     
     # Get recent bookings
-    recent_bookings = Booking.objects.filter(fundi=fundi).order_by('-created_at')[:10]
-    total_completed = Booking.objects.filter(fundi=fundi, status='completed').count()
+    recent_bookings = Booking.objects.filter(fundi=fundi).select_related('customer', 'service').order_by('-created_at')[:10]
+    total_completed = Booking.objects.filter(fundi=fundi, status='completed').count() + fundi.archived_stats.completed_bookings
     
     # Check if user has completed bookings with this fundi (for review button)
     can_review = False
@@ -224,9 +232,18 @@ def create_booking(request, fundi_id):
             booking = form.save(commit=False)
             booking.customer = request.user
             booking.fundi = fundi
-            booking.save()
-            messages.success(request, 'Booking request created successfully!')
-            return redirect('booking_detail', booking_id=booking.id)
+            booking.set_end_date()
+            with transaction.atomic():
+                # Lock the fundi so two customers cannot take the same slot at once.
+                Fundi.objects.select_for_update().filter(pk=fundi.pk).first()
+                reason = unavailable_reason(fundi, booking.booking_date, booking.end_date)
+                if reason is None:
+                    booking.save()
+            if reason is None:
+                messages.success(request, 'Booking request created successfully!')
+                return redirect('booking_detail', booking_id=booking.id)
+            form.add_error('booking_date', reason)
+            messages.error(request, reason)
     else:
         form = BookingForm(fundi=fundi)
         form.fields['fundi'].widget = forms.HiddenInput()
@@ -240,6 +257,45 @@ def create_booking(request, fundi_id):
 
 
 @login_required
+def post_job(request):
+    """Post a job for the dispatcher to offer to suitable fundis"""
+    if request.method == 'POST':
+        form = JobRequestForm(request.POST)
+        if form.is_valid():
+            job = form.save(commit=False)
+            job.customer = request.user
+            job.save()
+            offer_job(job)
+            messages.success(request, 'Job posted. We are offering it to suitable fundis now.')
+            return redirect('job_detail', job_id=job.id)
+    else:
+        form = JobRequestForm(initial={'address': request.user.address})
+    
+    return render(request, 'services/post_job.html', {'form': form})
+
+
+@login_required
+def job_detail(request, job_id):
+    """Customer view of a posted job"""
+    job = get_object_or_404(JobRequest.objects.select_related('service', 'booking__fundi__user'), id=job_id, customer=request.user)
+    
+    if request.method == 'POST' and request.POST.get('action') == 'cancel':
+        if cancel_job(job):
+            messages.success(request, 'Job cancelled.')
+        else:
+            messages.error(request, 'This job can no longer be cancelled.')
+        return redirect('job_detail', job_id=job.id)
+    
+    context = {
+        'job': job,
+        'offers_out': job.offers.filter(status='offered', expires_at__gt=timezone.now()).count(),
+        'offers_total': job.offers.count(),
+    }
+    return render(request, 'services/job_detail.html', context)
+
+
+@login_required
+@conditional_page(booking_page_stamp)
 def booking_detail(request, booking_id):
     """View booking details"""
     booking = get_object_or_404(Booking, id=booking_id)
@@ -278,15 +334,18 @@ def booking_detail(request, booking_id):
 
 
 @login_required
+@conditional_page(bookings_page_stamp)
 def my_bookings(request):
     """User's bookings"""
     if request.user.is_fundi:
         bookings = Booking.objects.filter(fundi__user=request.user).order_by('-created_at')
     else:
         bookings = Booking.objects.filter(customer=request.user).order_by('-created_at')
+    bookings = bookings.select_related('service', 'customer', 'fundi__user')
     
     context = {
         'bookings': bookings,
+        'jobs': JobRequest.objects.filter(customer=request.user).select_related('service').order_by('-created_at')[:10],
     }
     return render(request, 'services/my_bookings.html', context)
 
@@ -302,15 +361,29 @@ def update_booking_status(request, booking_id):
     
     if request.method == 'POST':
         new_status = request.POST.get('status')
-        if new_status in dict(Booking.STATUS_CHOICES):
-            booking.status = new_status
-            booking.save()
-            messages.success(request, f'Booking status updated to {booking.get_status_display()}')
+        if new_status == booking.status:
+            messages.info(request, f'Booking is already {booking.get_status_display()}.')
+        elif new_status in dict(Booking.STATUS_CHOICES):
+            if transition_booking(booking, new_status):
+                messages.success(request, f'Booking status updated to {booking.get_status_display()}')
+            else:
+                _status_refused(request, booking, new_status)
     
     return redirect('booking_detail', booking_id=booking_id)
 
 
+def _status_refused(request, obj, new_status):
+    """Explain a refused transition using the status now in the database (it may have just changed)"""
+    obj.refresh_from_db(fields=['status'])
+    name = obj._meta.verbose_name
+    messages.error(
+        request,
+        f'This {name} is {obj.get_status_display()} and cannot be changed to {dict(obj.STATUS_CHOICES)[new_status]}.',
+    )
+
+
 @login_required
+@rate_limit('create_payment')
 def create_payment(request, booking_id):
     """Create payment for a booking"""
     booking = get_object_or_404(Booking, id=booking_id)
@@ -415,9 +488,7 @@ def create_payment(request, booking_id):
                 payment.save()
                 
                 # Automatically update booking status to completed when payment is completed
-                if booking.status != 'completed':
-                    booking.status = 'completed'
-                    booking.save()
+                transition_booking(booking, 'completed')
                 
                 messages.success(request, 'Payment completed successfully!')
             
@@ -481,8 +552,9 @@ def fundi_dashboard(request):
         return redirect('create_fundi_profile')
     
     bookings = Booking.objects.filter(fundi=fundi).order_by('-created_at')[:10]
-    total_bookings = Booking.objects.filter(fundi=fundi).count()
-    completed_bookings = Booking.objects.filter(fundi=fundi, status='completed').count()
+    archived = fundi.archived_stats
+    total_bookings = Booking.objects.filter(fundi=fundi).count() + archived.bookings
+    completed_bookings = Booking.objects.filter(fundi=fundi, status='completed').count() + archived.completed_bookings
     pending_bookings = Booking.objects.filter(fundi=fundi, status='pending').count()
     
     context = {
@@ -491,10 +563,48 @@ def fundi_dashboard(request):
         'total_bookings': total_bookings,
         'completed_bookings': completed_bookings,
         'pending_bookings': pending_bookings,
+        'offers': _live_offers(fundi),
     }
     return render(request, 'services/fundi_dashboard.html', context)
 
 
+def _live_offers(fundi):
+    return (
+        JobOffer.objects.filter(fundi=fundi, status='offered', expires_at__gt=timezone.now())
+        .select_related('job__service').order_by('expires_at')
+    )
+
+
+@login_required
+def fundi_job_offers(request):
+    """Fundi's live job offers, as an HTML fragment the dashboard polls"""
+    # The profile id comes with the cached user, so polling costs only the offers query.
+    fundi_id = request.user.fundi_profile_id
+    if fundi_id is None:
+        return HttpResponse(status=404)
+    return render(request, 'services/partials/job_offers.html', {'offers': _live_offers(fundi_id)})
+
+
+@login_required
+def respond_job_offer(request, offer_id):
+    """Fundi accepts or declines a job offer"""
+    offer = get_object_or_404(JobOffer.objects.select_related('job', 'fundi'), id=offer_id, fundi__user=request.user)
+    if request.method != 'POST':
+        return redirect('fundi_dashboard')
+    
+    if request.POST.get('action') == 'accept':
+        booking, reason = accept_offer(offer)
+        if booking is None:
+            messages.error(request, reason)
+            return redirect('fundi_dashboard')
+        messages.success(request, 'Job accepted. It is now one of your bookings.')
+        return redirect('booking_detail', booking_id=booking.id)
+    
+    decline_offer(offer)
+    messages.info(request, 'Offer declined.')
+    return redirect('fundi_dashboard')
+
+
 @login_required
 def edit_fundi_profile(request):
     """Edit fundi profile"""
@@ -520,6 +630,107 @@ def edit_fundi_profile(request):
     return render(request, 'services/edit_fundi_profile.html', context)
 
 
+@login_required
+def fundi_availability(request):
+    """Fundi sets weekly working hours and blocks out time off"""
+    try:
+        fundi = request.user.fundi_profile
+    except Fundi.DoesNotExist:
+        messages.error(request, 'You need to create a fundi profile first.')
+        return redirect('create_fundi_profile')
+    
+    formset = WorkingHoursFormSet(instance=fundi)
+    time_off_form = FundiTimeOffForm()
+    if request.method == 'POST':
+        if 'delete_time_off' in request.POST:
+            fundi.time_off.filter(pk=request.POST.get('delete_time_off')).delete()
+            messages.success(request, 'Time off removed.')
+            return redirect('fundi_availability')
+        if 'add_time_off' in request.POST:
+            time_off_form = FundiTimeOffForm(request.POST, instance=FundiTimeOff(fundi=fundi))
+            if time_off_form.is_valid():
+                time_off_form.save()
+                messages.success(request, 'Time off added.')
+                return redirect('fundi_availability')
+        else:
+            formset = WorkingHoursFormSet(request.POST, instance=fundi)
+            if formset.is_valid():
+                formset.save()
+                messages.success(request, 'Working hours updated.')
+                return redirect('fundi_availability')
+    
+    context = {
+        'fundi': fundi,
+        'formset': formset,
+        'time_off_form': time_off_form,
+        'time_off': fundi.time_off.filter(end__gt=timezone.now()),
+        'uses_default_hours': not fundi.working_hours.exists(),
+    }
+    return render(request, 'services/fundi_availability.html', context)
+
+
+def fundi_free_slots(request, fundi_id):
+    """Next free booking slots for a fundi, as JSON"""
+    fundi = get_object_or_404(Fundi, id=fundi_id)
+    now = timezone.now()
+    try:
+        hours = min(max(int(request.GET.get('hours', 1)), 1), 24)
+        days = min(max(int(request.GET.get('days', 7)), 1), MAX_SLOT_DAYS)
+        limit = min(max(int(request.GET.get('limit', 10)), 1), 50)
+        start = parse_datetime(request.GET['from']) if request.GET.get('from') else now
+        if start is None:
+            raise ValueError
+    except ValueError:
+        return JsonResponse({'error': 'hours, days and limit must be numbers and from an ISO date-time.'}, status=400)
+    if timezone.is_naive(start):
+        start = timezone.make_aware(start)
+    
+    slots = free_slots(fundi, max(start, now), timedelta(hours=hours), days=days, limit=limit)
+    return JsonResponse({
+        'fundi': fundi.id,
+        'hours': hours,
+        'slots': [{'start': slot_start.isoformat(), 'end': slot_end.isoformat()} for slot_start, slot_end in slots],
+    })
+
+
+def fundi_matches(request):
+    """Ranked shortlist of fundis for a job, as JSON"""
+    category = request.GET.get('category')
+    if category not in dict(Service.CATEGORY_CHOICES):
+        return JsonResponse({'error': 'Choose a valid category.'}, status=400)
+    try:
+        hours = min(max(int(request.GET.get('hours', 1)), 1), 24)
+        limit = min(max(int(request.GET.get('limit', 10)), 1), 50)
+        budget = float(request.GET['budget']) if request.GET.get('budget') else None
+        start = parse_datetime(request.GET['start']) if request.GET.get('start') else None
+        if request.GET.get('start') and start is None:
+            raise ValueError
+    except ValueError:
+        return JsonResponse({'error': 'hours, limit and budget must be numbers and start an ISO date-time.'}, status=400)
+    if start is not None and timezone.is_naive(start):
+        start = timezone.make_aware(start)
+    if start is not None and start < timezone.now():
+        return JsonResponse({'error': 'start must be in the future.'}, status=400)
+    
+    matches = match_fundis(category, start=start, hours=hours, budget=budget, location=request.GET.get('location'), limit=limit)
+    fundis = Fundi.objects.select_related('user').in_bulk([match['fundi_id'] for match in matches])
+    results = []
+    for match in matches:
+        fundi = fundis.get(match['fundi_id'])
+        if fundi is None:
+            continue
+        results.append({
+            **match,
+            'name': fundi.user.get_full_name() or fundi.user.username,
+            'hourly_rate': str(fundi.hourly_rate),
+            'experience_years': fundi.experience_years,
+            'url': reverse('fundi_detail', args=[fundi.id]),
+            'book_url': reverse('create_booking', args=[fundi.id]),
+        })
+    return JsonResponse({'category': category, 'hours': hours, 'results': results})
+
+
+@rate_limit('contact_fundi')
 def contact_fundi(request, fundi_id):
     """Contact fundi form"""
     fundi = get_object_or_404(Fundi, id=fundi_id)
@@ -561,8 +772,9 @@ def is_admin(user):
 @user_passes_test(is_admin)
 def admin_dashboard(request):
     """Admin dashboard overview"""
-    # Statistics
-    total_bookings = Booking.objects.count()
+    # Statistics (archived bookings and payments are counted through their totals)
+    archived = archived_totals()
+    total_bookings = Booking.objects.count() + archived['bookings']
     total_fundis = Fundi.objects.count()
     total_customers = User.objects.filter(is_fundi=False).count()
     total_users = User.objects.count()
@@ -574,15 +786,15 @@ def admin_dashboard(request):
     
     # Status counts
     pending_bookings = Booking.objects.filter(status='pending').count()
-    completed_bookings = Booking.objects.filter(status='completed').count()
+    completed_bookings = Booking.objects.filter(status='completed').count() + archived['completed_bookings']
     active_fundis = Fundi.objects.filter(is_available=True).count()
     
     # Payment statistics
-    total_payments = Payment.objects.count()
-    completed_payments = Payment.objects.filter(status='completed').count()
+    total_payments = Payment.objects.count() + archived['payments']
+    completed_payments = Payment.objects.filter(status='completed').count() + archived['completed_payments']
     pending_payments = Payment.objects.filter(status='pending').count()
-    failed_payments = Payment.objects.filter(status='failed').count()
-    total_revenue = Payment.objects.filter(status='completed').aggregate(total=Sum('amount'))['total'] or 0
+    failed_payments = Payment.objects.filter(status='failed').count() + archived['failed_payments']
+    total_revenue = (Payment.objects.filter(status='completed').aggregate(total=Sum('amount'))['total'] or 0) + archived['revenue']
     
     context = {
         'total_bookings': total_bookings,
@@ -608,9 +820,50 @@ def admin_dashboard(request):
 @user_passes_test(is_admin)
 def admin_bookings(request):
     """Admin view all bookings"""
-    bookings = Booking.objects.select_related('customer', 'fundi__user', 'service').order_by('-created_at')
+    bookings, status_filter, search_query = _admin_bookings_filtered(request)
+    bookings = bookings.select_related('customer', 'fundi__user', 'service').order_by('-created_at')
     
-    # Filters
+    paginator = Paginator(bookings, 20)
+    page_number = request.GET.get('page')
+    page_obj = paginator.get_page(page_number)
+    
+    context = {
+        'page_obj': page_obj,
+        'status_filter': status_filter,
+        'search_query': search_query,
+        'status_choices': Booking.STATUS_CHOICES,
+        'bulk_actions': [(key, label) for key, (label, _) in BOOKING_BULK_ACTIONS.items()],
+    }
+    return render(request, 'services/admin/bookings.html', context)
+
+
+@login_required
+@user_passes_test(is_admin)
+def admin_bookings_bulk(request):
+    """Admin apply a status action to the selected bookings (or every booking matching the filters)"""
+    if request.method == 'POST':
+        action = BOOKING_BULK_ACTIONS.get(request.POST.get('action'))
+        if action is None:
+            messages.error(request, 'Choose an action to apply.')
+        else:
+            label, status = action
+            bookings, _, _ = _admin_bookings_filtered(request)
+            changed = set_booking_status(_bulk_selection(request, bookings), status)
+            messages.success(request, f'{label}: {changed} booking(s) updated.')
+    return redirect(f"{reverse('admin_bookings')}?{request.GET.urlencode()}")
+
+
+def _bulk_selection(request, queryset):
+    """The rows a bulk action applies to: ticked ids, or the whole filtered queryset for "select all"."""
+    if request.POST.get('select_all') == '1':
+        return queryset
+    ids = [int(pk) for pk in request.POST.getlist('ids')[:MAX_TICKED_ROWS] if pk.isdigit()]
+    return queryset.filter(pk__in=ids)
+
+
+def _admin_bookings_filtered(request):
+    """Bookings matching the admin_bookings filters in request.GET (shared with the CSV export)"""
+    bookings = Booking.objects.all()
     status_filter = request.GET.get('status')
     search_query = request.GET.get('search')
     
@@ -625,38 +878,39 @@ def admin_bookings(request):
             Q(service__name__icontains=search_query) |
             Q(description__icontains=search_query)
         )
-    
-    paginator = Paginator(bookings, 20)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
-    
-    context = {
-        'page_obj': page_obj,
-        'status_filter': status_filter,
-        'search_query': search_query,
-        'status_choices': Booking.STATUS_CHOICES,
-    }
-    return render(request, 'services/admin/bookings.html', context)
+    return bookings, status_filter, search_query
+
+
+@login_required
+@user_passes_test(is_admin)
+def admin_export_bookings(request):
+    """Admin download bookings matching the current filters as CSV"""
+    bookings, _, _ = _admin_bookings_filtered(request)
+    rows = bookings.order_by('-created_at').values_list(
+        'id', 'created_at', 'customer__username', 'customer__email', 'fundi__user__username',
+        'service__name', 'booking_date', 'estimated_hours', 'fundi__hourly_rate', 'status', 'address',
+    ).iterator(chunk_size=2000)
+    header = [
+        'Booking ID', 'Created', 'Customer', 'Customer Email', 'Fundi',
+        'Service', 'Booking Date', 'Hours', 'Hourly Rate', 'Status', 'Address',
+    ]
+    filename = f"bookings-{timezone.now():%Y%m%d-%H%M}.csv"
+    return stream_csv(filename, header, rows)
 
 
 @login_required
 @user_passes_test(is_admin)
 def admin_booking_detail(request, booking_id):
-    """Admin view booking detail"""
-    booking = get_object_or_404(Booking.objects.select_related('customer', 'fundi__user', 'service'), id=booking_id)
+    """Admin view booking detail (archived bookings open read-only)"""
+    booking = archived_or_404(
+        Booking.objects.select_related('customer', 'fundi__user', 'service'),
+        ArchivedBooking.objects.select_related('customer', 'fundi__user', 'service'),
+        id=booking_id,
+    )
     
     # Get related payment and review
-    payment = None
-    review = None
-    try:
-        payment = booking.payment
-    except Payment.DoesNotExist:
-        pass
-    
-    try:
-        review = booking.review
-    except Review.DoesNotExist:
-        pass
+    payment = getattr(booking, 'payment', None)
+    review = getattr(booking, 'review', None)
     
     context = {
         'booking': booking,
@@ -674,10 +928,11 @@ def admin_edit_booking(request, booking_id):
     
     if request.method == 'POST':
         status = request.POST.get('status')
-        if status in dict(Booking.STATUS_CHOICES):
-            booking.status = status
-            booking.save()
-            messages.success(request, f'Booking status updated to {booking.get_status_display()}')
+        if status in dict(Booking.STATUS_CHOICES) and status != booking.status:
+            if transition_booking(booking, status):
+                messages.success(request, f'Booking status updated to {booking.get_status_display()}')
+            else:
+                _status_refused(request, booking, status)
             return redirect('admin_booking_detail', booking_id=booking_id)
     
     return redirect('admin_booking_detail', booking_id=booking_id)
@@ -702,10 +957,7 @@ def admin_delete_booking(request, booking_id):
 @user_passes_test(is_admin)
 def admin_fundis(request):
     """Admin view all fundis"""
-    fundis = Fundi.objects.select_related('user').annotate(
-        avg_rating=Avg('fundi_bookings__review__rating'),
-        total_bookings=Count('fundi_bookings')
-    ).order_by('-created_at')
+    fundis = Fundi.objects.select_related('user').with_lifetime_stats().order_by('-created_at')
     
     # Filters
     category_filter = request.GET.get('category')
@@ -749,7 +1001,7 @@ def admin_fundi_detail(request, fundi_id):
     """Admin view fundi detail"""
     fundi = get_object_or_404(Fundi.objects.select_related('user'), id=fundi_id)
     bookings = Booking.objects.filter(fundi=fundi).order_by('-created_at')[:10]
-    total_bookings = Booking.objects.filter(fundi=fundi).count()
+    total_bookings = Booking.objects.filter(fundi=fundi).count() + fundi.archived_stats.bookings
     
     context = {
         'fundi': fundi,
@@ -856,7 +1108,9 @@ def admin_delete_fundi(request, fundi_id):
     
     if request.method == 'POST':
         username = fundi.user.username
-        fundi.user.delete()  # This will also delete the fundi due to CASCADE
+        # This will also delete the fundi and their bookings due to CASCADE; only the fundis
+        # this user booked as a customer are left to mark changed.
+        delete_in_bulk(User.objects.filter(pk=fundi.user_id), Booking.objects.filter(customer_id=fundi.user_id))
         messages.success(request, f'Fundi {username} deleted successfully!')
         return redirect('admin_fundis')
     
@@ -868,22 +1122,13 @@ def admin_delete_fundi(request, fundi_id):
 @user_passes_test(is_admin)
 def admin_customers(request):
     """Admin view all customers"""
-    customers = User.objects.filter(is_fundi=False).order_by('-date_joined')
-    
-    # Filters
-    search_query = request.GET.get('search')
-    
-    if search_query:
-        customers = customers.filter(
-            Q(username__icontains=search_query) |
-            Q(email__icontains=search_query) |
-            Q(first_name__icontains=search_query) |
-            Q(last_name__icontains=search_query) |
-            Q(phone_number__icontains=search_query)
-        )
+    customers, search_query = _admin_customers_filtered(request)
+    customers = customers.order_by('-date_joined')
     
     # Annotate with booking count
-    customers = customers.annotate(booking_count=Count('customer_bookings'))
+    customers = customers.annotate(
+        booking_count=Count('customer_bookings') + Coalesce(F('archive_stats__bookings'), 0)
+    )
     
     paginator = Paginator(customers, 20)
     page_number = request.GET.get('page')
@@ -896,6 +1141,41 @@ def admin_customers(request):
     return render(request, 'services/admin/customers.html', context)
 
 
+def _admin_customers_filtered(request):
+    """Customers matching the admin_customers filters in request.GET (shared with the CSV export)"""
+    customers = User.objects.filter(is_fundi=False)
+    search_query = request.GET.get('search')
+    
+    if search_query:
+        customers = customers.filter(
+            Q(username__icontains=search_query) |
+            Q(email__icontains=search_query) |
+            Q(first_name__icontains=search_query) |
+            Q(last_name__icontains=search_query) |
+            Q(phone_number__icontains=search_query)
+        )
+    return customers, search_query
+
+
+@login_required
+@user_passes_test(is_admin)
+def admin_export_customers(request):
+    """Admin download customers matching the current filters as CSV"""
+    customers, _ = _admin_customers_filtered(request)
+    rows = customers.order_by('-date_joined').annotate(
+        booking_count=Count('customer_bookings') + Coalesce(F('archive_stats__bookings'), 0)
+    ).values_list(
+        'id', 'username', 'first_name', 'last_name', 'email', 'phone_number',
+        'address', 'date_joined', 'last_login', 'booking_count',
+    ).iterator(chunk_size=2000)
+    header = [
+        'User ID', 'Username', 'First Name', 'Last Name', 'Email', 'Phone',
+        'Address', 'Joined', 'Last Login', 'Bookings',
+    ]
+    filename = f"customers-{timezone.now():%Y%m%d-%H%M}.csv"
+    return stream_csv(filename, header, rows)
+
+
 @login_required
 @user_passes_test(is_admin)
 def admin_add_customer(request):
@@ -942,15 +1222,20 @@ def admin_customer_detail(request, user_id):
     """Admin view customer detail"""
     customer = get_object_or_404(User, id=user_id, is_fundi=False)
     bookings = Booking.objects.filter(customer=customer).order_by('-created_at')
-    total_bookings = bookings.count()
+    archived_bookings = ArchivedBooking.objects.filter(customer=customer).select_related(
+        'fundi__user', 'service'
+    ).order_by('-created_at')
+    total_bookings = bookings.count() + archived_bookings.count()
     
     paginator = Paginator(bookings, 10)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
+    archived_page = Paginator(archived_bookings, 10).get_page(request.GET.get('archived_page'))
     
     context = {
         'customer': customer,
         'page_obj': page_obj,
+        'archived_page': archived_page,
         'total_bookings': total_bookings,
     }
     return render(request, 'services/admin/customer_detail.html', context)
@@ -961,10 +1246,7 @@ def admin_customer_detail(request, user_id):
 def admin_fundi_activity(request):
     """Admin view fundi login/registration activity"""
     # Get all fundis with their registration date and last login
-    fundis = Fundi.objects.select_related('user').annotate(
-        total_bookings=Count('fundi_bookings'),
-        avg_rating=Avg('fundi_bookings__review__rating')
-    ).order_by('-created_at')
+    fundis = Fundi.objects.select_related('user').with_lifetime_stats().order_by('-created_at')
     
     # Get recently registered fundis (last 30 days)
     thirty_days_ago = timezone.now() - timedelta(days=30)
@@ -986,9 +1268,54 @@ def admin_fundi_activity(request):
 @user_passes_test(is_admin)
 def admin_payments(request):
     """Admin view all payments"""
-    payments = Payment.objects.select_related('booking__customer', 'booking__fundi__user', 'booking__service').order_by('-created_at')
+    payments, status_filter, method_filter, search_query = _admin_payments_filtered(request)
+    payments = payments.select_related('booking__customer', 'booking__fundi__user', 'booking__service').order_by('-created_at')
     
-    # Filters
+    paginator = Paginator(payments, 20)
+    page_number = request.GET.get('page')
+    page_obj = paginator.get_page(page_number)
+    
+    # Statistics
+    total_revenue = (
+        (Payment.objects.filter(status='completed').aggregate(total=Sum('amount'))['total'] or 0)
+        + archived_totals()['revenue']
+    )
+    
+    context = {
+        'page_obj': page_obj,
+        'status_filter': status_filter,
+        'method_filter': method_filter,
+        'search_query': search_query,
+        'status_choices': Payment.STATUS_CHOICES,
+        'method_choices': Payment.PAYMENT_METHOD_CHOICES,
+        'total_revenue': total_revenue,
+        'bulk_actions': [(key, label) for key, (label, _) in PAYMENT_BULK_ACTIONS.items()],
+    }
+    return render(request, 'services/admin/payments.html', context)
+
+
+@login_required
+@user_passes_test(is_admin)
+def admin_payments_bulk(request):
+    """Admin apply a status action to the selected payments (or every payment matching the filters)"""
+    if request.method == 'POST':
+        action = PAYMENT_BULK_ACTIONS.get(request.POST.get('action'))
+        if action is None:
+            messages.error(request, 'Choose an action to apply.')
+        else:
+            label, status = action
+            payments, _, _, _ = _admin_payments_filtered(request)
+            changed, bookings_completed = set_payment_status(_bulk_selection(request, payments), status)
+            message = f'{label}: {changed} payment(s) updated.'
+            if bookings_completed:
+                message += f' {bookings_completed} booking(s) marked completed.'
+            messages.success(request, message)
+    return redirect(f"{reverse('admin_payments')}?{request.GET.urlencode()}")
+
+
+def _admin_payments_filtered(request):
+    """Payments matching the admin_payments filters in request.GET (shared with the CSV export)"""
+    payments = Payment.objects.all()
     status_filter = request.GET.get('status')
     method_filter = request.GET.get('method')
     search_query = request.GET.get('search')
@@ -1007,33 +1334,36 @@ def admin_payments(request):
             Q(merchant_request_id__icontains=search_query) |
             Q(checkout_request_id__icontains=search_query)
         )
-    
-    paginator = Paginator(payments, 20)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
-    
-    # Statistics
-    total_revenue = Payment.objects.filter(status='completed').aggregate(total=Sum('amount'))['total'] or 0
-    
-    context = {
-        'page_obj': page_obj,
-        'status_filter': status_filter,
-        'method_filter': method_filter,
-        'search_query': search_query,
-        'status_choices': Payment.STATUS_CHOICES,
-        'method_choices': Payment.PAYMENT_METHOD_CHOICES,
-        'total_revenue': total_revenue,
-    }
-    return render(request, 'services/admin/payments.html', context)
+    return payments, status_filter, method_filter, search_query
+
+
+@login_required
+@user_passes_test(is_admin)
+def admin_export_payments(request):
+    """Admin download payments matching the current filters as CSV"""
+    payments, _, _, _ = _admin_payments_filtered(request)
+    rows = payments.order_by('-created_at').values_list(
+        'id', 'created_at', 'completed_at', 'amount', 'status', 'payment_method',
+        'transaction_id', 'checkout_request_id', 'booking_id',
+        'booking__customer__username', 'booking__fundi__user__username', 'booking__service__name',
+    ).iterator(chunk_size=2000)
+    header = [
+        'Payment ID', 'Created', 'Completed', 'Amount (KSh)', 'Status', 'Method',
+        'Transaction ID', 'Checkout Request ID', 'Booking ID',
+        'Customer', 'Fundi', 'Service',
+    ]
+    filename = f"payments-{timezone.now():%Y%m%d-%H%M}.csv"
+    return stream_csv(filename, header, rows)
 
 
 @login_required
 @user_passes_test(is_admin)
 def admin_payment_detail(request, payment_id):
-    """Admin view payment detail"""
-    payment = get_object_or_404(
+    """Admin view payment detail (archived payments open read-only)"""
+    payment = archived_or_404(
         Payment.objects.select_related('booking__customer', 'booking__fundi__user', 'booking__service'),
-        id=payment_id
+        ArchivedPayment.objects.select_related('booking__customer', 'booking__fundi__user', 'booking__service'),
+        id=payment_id,
     )
     booking = payment.booking
     
@@ -1051,18 +1381,11 @@ def admin_approve_payment(request, payment_id):
     payment = get_object_or_404(Payment, id=payment_id)
     
     if request.method == 'POST':
-        # Update payment status to completed
-        payment.status = 'completed'
-        payment.completed_at = timezone.now()
-        payment.save()
-        
-        # Automatically update booking status to completed
-        booking = payment.booking
-        if booking.status != 'completed':
-            booking.status = 'completed'
-            booking.save()
-        
-        messages.success(request, f'Payment #{payment.id} approved and marked as completed!')
+        # Completes the payment and its booking in one transaction
+        if transition_payment(payment, 'completed'):
+            messages.success(request, f'Payment #{payment.id} approved and marked as completed!')
+        else:
+            _status_refused(request, payment, 'completed')
         return redirect('admin_payment_detail', payment_id=payment.id)
     
     return redirect('admin_payment_detail', payment_id=payment.id)
@@ -1076,20 +1399,14 @@ def admin_update_payment_status(request, payment_id):
     
     if request.method == 'POST':
         new_status = request.POST.get('status')
-        if new_status in dict(Payment.STATUS_CHOICES):
-            payment.status = new_status
-            if new_status == 'completed' and not payment.completed_at:
-                payment.completed_at = timezone.now()
-            
-            # If marking as completed, also update booking
-            if new_status == 'completed':
-                booking = payment.booking
-                if booking.status != 'completed':
-                    booking.status = 'completed'
-                    booking.save()
-            
-            payment.save()
-            messages.success(request, f'Payment status updated to {payment.get_status_display()}')
+        if new_status == payment.status:
+            messages.info(request, f'Payment is already {payment.get_status_display()}.')
+        elif new_status in dict(Payment.STATUS_CHOICES):
+            # Marking as completed also completes the booking
+            if transition_payment(payment, new_status):
+                messages.success(request, f'Payment status updated to {payment.get_status_display()}')
+            else:
+                _status_refused(request, payment, new_status)
         else:
             messages.error(request, 'Invalid payment status')
     
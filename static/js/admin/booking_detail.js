@@ -0,0 +1,23 @@
+// Ensure admin status select shows all options - remove custom wrapper if exists
+document.addEventListener('DOMContentLoaded', function() {
+    const statusSelect = document.querySelector('#admin-booking-status-select');
+    if (statusSelect) {
+        // Remove any custom wrapper
+        const customWrapper = statusSelect.closest('.custom-select-wrapper');
+        if (customWrapper) {
+            const form = customWrapper.closest('form');
+            if (form) {
+                const select = customWrapper.querySelector('select');
+                if (select) {
+                    form.querySelector('.mb-3').appendChild(select);
+                }
+                customWrapper.remove();
+            }
+        }
+        // Ensure select is visible and has all options
+        statusSelect.style.display = 'block';
+        statusSelect.style.visibility = 'visible';
+        statusSelect.style.opacity = '1';
+        console.log('Admin status select has', statusSelect.options.length, 'options');
+    }
+});
@@ -0,0 +1,75 @@
+// Count-up animation function
+function animateCountUp(element, target, duration = 2000, prefix = '', suffix = '', isDecimal = false) {
+    const start = 0;
+    const increment = target / (duration / 16); // 60fps
+    let current = start;
+
+    const timer = setInterval(() => {
+        current += increment;
+        if (current >= target) {
+            current = target;
+            clearInterval(timer);
+        }
+
+        if (isDecimal) {
+            element.textContent = prefix + current.toFixed(1) + suffix;
+        } else if (prefix.includes('KSh')) {
+            // For currency, format with commas
+            element.textContent = prefix + ' ' + Math.floor(current).toLocaleString() + suffix;
+        } else {
+            element.textContent = prefix + Math.floor(current) + suffix;
+        }
+    }, 16);
+}
+
+// Initialize count-up animations when page loads
+document.addEventListener('DOMContentLoaded', function() {
+    // Wait for slide-in animations to complete
+    setTimeout(() => {
+        // Find all stat-number elements
+        const statNumbers = document.querySelectorAll('.stat-number');
+
+        statNumbers.forEach((statNum, index) => {
+            const text = statNum.textContent.trim();
+            let target, prefix = '', suffix = '', isDecimal = false;
+
+            // Check if it's a currency value (KSh)
+            if (text.includes('KSh')) {
+                const match = text.match(/KSh\s*([\d,]+)/);
+                if (match) {
+                    target = parseFloat(match[1].replace(/,/g, ''));
+                    prefix = 'KSh ';
+                    suffix = '';
+                }
+            }
+            // Check if it's a decimal (rating)
+            else if (text.includes('.')) {
+                target = parseFloat(text);
+                isDecimal = true;
+            }
+            // Regular integer
+            else {
+                target = parseInt(text.replace(/[^\d]/g, '')) || 0;
+            }
+
+            // Store original text for prefix/suffix detection
+            const originalText = text;
+            if (!prefix && !isDecimal) {
+                // Try to preserve any prefix/suffix
+                const numMatch = originalText.match(/(\D*)(\d+)(\D*)/);
+                if (numMatch) {
+                    prefix = numMatch[1] || '';
+                    suffix = numMatch[3] || '';
+                }
+            }
+
+            // Clear the element and start animation
+            statNum.textContent = prefix + (isDecimal ? '0.0' : '0') + suffix;
+
+            // Start count-up with delay for stagger effect
+            setTimeout(() => {
+                animateCountUp(statNum, target, 2000, prefix, suffix, isDecimal);
+            }, 300 + (index * 100));
+        });
+    }, 800); // Wait for slide animations
+});
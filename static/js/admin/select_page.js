@@ -0,0 +1,3 @@
+document.getElementById('selectPage').addEventListener('change', function () {
+    document.querySelectorAll('.row-select').forEach(box => { box.checked = this.checked; });
+});
@@ -0,0 +1,1013 @@
+// Verify Flatpickr is loaded
+window.addEventListener('load', function() {
+    if (typeof flatpickr === 'undefined') {
+        console.error('Flatpickr failed to load. Loading from alternative CDN...');
+        const script = document.createElement('script');
+        script.src = 'https://cdn.jsdelivr.net/npm/flatpickr@4.6.13/dist/flatpickr.min.js';
+        script.onload = function() {
+            console.log('Flatpickr loaded from alternative CDN');
+        };
+        document.head.appendChild(script);
+    } else {
+        console.log('Flatpickr library loaded successfully');
+    }
+});
+
+// Page Load Slide Animations
+document.addEventListener('DOMContentLoaded', function() {
+    // Animate main content
+    const mainContent = document.querySelector('main');
+    if (mainContent) {
+        mainContent.classList.add('slide-in-content');
+        setTimeout(() => {
+            mainContent.classList.add('slide-in');
+        }, 100);
+    }
+
+    // Animate containers
+    const containers = document.querySelectorAll('.container');
+    containers.forEach((container, index) => {
+        container.classList.add('slide-in-content');
+        setTimeout(() => {
+            container.classList.add('slide-in');
+        }, 150 + (index * 50));
+    });
+
+    // Animate cards with stagger effect
+    const cards = document.querySelectorAll('.card');
+    cards.forEach((card, index) => {
+        card.classList.add('stagger-item');
+        setTimeout(() => {
+            card.classList.add('slide-in');
+        }, 200 + (index * 100));
+    });
+
+    // Animate table rows with stagger effect
+    const tableRows = document.querySelectorAll('.table tbody tr');
+    tableRows.forEach((row, index) => {
+        row.classList.add('stagger-item');
+        setTimeout(() => {
+            row.classList.add('slide-in');
+        }, 300 + (index * 50));
+    });
+
+    // Animate filter cards
+    const filterCards = document.querySelectorAll('.filter-card, .revenue-card, .stat-card, .activity-card');
+    filterCards.forEach((card, index) => {
+        card.classList.add('slide-in-scale');
+        setTimeout(() => {
+            card.classList.add('slide-in');
+        }, 100 + (index * 100));
+    });
+
+    // Animate buttons
+    const buttons = document.querySelectorAll('.btn');
+    buttons.forEach((btn, index) => {
+        btn.classList.add('slide-in-content');
+        setTimeout(() => {
+            btn.classList.add('slide-in');
+        }, 400 + (index * 50));
+    });
+
+    // Animate headings
+    const headings = document.querySelectorAll('h1, h2, h3, h4, h5');
+    headings.forEach((heading, index) => {
+        heading.classList.add('slide-in-left');
+        setTimeout(() => {
+            heading.classList.add('slide-in');
+        }, 100 + (index * 50));
+    });
+
+    // Animate navigation items
+    const navItems = document.querySelectorAll('.nav-link');
+    navItems.forEach((item, index) => {
+        item.classList.add('slide-in-content');
+        setTimeout(() => {
+            item.classList.add('slide-in');
+        }, 200 + (index * 30));
+    });
+
+    // Animate form elements
+    const formElements = document.querySelectorAll('.form-control, .form-select, .form-label');
+    formElements.forEach((element, index) => {
+        element.classList.add('slide-in-content');
+        setTimeout(() => {
+            element.classList.add('slide-in');
+        }, 300 + (index * 30));
+    });
+
+    // Modern Custom Dropdown - Replace native selects with beautiful custom dropdowns
+    function createCustomDropdown(select) {
+        // Skip if already converted, hidden, or explicitly excluded
+        if (select.closest('.custom-select-wrapper') || 
+            select.style.display === 'none' ||
+            select.hasAttribute('data-no-custom-dropdown') ||
+            select.id === 'booking-status-select' ||
+            select.id === 'booking-status-update-select' ||
+            select.id === 'admin-booking-status-select' ||
+            select.closest('.status-select-wrapper') ||
+            select.dataset.noCustomDropdown === 'true') {
+            return;
+        }
+
+        // Ensure select has options
+        if (!select.options || select.options.length === 0) {
+            console.warn('Select element has no options:', select);
+            return;
+        }
+
+        const wrapper = document.createElement('div');
+        wrapper.className = 'custom-select-wrapper';
+        wrapper.style.position = 'relative';
+        wrapper.style.width = '100%';
+
+        // Create display element
+        const display = document.createElement('div');
+        display.className = 'custom-select-display';
+        display.textContent = select.options[select.selectedIndex]?.text || 'Select an option...';
+
+        // Create dropdown menu
+        const dropdown = document.createElement('div');
+        dropdown.className = 'custom-select-dropdown';
+
+        // Create options - ensure we process ALL options
+        const optionsArray = Array.from(select.options);
+        console.log('Creating custom dropdown with', optionsArray.length, 'options for select:', select.name || select.id);
+
+        optionsArray.forEach((option, index) => {
+            // Only skip if both value and text are completely empty
+            if (option.value === '' && (!option.text || option.text.trim() === '')) {
+                return;
+            }
+
+            const customOption = document.createElement('div');
+            customOption.className = 'custom-select-option';
+            if (option.selected) customOption.classList.add('selected');
+            customOption.textContent = option.text || option.value || 'Option ' + (index + 1);
+            customOption.dataset.value = option.value;
+
+            customOption.addEventListener('click', function(e) {
+                e.stopPropagation();
+                select.value = option.value;
+
+                // Trigger native change event for any handlers
+                const changeEvent = new Event('change', { bubbles: true, cancelable: true });
+                select.dispatchEvent(changeEvent);
+
+                // Also trigger input event
+                const inputEvent = new Event('input', { bubbles: true, cancelable: true });
+                select.dispatchEvent(inputEvent);
+
+                // Update display
+                display.textContent = option.text;
+
+                // Update selected state
+                dropdown.querySelectorAll('.custom-select-option').forEach(opt => {
+                    opt.classList.remove('selected');
+                });
+                customOption.classList.add('selected');
+
+                // Close dropdown
+                dropdown.classList.remove('show');
+                display.classList.remove('active');
+            });
+
+            dropdown.appendChild(customOption);
+        });
+
+        // Toggle dropdown
+        display.addEventListener('click', function(e) {
+            e.stopPropagation();
+            const isOpen = dropdown.classList.contains('show');
+
+            // Close all other dropdowns
+            document.querySelectorAll('.custom-select-dropdown.show').forEach(dd => {
+                if (dd !== dropdown) {
+                    dd.classList.remove('show');
+                    dd.previousElementSibling?.classList.remove('active');
+                }
+            });
+
+            if (isOpen) {
+                dropdown.classList.remove('show');
+                display.classList.remove('active');
+            } else {
+                dropdown.classList.add('show');
+                display.classList.add('active');
+            }
+        });
+
+        // Close on outside click
+        document.addEventListener('click', function(e) {
+            if (!wrapper.contains(e.target)) {
+                dropdown.classList.remove('show');
+                display.classList.remove('active');
+            }
+        });
+
+        // Wrap select
+        select.parentNode.insertBefore(wrapper, select);
+        wrapper.appendChild(select);
+        wrapper.appendChild(display);
+        wrapper.appendChild(dropdown);
+
+        // Hide native select but keep for form submission
+        select.style.position = 'absolute';
+        select.style.opacity = '0';
+        select.style.pointerEvents = 'none';
+        select.style.height = '0';
+        select.style.width = '0';
+
+        // Sync on native select change
+        select.addEventListener('change', function() {
+            display.textContent = select.options[select.selectedIndex]?.text || 'Select an option...';
+            dropdown.querySelectorAll('.custom-select-option').forEach(opt => {
+                opt.classList.remove('selected');
+                if (opt.dataset.value === select.value) {
+                    opt.classList.add('selected');
+                }
+            });
+        });
+    }
+
+    // Convert all selects to custom dropdowns
+
+    // Initialize Flatpickr DateTime Picker
+    function initializeFlatpickr() {
+        if (typeof flatpickr === 'undefined') {
+            setTimeout(initializeFlatpickr, 100);
+            return;
+        }
+
+        const datetimeInputs = document.querySelectorAll('input[type="datetime-local"]');
+
+        if (datetimeInputs.length === 0) {
+            setTimeout(initializeFlatpickr, 200);
+            return;
+        }
+
+        datetimeInputs.forEach((input) => {
+            // Check if already initialized
+            if (input._flatpickr) {
+                return;
+            }
+
+            try {
+                // Flatpickr with better month/year visibility - using static dropdowns
+                const fp = flatpickr(input, {
+                    enableTime: true,
+                    dateFormat: "Y-m-d H:i",
+                    time_24hr: false,
+                    minDate: "today",
+                    clickOpens: true,
+                    allowInput: true,
+                    animate: true,
+                    // Use static month selector for better visibility
+                    monthSelectorType: "static",
+                    // Make calendar more accessible
+                    onReady: function(selectedDates, dateStr, instance) {
+                        setTimeout(function() {
+                            const calendar = instance.calendarContainer;
+
+                            // Make navigation buttons very visible and clickable
+                            const prevBtn = calendar.querySelector('.flatpickr-prev-month');
+                            const nextBtn = calendar.querySelector('.flatpickr-next-month');
+
+                            if (prevBtn) {
+                                prevBtn.style.pointerEvents = 'auto';
+                                prevBtn.style.cursor = 'pointer';
+                                prevBtn.style.opacity = '1';
+                                prevBtn.style.visibility = 'visible';
+                            }
+                            if (nextBtn) {
+                                nextBtn.style.pointerEvents = 'auto';
+                                nextBtn.style.cursor = 'pointer';
+                                nextBtn.style.opacity = '1';
+                                nextBtn.style.visibility = 'visible';
+                            }
+
+                            // Make month/year text clickable and more visible
+                            const monthElement = calendar.querySelector('.flatpickr-current-month');
+                            if (monthElement) {
+                                monthElement.style.cursor = 'pointer';
+                                monthElement.style.pointerEvents = 'auto';
+                                monthElement.style.fontSize = '16px';
+                                monthElement.style.fontWeight = 'bold';
+                                monthElement.style.padding = '5px 10px';
+                                monthElement.style.borderRadius = '4px';
+                                monthElement.style.transition = 'background 0.2s';
+
+                                // Add hover effect
+                                monthElement.addEventListener('mouseenter', function() {
+                                    this.style.background = 'rgba(0, 0, 0, 0.1)';
+                                });
+                                monthElement.addEventListener('mouseleave', function() {
+                                    this.style.background = 'transparent';
+                                });
+
+                                // Make it clickable to show month selector
+                                monthElement.addEventListener('click', function(e) {
+                                    e.stopPropagation();
+                                    // Toggle month dropdown if it exists
+                                    const monthDropdown = calendar.querySelector('.flatpickr-monthDropdown-months');
+                                    if (monthDropdown) {
+                                        monthDropdown.style.display = monthDropdown.style.display === 'none' ? 'block' : 'none';
+                                    } else {
+                                        // Create a simple month selector
+                                        showMonthSelector(instance);
+                                    }
+                                });
+                            }
+
+                            // Ensure calendar is properly sized
+                            calendar.style.minWidth = '300px';
+                            calendar.style.maxWidth = '400px';
+                        }, 150);
+                    }
+                });
+
+                // Helper function to show month selector
+                function showMonthSelector(instance) {
+                    const calendar = instance.calendarContainer;
+                    let monthSelector = calendar.querySelector('.custom-month-selector');
+
+                    // Remove existing selector if any
+                    if (monthSelector) {
+                        monthSelector.remove();
+                    }
+
+                    // Get current displayed date from Flatpickr instance
+                    const displayedYear = instance.currentYear || new Date().getFullYear();
+                    const displayedMonth = instance.currentMonth !== undefined ? instance.currentMonth : new Date().getMonth();
+                    const currentYear = displayedYear;
+                    const currentMonth = displayedMonth;
+
+                    monthSelector = document.createElement('div');
+                    monthSelector.className = 'custom-month-selector';
+                    monthSelector.style.cssText = `
+                        position: absolute;
+                        top: 50px;
+                        left: 50%;
+                        transform: translateX(-50%);
+                        background: white;
+                        border: 2px solid #667eea;
+                        border-radius: 12px;
+                        padding: 20px;
+                        z-index: 100000;
+                        box-shadow: 0 8px 32px rgba(0,0,0,0.2);
+                        display: grid;
+                        grid-template-columns: repeat(3, 1fr);
+                        gap: 10px;
+                        width: 280px;
+                    `;
+
+                    const months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'];
+                    months.forEach((month, index) => {
+                        const btn = document.createElement('button');
+                        btn.textContent = month;
+                        btn.dataset.monthIndex = index;
+                        btn.style.cssText = `
+                            padding: 12px 8px;
+                            border: 2px solid ${index === currentMonth ? '#667eea' : '#e2e8f0'};
+                            border-radius: 8px;
+                            background: ${index === currentMonth ? 'rgba(102, 126, 234, 0.1)' : 'white'};
+                            cursor: pointer;
+                            transition: all 0.2s;
+                            font-weight: 600;
+                            font-size: 14px;
+                            color: ${index === currentMonth ? '#667eea' : '#2d3748'};
+                        `;
+                        btn.addEventListener('mouseenter', function() {
+                            this.style.background = '#667eea';
+                            this.style.color = 'white';
+                            this.style.borderColor = '#667eea';
+                        });
+                        btn.addEventListener('mouseleave', function() {
+                            if (parseInt(this.dataset.monthIndex) === currentMonth) {
+                                this.style.background = 'rgba(102, 126, 234, 0.1)';
+                                this.style.color = '#667eea';
+                                this.style.borderColor = '#667eea';
+                            } else {
+                                this.style.background = 'white';
+                                this.style.color = '#2d3748';
+                                this.style.borderColor = '#e2e8f0';
+                            }
+                        });
+                        btn.addEventListener('click', function(e) {
+                            e.stopPropagation();
+                            const selectedMonth = parseInt(this.dataset.monthIndex);
+                            // Use the displayed year from the instance
+                            const targetYear = instance.currentYear || currentYear;
+                            // Create new date with selected month and current displayed year
+                            const newDate = new Date(targetYear, selectedMonth, 1);
+                            // Jump to the date first, then set it
+                            instance.jumpToDate(newDate);
+                            // Don't set as selected date, just navigate
+                            monthSelector.remove();
+                        });
+                        monthSelector.appendChild(btn);
+                    });
+
+                    calendar.appendChild(monthSelector);
+
+                    // Close on outside click
+                    setTimeout(() => {
+                        const closeHandler = function(e) {
+                            if (!monthSelector.contains(e.target) && 
+                                e.target !== calendar.querySelector('.flatpickr-current-month') &&
+                                !e.target.closest('.flatpickr-current-month')) {
+                                monthSelector.remove();
+                                document.removeEventListener('click', closeHandler);
+                            }
+                        };
+                        document.addEventListener('click', closeHandler);
+                    }, 10);
+                }
+
+                // Helper function to show year selector
+                function showYearSelector(instance) {
+                    const calendar = instance.calendarContainer;
+                    let yearSelector = calendar.querySelector('.custom-year-selector');
+
+                    // Remove existing selector if any
+                    if (yearSelector) {
+                        yearSelector.remove();
+                    }
+
+                    // Get current displayed date from Flatpickr instance
+                    const displayedYear = instance.currentYear || new Date().getFullYear();
+                    const displayedMonth = instance.currentMonth !== undefined ? instance.currentMonth : new Date().getMonth();
+                    const currentYear = displayedYear;
+                    const currentMonth = displayedMonth;
+
+                    yearSelector = document.createElement('div');
+                    yearSelector.className = 'custom-year-selector';
+                    yearSelector.style.cssText = `
+                        position: absolute;
+                        top: 50px;
+                        left: 50%;
+                        transform: translateX(-50%);
+                        background: white;
+                        border: 2px solid #667eea;
+                        border-radius: 12px;
+                        padding: 20px;
+                        z-index: 100000;
+                        box-shadow: 0 8px 32px rgba(0,0,0,0.2);
+                        display: flex;
+                        flex-direction: column;
+                        gap: 8px;
+                        width: 200px;
+                        max-height: 300px;
+                        overflow-y: auto;
+                    `;
+
+                    // Year navigation buttons
+                    const navDiv = document.createElement('div');
+                    navDiv.style.cssText = 'display: flex; justify-content: space-between; align-items: center; margin-bottom: 10px;';
+
+                    const prevYearBtn = document.createElement('button');
+                    prevYearBtn.textContent = '←';
+                    prevYearBtn.style.cssText = 'padding: 8px 12px; border: 1px solid #ddd; border-radius: 4px; background: white; cursor: pointer; font-size: 18px; transition: all 0.2s;';
+                    prevYearBtn.addEventListener('mouseenter', function() {
+                        this.style.background = '#667eea';
+                        this.style.color = 'white';
+                        this.style.borderColor = '#667eea';
+                    });
+                    prevYearBtn.addEventListener('mouseleave', function() {
+                        this.style.background = 'white';
+                        this.style.color = 'black';
+                        this.style.borderColor = '#ddd';
+                    });
+                    prevYearBtn.addEventListener('click', function(e) {
+                        e.stopPropagation();
+                        const currentStartYear = parseInt(yearSelector.dataset.startYear) || Math.floor(currentYear / 12) * 12;
+                        const startYear = currentStartYear - 12;
+                        yearSelector.dataset.startYear = startYear;
+                        updateYearList(yearSelector, startYear, currentYear, currentMonth, instance);
+                    });
+
+                    const yearRange = document.createElement('span');
+                    yearRange.className = 'year-range-display';
+                    yearRange.style.cssText = 'font-weight: bold; color: #667eea; font-size: 14px;';
+
+                    const nextYearBtn = document.createElement('button');
+                    nextYearBtn.textContent = '→';
+                    nextYearBtn.style.cssText = 'padding: 8px 12px; border: 1px solid #ddd; border-radius: 4px; background: white; cursor: pointer; font-size: 18px; transition: all 0.2s;';
+                    nextYearBtn.addEventListener('mouseenter', function() {
+                        this.style.background = '#667eea';
+                        this.style.color = 'white';
+                        this.style.borderColor = '#667eea';
+                    });
+                    nextYearBtn.addEventListener('mouseleave', function() {
+                        this.style.background = 'white';
+                        this.style.color = 'black';
+                        this.style.borderColor = '#ddd';
+                    });
+                    nextYearBtn.addEventListener('click', function(e) {
+                        e.stopPropagation();
+                        const currentStartYear = parseInt(yearSelector.dataset.startYear) || Math.floor(currentYear / 12) * 12;
+                        const startYear = currentStartYear + 12;
+                        yearSelector.dataset.startYear = startYear;
+                        updateYearList(yearSelector, startYear, currentYear, currentMonth, instance);
+                    });
+
+                    navDiv.appendChild(prevYearBtn);
+                    navDiv.appendChild(yearRange);
+                    navDiv.appendChild(nextYearBtn);
+                    yearSelector.appendChild(navDiv);
+
+                    const yearList = document.createElement('div');
+                    yearList.className = 'year-list';
+                    yearList.style.cssText = 'display: grid; grid-template-columns: repeat(3, 1fr); gap: 8px;';
+                    yearSelector.appendChild(yearList);
+
+                    function updateYearList(container, startYear, currentYear, currentMonth, instance) {
+                        const list = container.querySelector('.year-list');
+                        const range = container.querySelector('.year-range-display');
+                        if (!list || !range) return;
+
+                        list.innerHTML = '';
+                        range.textContent = startYear + ' - ' + (startYear + 11);
+                        container.dataset.startYear = startYear;
+
+                        for (let i = 0; i < 12; i++) {
+                            const year = startYear + i;
+                            const btn = document.createElement('button');
+                            btn.textContent = year;
+                            btn.style.cssText = `
+                                padding: 10px;
+                                border: 2px solid ${year === currentYear ? '#667eea' : '#e2e8f0'};
+                                border-radius: 8px;
+                                background: ${year === currentYear ? 'rgba(102, 126, 234, 0.1)' : 'white'};
+                                cursor: pointer;
+                                transition: all 0.2s;
+                                font-weight: 600;
+                                color: ${year === currentYear ? '#667eea' : '#2d3748'};
+                            `;
+                            btn.addEventListener('mouseenter', function() {
+                                this.style.background = '#667eea';
+                                this.style.color = 'white';
+                                this.style.borderColor = '#667eea';
+                            });
+                            btn.addEventListener('mouseleave', function() {
+                                if (parseInt(this.textContent) === currentYear) {
+                                    this.style.background = 'rgba(102, 126, 234, 0.1)';
+                                    this.style.color = '#667eea';
+                                    this.style.borderColor = '#667eea';
+                                } else {
+                                    this.style.background = 'white';
+                                    this.style.color = '#2d3748';
+                                    this.style.borderColor = '#e2e8f0';
+                                }
+                            });
+                            btn.addEventListener('click', function(e) {
+                                e.stopPropagation();
+                                const selectedYear = parseInt(this.textContent);
+                                // Use the displayed month from the instance
+                                const targetMonth = instance.currentMonth !== undefined ? instance.currentMonth : currentMonth;
+                                const newDate = new Date(selectedYear, targetMonth, 1);
+                                // Jump to the date first, then set it
+                                instance.jumpToDate(newDate);
+                                // Don't set as selected date, just navigate
+                                yearSelector.remove();
+                            });
+                            list.appendChild(btn);
+                        }
+                    }
+
+                    yearSelector.dataset.startYear = Math.floor(currentYear / 12) * 12;
+                    updateYearList(yearSelector, Math.floor(currentYear / 12) * 12, currentYear, currentMonth, instance);
+
+                    calendar.appendChild(yearSelector);
+
+                    // Close on outside click
+                    setTimeout(() => {
+                        const closeHandler = function(e) {
+                            if (!yearSelector.contains(e.target) && 
+                                !e.target.closest('.flatpickr-current-month')) {
+                                yearSelector.remove();
+                                document.removeEventListener('click', closeHandler);
+                            }
+                        };
+                        document.addEventListener('click', closeHandler);
+                    }, 10);
+                }
+            } catch (error) {
+                console.error('Error initializing Flatpickr:', error);
+            }
+        });
+    }
+
+    // Wait for both DOM and Flatpickr to be ready
+    function waitForFlatpickr() {
+        if (typeof flatpickr !== 'undefined') {
+            console.log('Flatpickr is available, initializing...');
+            initializeFlatpickr();
+            setTimeout(initializeFlatpickr, 300);
+            setTimeout(initializeFlatpickr, 800);
+        } else {
+            console.log('Waiting for Flatpickr to load...');
+            setTimeout(waitForFlatpickr, 100);
+        }
+    }
+
+    // Start initialization
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', waitForFlatpickr);
+    } else {
+        waitForFlatpickr();
+    }
+
+    // Also try after window load
+    window.addEventListener('load', function() {
+        setTimeout(initializeFlatpickr, 500);
+    });
+
+    // Also watch for dynamically added datetime inputs
+    const flatpickrObserver = new MutationObserver(function(mutations) {
+        mutations.forEach(function(mutation) {
+            mutation.addedNodes.forEach(function(node) {
+                if (node.nodeType === 1) {
+                    if (node.tagName === 'INPUT' && node.type === 'datetime-local') {
+                        initializeFlatpickr();
+                    }
+                    const datetimeInputs = node.querySelectorAll && node.querySelectorAll('input[type="datetime-local"]');
+                    if (datetimeInputs && datetimeInputs.length > 0) {
+                        initializeFlatpickr();
+                    }
+                }
+            });
+        });
+    });
+
+    flatpickrObserver.observe(document.body, {
+        childList: true,
+        subtree: true
+    });
+
+    const allSelects = document.querySelectorAll('select:not(.custom-select-wrapper select), .form-select:not(.custom-select-wrapper select)');
+    allSelects.forEach(select => {
+        createCustomDropdown(select);
+    });
+
+    // Watch for dynamically added selects
+    const selectObserver = new MutationObserver(function(mutations) {
+        mutations.forEach(function(mutation) {
+            mutation.addedNodes.forEach(function(node) {
+                if (node.nodeType === 1) {
+                    if (node.tagName === 'SELECT') {
+                        createCustomDropdown(node);
+                    }
+                    const newSelects = node.querySelectorAll && node.querySelectorAll('select:not(.custom-select-wrapper select):not([data-no-custom-dropdown]):not(#booking-status-select):not(#booking-status-update-select):not(#admin-booking-status-select)');
+                    if (newSelects) {
+                        newSelects.forEach(select => {
+                            // Double check to exclude status selects
+                            if (!select.closest('.status-select-wrapper') && 
+                                !select.hasAttribute('data-no-custom-dropdown') && 
+                                select.id !== 'booking-status-select' &&
+                                select.id !== 'booking-status-update-select' &&
+                                select.id !== 'admin-booking-status-select') {
+                                createCustomDropdown(select);
+                            }
+                        });
+                    }
+                }
+            });
+        });
+    });
+
+    selectObserver.observe(document.body, {
+        childList: true,
+        subtree: true
+    });
+
+    // Animate badges
+    const badges = document.querySelectorAll('.badge');
+    badges.forEach((badge, index) => {
+        badge.classList.add('slide-in-scale');
+        setTimeout(() => {
+            badge.classList.add('slide-in');
+        }, 400 + (index * 50));
+    });
+
+    // Animate pagination
+    const pagination = document.querySelectorAll('.pagination');
+    pagination.forEach((pag, index) => {
+        pag.classList.add('slide-in-content');
+        setTimeout(() => {
+            pag.classList.add('slide-in');
+        }, 500);
+    });
+});
+
+// Re-animate on page visibility change (when user comes back to tab)
+document.addEventListener('visibilitychange', function() {
+    if (!document.hidden) {
+        // Re-trigger animations for visible elements
+        const visibleElements = document.querySelectorAll('.slide-in-content, .slide-in-left, .slide-in-right, .slide-in-scale, .stagger-item');
+        visibleElements.forEach(element => {
+            element.classList.remove('slide-in');
+            setTimeout(() => {
+                element.classList.add('slide-in');
+            }, 50);
+        });
+    }
+});
+
+// Smooth scroll behavior
+document.documentElement.style.scrollBehavior = 'smooth';
+
+// Navbar scroll effect
+let lastScroll = 0;
+const navbar = document.querySelector('.navbar');
+
+window.addEventListener('scroll', function() {
+    const currentScroll = window.pageYOffset;
+
+    if (currentScroll > 50) {
+        navbar.classList.add('scrolled');
+    } else {
+        navbar.classList.remove('scrolled');
+    }
+
+    lastScroll = currentScroll;
+});
+
+// Dark Mode Toggle - Fixed and Working
+// Theme Toggle - Fixed and Working Version
+function initializeThemeToggle() {
+    const themeToggle = document.getElementById('themeToggle');
+    const htmlElement = document.documentElement;
+
+    if (!themeToggle) {
+        console.warn('Theme toggle button not found, retrying...');
+        setTimeout(initializeThemeToggle, 200);
+        return;
+    }
+
+    // Get saved theme or default to light
+    const savedTheme = localStorage.getItem('theme') || 'light';
+    htmlElement.setAttribute('data-theme', savedTheme);
+
+    // Function to update icon visibility
+    function updateThemeIcon(theme) {
+        const lightIcon = themeToggle.querySelector('.theme-icon-light');
+        const darkIcon = themeToggle.querySelector('.theme-icon-dark');
+
+        if (lightIcon && darkIcon) {
+            if (theme === 'dark') {
+                lightIcon.style.display = 'none';
+                darkIcon.style.display = 'inline-block';
+            } else {
+                lightIcon.style.display = 'inline-block';
+                darkIcon.style.display = 'none';
+            }
+        }
+    }
+
+    // Set initial icon
+    updateThemeIcon(savedTheme);
+
+    // Remove any existing listeners
+    const newToggle = themeToggle.cloneNode(true);
+    themeToggle.parentNode.replaceChild(newToggle, themeToggle);
+
+    // Add multiple event handlers to ensure it works
+    newToggle.addEventListener('click', function(e) {
+        e.preventDefault();
+        e.stopPropagation();
+        e.stopImmediatePropagation();
+
+        const currentTheme = htmlElement.getAttribute('data-theme') || 'light';
+        const newTheme = currentTheme === 'dark' ? 'light' : 'dark';
+
+        // Apply theme
+        htmlElement.setAttribute('data-theme', newTheme);
+        localStorage.setItem('theme', newTheme);
+
+        // Update icon
+        updateThemeIcon(newTheme);
+
+        // Rotation animation
+        this.style.transition = 'transform 0.4s ease';
+        this.style.transform = 'rotate(360deg)';
+        setTimeout(() => {
+            this.style.transform = '';
+        }, 400);
+    }, true);
+
+    // Also handle mousedown for better compatibility
+    newToggle.addEventListener('mousedown', function(e) {
+        e.preventDefault();
+    });
+}
+
+// Initialize when DOM is ready
+if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', initializeThemeToggle);
+} else {
+    initializeThemeToggle();
+}
+
+// Enhanced smooth animations for all interactive elements
+const animatedElements = document.querySelectorAll('a, button, .card, .btn, .nav-link');
+animatedElements.forEach(element => {
+    element.style.transition = 'all 0.3s cubic-bezier(0.4, 0, 0.2, 1)';
+});
+
+// Parallax effect for hero section (smooth)
+const heroSection = document.querySelector('.hero-section');
+if (heroSection) {
+    let ticking = false;
+    window.addEventListener('scroll', function() {
+        if (!ticking) {
+            window.requestAnimationFrame(function() {
+                const scrolled = window.pageYOffset;
+                const rate = scrolled * 0.3;
+                heroSection.style.transform = `translateY(${rate}px)`;
+                heroSection.style.opacity = 1 - (scrolled / 500);
+                ticking = false;
+            });
+            ticking = true;
+        }
+    });
+}
+
+// Smooth reveal animations on scroll with Intersection Observer
+const observerOptions = {
+    threshold: 0.1,
+    rootMargin: '0px 0px -100px 0px'
+};
+
+const observer = new IntersectionObserver(function(entries) {
+    entries.forEach((entry, index) => {
+        if (entry.isIntersecting) {
+            setTimeout(() => {
+                entry.target.style.opacity = '1';
+                entry.target.style.transform = 'translateY(0) scale(1)';
+            }, index * 100);
+            observer.unobserve(entry.target);
+        }
+    });
+}, observerOptions);
+
+// Observe all cards and sections with smooth animations
+document.querySelectorAll('.card, section, .stat-card, .category-card').forEach((el, index) => {
+    el.style.opacity = '0';
+    el.style.transform = 'translateY(30px) scale(0.95)';
+    el.style.transition = 'opacity 0.8s cubic-bezier(0.4, 0, 0.2, 1), transform 0.8s cubic-bezier(0.4, 0, 0.2, 1)';
+    observer.observe(el);
+});
+
+// Smooth hover effects for buttons
+document.querySelectorAll('.btn').forEach(btn => {
+    btn.addEventListener('mouseenter', function() {
+        this.style.transform = 'translateY(-3px) scale(1.05)';
+    });
+    btn.addEventListener('mouseleave', function() {
+        this.style.transform = 'translateY(0) scale(1)';
+    });
+});
+
+// Smooth card hover animations
+document.querySelectorAll('.card').forEach(card => {
+    card.addEventListener('mouseenter', function() {
+        this.style.transform = 'translateY(-10px) scale(1.02)';
+    });
+    card.addEventListener('mouseleave', function() {
+        this.style.transform = 'translateY(0) scale(1)';
+    });
+});
+
+// Smooth page transitions
+document.querySelectorAll('a[href^="/"], a[href^="http"]').forEach(link => {
+    link.addEventListener('click', function(e) {
+        if (!this.target || this.target === '_self') {
+            const href = this.getAttribute('href');
+            if (href && !href.startsWith('#') && !href.startsWith('javascript:')) {
+                // Add smooth fade out
+                document.body.style.opacity = '0.8';
+                document.body.style.transition = 'opacity 0.3s ease';
+            }
+        }
+    });
+});
+
+// Auto-dismiss alerts after 3 seconds and ensure page is interactive
+function autoDismissAlerts() {
+    const alerts = document.querySelectorAll('.auto-dismiss-alert[data-auto-dismiss="true"]');
+    alerts.forEach(function(alert) {
+        // Ensure alert doesn't block interaction
+        alert.style.pointerEvents = 'auto';
+        alert.style.position = 'relative';
+        alert.style.zIndex = '1051';
+
+        // Ensure parent container doesn't block interaction
+        const container = alert.closest('#messages-container');
+        if (container) {
+            container.style.pointerEvents = 'none';
+            container.style.position = 'relative';
+            container.style.zIndex = '1050';
+        }
+
+        // Remove any backdrop or overlay that might block interaction
+        const backdrop = document.querySelector('.modal-backdrop, .alert-backdrop');
+        if (backdrop) {
+            backdrop.remove();
+        }
+
+        // Set timeout to auto-dismiss after 3 seconds (reduced from 5)
+        const timeout = setTimeout(function() {
+            // Fade out animation
+            alert.style.transition = 'opacity 0.5s ease-out, transform 0.5s ease-out';
+            alert.style.opacity = '0';
+            alert.style.transform = 'translateY(-20px)';
+
+            // Remove after animation
+            setTimeout(function() {
+                if (alert.parentNode) {
+                    alert.remove();
+                }
+                // Ensure page is interactive after removal
+                document.body.style.pointerEvents = 'auto';
+                document.body.style.overflow = 'auto';
+            }, 500);
+        }, 3000); // 3 seconds
+
+        // Store timeout ID so we can clear it if user manually closes
+        alert.dataset.timeoutId = timeout;
+
+        // Clear timeout if user manually closes the alert
+        const closeButton = alert.querySelector('.btn-close');
+        if (closeButton) {
+            closeButton.addEventListener('click', function() {
+                clearTimeout(timeout);
+                // Ensure page is interactive after manual close
+                document.body.style.pointerEvents = 'auto';
+                document.body.style.overflow = 'auto';
+            });
+        }
+    });
+
+    // Ensure body is always interactive
+    document.body.style.pointerEvents = 'auto';
+    document.body.style.overflow = 'auto';
+
+    // Remove any modal backdrop
+    const modalBackdrop = document.querySelector('.modal-backdrop');
+    if (modalBackdrop) {
+        modalBackdrop.remove();
+    }
+}
+
+// Run immediately
+autoDismissAlerts();
+
+// Run on DOM ready
+if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', autoDismissAlerts);
+} else {
+    autoDismissAlerts();
+}
+
+// Also run after short delays to catch dynamically added alerts
+setTimeout(autoDismissAlerts, 50);
+setTimeout(autoDismissAlerts, 100);
+setTimeout(autoDismissAlerts, 200);
+
+// Watch for new alerts
+const alertObserver = new MutationObserver(function(mutations) {
+    mutations.forEach(function(mutation) {
+        mutation.addedNodes.forEach(function(node) {
+            if (node.nodeType === 1 && (node.classList && node.classList.contains('auto-dismiss-alert'))) {
+                autoDismissAlerts();
+            }
+        });
+    });
+});
+
+alertObserver.observe(document.body, {
+    childList: true,
+    subtree: true
+});
+
+// Ensure footer links are fully clickable
+document.addEventListener('DOMContentLoaded', function() {
+    const footerLinks = document.querySelectorAll('.footer-links a, .footer-bottom-links a');
+    footerLinks.forEach(link => {
+        // Ensure link is clickable
+        link.style.pointerEvents = 'auto';
+        link.style.cursor = 'pointer';
+        link.style.zIndex = '1000';
+        link.style.position = 'relative';
+
+        // Remove any potential blockers
+        link.addEventListener('click', function(e) {
+            const href = this.getAttribute('href');
+            if (href && href !== '#' && !href.startsWith('javascript:')) {
+                // Allow navigation - don't prevent default
+                return true;
+            }
+        }, false);
+    });
+});
@@ -0,0 +1,103 @@
+// Prevent custom dropdown conversion immediately
+(function() {
+    const statusSelect = document.querySelector('#booking-status-select');
+    if (statusSelect) {
+        statusSelect.setAttribute('data-no-custom-dropdown', 'true');
+        // Remove any existing custom wrapper
+        const customWrapper = statusSelect.closest('.custom-select-wrapper');
+        if (customWrapper) {
+            const parent = customWrapper.parentNode;
+            parent.insertBefore(statusSelect, customWrapper);
+            customWrapper.remove();
+        }
+    }
+})();
+
+// Force status update select to show all options - remove custom wrapper and ensure native select
+(function() {
+    function fixStatusSelect() {
+        const statusSelect = document.querySelector('#booking-status-update-select');
+        if (!statusSelect) {
+            setTimeout(fixStatusSelect, 100);
+            return;
+        }
+
+        // Remove any custom wrapper immediately
+        const customWrapper = statusSelect.closest('.custom-select-wrapper');
+        if (customWrapper) {
+            const form = customWrapper.closest('form');
+            if (form) {
+                const mb3 = form.querySelector('.mb-3');
+                if (mb3) {
+                    mb3.appendChild(statusSelect);
+                }
+                // Remove custom display and dropdown
+                const customDisplay = customWrapper.querySelector('.custom-select-display');
+                const customDropdown = customWrapper.querySelector('.custom-select-dropdown');
+                if (customDisplay) customDisplay.remove();
+                if (customDropdown) customDropdown.remove();
+                customWrapper.remove();
+                console.log('Removed custom wrapper from status select');
+            }
+        }
+
+        // Force native select to be visible and show all options
+        statusSelect.style.cssText = 'display: block !important; visibility: visible !important; opacity: 1 !important; position: relative !important; height: auto !important; width: 100% !important;';
+        statusSelect.removeAttribute('data-no-custom-dropdown');
+        statusSelect.setAttribute('data-no-custom-dropdown', 'true');
+
+        // Verify all options are present
+        const options = statusSelect.options;
+        console.log('Status select has', options.length, 'options:');
+        for (let i = 0; i < options.length; i++) {
+            console.log('  Option', i + 1, ':', options[i].value, '-', options[i].textContent);
+            options[i].style.display = 'block';
+        }
+
+        // Ensure select is not disabled
+        statusSelect.removeAttribute('disabled');
+        statusSelect.removeAttribute('readonly');
+    }
+
+    // Run immediately and on DOM ready
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', fixStatusSelect);
+    } else {
+        fixStatusSelect();
+    }
+
+    // Also run after a delay to catch late-loading custom dropdowns
+    setTimeout(fixStatusSelect, 500);
+    setTimeout(fixStatusSelect, 1000);
+})();
+
+// Ensure status select shows all options - remove custom wrapper if exists (like admin dashboard)
+document.addEventListener('DOMContentLoaded', function() {
+    const statusSelect = document.querySelector('#booking-status-update-select');
+    if (statusSelect) {
+        // Remove any custom wrapper
+        const customWrapper = statusSelect.closest('.custom-select-wrapper');
+        if (customWrapper) {
+            const form = customWrapper.closest('form');
+            if (form) {
+                const select = customWrapper.querySelector('select');
+                if (select) {
+                    form.querySelector('.mb-3').appendChild(select);
+                }
+                customWrapper.remove();
+            }
+        }
+        // Ensure select is visible and has all options
+        statusSelect.style.display = 'block';
+        statusSelect.style.visibility = 'visible';
+        statusSelect.style.opacity = '1';
+        console.log('Status select has', statusSelect.options.length, 'options');
+    }
+});
+
+// Auto-refresh booking page while M-Pesa payment is pending.
+if (document.getElementById('mpesa-sync-flag')) {
+    setTimeout(function() {
+        window.location.reload();
+    }, 8000);
+}
@@ -0,0 +1,21 @@
+document.addEventListener('DOMContentLoaded', function() {
+    // Show success animation if booking is completed
+    const successModal = new bootstrap.Modal(document.getElementById('successModal'));
+    successModal.show();
+
+    // Load Lottie success animation
+    if (typeof lottie !== 'undefined') {
+        lottie.loadAnimation({
+            container: document.getElementById('successAnimation'),
+            renderer: 'svg',
+            loop: false,
+            autoplay: true,
+            path: 'https://assets5.lottiefiles.com/packages/lf20_checkmark.json'
+        }).catch(() => {
+            // Fallback to icon
+            document.getElementById('successAnimation').innerHTML = '<i class="bi bi-check-circle-fill" style="font-size: 6rem; color: #10b981;"></i>';
+        });
+    } else {
+        document.getElementById('successAnimation').innerHTML = '<i class="bi bi-check-circle-fill" style="font-size: 6rem; color: #10b981; animation: pulse 1s ease-in-out;"></i>';
+    }
+});
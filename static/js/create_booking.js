@@ -0,0 +1,56 @@
+const pageData = document.currentScript.dataset;
+const hourlyRate = parseFloat(pageData.hourlyRate);
+const hoursInput = document.getElementById('id_estimated_hours');
+const costDisplay = document.getElementById('estimated-cost');
+
+function updateCost() {
+    const hours = parseInt(hoursInput.value) || 0;
+    const cost = hourlyRate * hours;
+    costDisplay.textContent = 'KSh ' + cost.toLocaleString('en-US', {
+        minimumFractionDigits: 2,
+        maximumFractionDigits: 2
+    });
+
+    // Add animation
+    costDisplay.style.transform = 'scale(1.1)';
+    setTimeout(() => {
+        costDisplay.style.transform = 'scale(1)';
+    }, 200);
+}
+
+hoursInput.addEventListener('input', updateCost);
+hoursInput.addEventListener('change', updateCost);
+updateCost();
+
+// Next free slots for the chosen number of hours; clicking one fills in the date.
+const slotsBox = document.getElementById('free-slots');
+const dateInput = document.getElementById('id_booking_date');
+
+function loadFreeSlots() {
+    const hours = parseInt(hoursInput.value) || 1;
+    fetch(pageData.freeSlotsUrl + '?limit=6&hours=' + hours)
+        .then(response => response.json())
+        .then(data => {
+            slotsBox.replaceChildren();
+            if (!data.slots || !data.slots.length) {
+                slotsBox.textContent = 'No free slots in the next 7 days.';
+                return;
+            }
+            data.slots.forEach(slot => {
+                const button = document.createElement('button');
+                button.type = 'button';
+                button.className = 'btn btn-sm btn-outline-primary';
+                // Slots are in the site's time zone, the same one the date field is read in.
+                button.textContent = slot.start.slice(0, 16).replace('T', ' ');
+                button.addEventListener('click', () => { dateInput.value = slot.start.slice(0, 16); });
+                slotsBox.appendChild(button);
+            });
+        })
+        .catch(() => { slotsBox.replaceChildren(); });
+}
+
+hoursInput.addEventListener('change', loadFreeSlots);
+loadFreeSlots();
+
+// Add smooth transitions
+costDisplay.style.transition = 'transform 0.2s ease';
@@ -0,0 +1,21 @@
+function togglePhoneField() {
+    const paymentMethod = document.getElementById('id_payment_method').value;
+    const phoneField = document.getElementById('phoneField');
+    const mpesaInstructions = document.getElementById('mpesaInstructions');
+
+    if (paymentMethod === 'mpesa') {
+        phoneField.style.display = 'block';
+        mpesaInstructions.style.display = 'block';
+        document.getElementById('id_phone_number').required = true;
+    } else {
+        phoneField.style.display = 'none';
+        mpesaInstructions.style.display = 'none';
+        document.getElementById('id_phone_number').required = false;
+    }
+}
+
+// Call on page load
+document.addEventListener('DOMContentLoaded', function() {
+    togglePhoneField();
+    document.getElementById('id_payment_method').addEventListener('change', togglePhoneField);
+});
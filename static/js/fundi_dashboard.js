@@ -0,0 +1,61 @@
+// Live job offers: refresh the list every 10 seconds.
+const jobOffersUrl = document.currentScript.dataset.jobOffersUrl;
+setInterval(() => {
+    fetch(jobOffersUrl)
+        .then(response => response.ok ? response.text() : Promise.reject())
+        .then(html => { document.getElementById('job-offers').innerHTML = html; })
+        .catch(() => {});
+}, 10000);
+
+// Count-up animation function
+function animateCountUp(element, target, duration = 2000, prefix = '', suffix = '', isDecimal = false) {
+    const start = 0;
+    const increment = target / (duration / 16); // 60fps
+    let current = start;
+
+    const timer = setInterval(() => {
+        current += increment;
+        if (current >= target) {
+            current = target;
+            clearInterval(timer);
+        }
+
+        if (isDecimal) {
+            element.textContent = current.toFixed(1);
+        } else {
+            element.textContent = Math.floor(current);
+        }
+    }, 16);
+}
+
+// Initialize count-up animations when page loads
+document.addEventListener('DOMContentLoaded', function() {
+    // Wait for slide-in animations to complete
+    setTimeout(() => {
+        // Find all count-up elements (h3 with count-up class)
+        const countUpElements = document.querySelectorAll('h3.count-up');
+
+        countUpElements.forEach((element, index) => {
+            const text = element.textContent.trim();
+            let target, isDecimal = false;
+
+            // Check if it's a decimal (rating)
+            if (text.includes('.')) {
+                target = parseFloat(text);
+                isDecimal = true;
+            }
+            // Regular integer
+            else {
+                target = parseInt(text.replace(/[^\d]/g, '')) || 0;
+            }
+
+            // Clear the element and start animation
+            element.textContent = isDecimal ? '0.0' : '0';
+
+            // Start count-up with delay for stagger effect
+            setTimeout(() => {
+                animateCountUp(element, target, 2000, '', '', isDecimal);
+            }, 300 + (index * 150));
+        });
+    }, 800); // Wait for slide animations
+});
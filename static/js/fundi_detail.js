@@ -0,0 +1,75 @@
+// Lottie Animation for Fundi Service (Hammer/Drill)
+document.addEventListener('DOMContentLoaded', function() {
+    const animationContainer = document.getElementById('fundiServiceAnimation');
+    if (animationContainer && typeof lottie !== 'undefined') {
+        // Create a simple hammer/drill animation using Lottie
+        // Using a generic tool animation JSON
+        const animationData = {
+            "v": "5.7.4",
+            "fr": 30,
+            "ip": 0,
+            "op": 60,
+            "w": 100,
+            "h": 100,
+            "nm": "Tool Animation",
+            "ddd": 0,
+            "assets": [],
+            "layers": [{
+                "ddd": 0,
+                "ind": 1,
+                "ty": 4,
+                "nm": "Hammer",
+                "sr": 1,
+                "ks": {
+                    "o": {"a": 0, "k": 100},
+                    "r": {
+                        "a": 1,
+                        "k": [
+                            {"i": {"x": [0.667], "y": [1]}, "o": {"x": [0.333], "y": [0]}, "t": 0, "s": [0]},
+                            {"t": 60, "s": [360]}
+                        ]
+                    },
+                    "p": {"a": 0, "k": [50, 50, 0]},
+                    "a": {"a": 0, "k": [0, 0, 0]},
+                    "s": {"a": 0, "k": [100, 100, 100]}
+                },
+                "ao": 0,
+                "shapes": [{
+                    "ty": "gr",
+                    "it": [{
+                        "ty": "rc",
+                        "d": 1,
+                        "s": {"a": 0, "k": [20, 40]},
+                        "p": {"a": 0, "k": [0, 0]},
+                        "r": {"a": 0, "k": 5}
+                    }, {
+                        "ty": "fl",
+                        "c": {"a": 0, "k": [0.4, 0.4, 0.4, 1]},
+                        "o": {"a": 0, "k": 100}
+                    }]
+                }]
+            }]
+        };
+
+        // Try to load a hammer animation from LottieFiles or use a fallback
+        try {
+            // For now, we'll create a simple rotating tool icon animation
+            lottie.loadAnimation({
+                container: animationContainer,
+                renderer: 'svg',
+                loop: true,
+                autoplay: true,
+                path: 'https://assets5.lottiefiles.com/packages/lf20_hammer.json' // Fallback to a simple animation
+            }).catch(() => {
+                // If animation fails to load, show an icon instead
+                animationContainer.innerHTML = '<i class="bi bi-hammer" style="font-size: 4rem; color: #667eea; animation: pulse 2s infinite;"></i>';
+            });
+        } catch (e) {
+            // Fallback to icon animation
+            animationContainer.innerHTML = '<i class="bi bi-hammer" style="font-size: 4rem; color: #667eea; animation: pulse 2s infinite;"></i>';
+        }
+    } else if (animationContainer) {
+        // Fallback if Lottie is not loaded
+        animationContainer.innerHTML = '<i class="bi bi-tools" style="font-size: 4rem; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); -webkit-background-clip: text; -webkit-text-fill-color: transparent; background-clip: text; animation: pulse 2s infinite;"></i>';
+    }
+});
@@ -0,0 +1,88 @@
+// Initialize carousel indicators dynamically
+document.addEventListener('DOMContentLoaded', function() {
+    const carousel = document.getElementById('fundisCarousel');
+    if (carousel) {
+        const items = carousel.querySelectorAll('.carousel-item');
+        const indicatorsContainer = document.getElementById('fundisIndicators');
+
+        if (indicatorsContainer && items.length > 0) {
+            indicatorsContainer.innerHTML = '';
+            items.forEach((item, index) => {
+                const button = document.createElement('button');
+                button.type = 'button';
+                button.setAttribute('data-bs-target', '#fundisCarousel');
+                button.setAttribute('data-bs-slide-to', index);
+                button.setAttribute('aria-label', `Slide ${index + 1}`);
+                if (index === 0) {
+                    button.classList.add('active');
+                    button.setAttribute('aria-current', 'true');
+                }
+                indicatorsContainer.appendChild(button);
+            });
+        }
+    }
+
+    // Count-up Animation for Homepage Stats
+    function animateCountUp(element, target, duration = 2000, isDecimal = false) {
+        const start = 0;
+        const increment = target / (duration / 16);
+        let current = start;
+
+        const timer = setInterval(() => {
+            current += increment;
+            if (current >= target) {
+                current = target;
+                clearInterval(timer);
+            }
+
+            if (isDecimal) {
+                element.textContent = current.toFixed(1) + '★';
+            } else {
+                element.textContent = Math.floor(current) + '+';
+            }
+        }, 16);
+    }
+
+    // Initialize count-up animations
+    setTimeout(() => {
+        const countUpElements = document.querySelectorAll('.count-up');
+        countUpElements.forEach((element, index) => {
+            const target = parseInt(element.getAttribute('data-target'));
+            setTimeout(() => {
+                animateCountUp(element, target, 2000, false);
+            }, 300 + (index * 200));
+        });
+
+        const countUpDecimalElements = document.querySelectorAll('.count-up-decimal');
+        countUpDecimalElements.forEach((element, index) => {
+            const target = parseFloat(element.getAttribute('data-target'));
+            setTimeout(() => {
+                animateCountUp(element, target, 2000, true);
+            }, 300 + (index * 200));
+        });
+    }, 800);
+
+    // Ensure reviews carousel auto-plays
+    const reviewsCarousel = document.getElementById('reviewsCarousel');
+    if (reviewsCarousel) {
+        // Initialize Bootstrap carousel if not already initialized
+        const bsCarousel = new bootstrap.Carousel(reviewsCarousel, {
+            interval: 4000,
+            ride: 'carousel',
+            pause: false,
+            wrap: true
+        });
+
+        // Ensure it continues cycling
+        reviewsCarousel.addEventListener('slid.bs.carousel', function () {
+            // Reset animation for new active card
+            const activeCard = reviewsCarousel.querySelector('.carousel-item.active .review-slide-flip');
+            if (activeCard) {
+                activeCard.style.animation = 'none';
+                setTimeout(() => {
+                    activeCard.style.animation = 'reviewSlideFlipInReadable 1.2s cubic-bezier(0.34, 1.56, 0.64, 1) forwards';
+                }, 10);
+            }
+        });
+    }
+});
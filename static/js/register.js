@@ -0,0 +1,12 @@
+// Add glass-input class to text inputs, textareas, and selects (but not checkboxes)
+document.querySelectorAll('.glass-card input[type="text"], .glass-card input[type="email"], .glass-card input[type="password"], .glass-card input[type="tel"], .glass-card textarea, .glass-card select').forEach(input => {
+    input.classList.add('form-control', 'glass-input');
+});
+// Style checkbox properly
+document.querySelectorAll('.glass-card input[type="checkbox"]').forEach(checkbox => {
+    checkbox.classList.add('form-check-input');
+    checkbox.style.cursor = 'pointer';
+    checkbox.style.width = '1.25em';
+    checkbox.style.height = '1.25em';
+    checkbox.style.marginTop = '0.25em';
+});